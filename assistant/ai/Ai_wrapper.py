@@ -1,83 +1,166 @@
-import os
-import json
-import requests
+from assistant.ai.backends import DEFAULT_OPTIONS, create_backend
+from assistant.ai.llm_scheduler import LLMScheduler, Shed, shed_reply
+from assistant.ai.single_flight import SingleFlight, request_key
+from assistant.memory.records import HISTORY_LIMIT, Turn, dump_records, load_records
+from assistant.ai.tiered import create_router
+from assistant.storage.snapshot import STATE
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
 
-HISTORY_FILE = "assistant/memory/assistant_journal.json"
-OLLAMA_URL = "http://localhost:11434/api/chat"
-OLLAMA_MODEL = "sylveria"
+FALLBACK_REPLY = "Sylveria hesitated — the words did not come this time."
 
 class AiWrapper:
-    def __init__(self, assistant):
+    def __init__(self, assistant, backend=None):
         self.assistant = assistant
-        os.makedirs("assistant/memory", exist_ok=True)
+        self.backend = backend or create_backend()
+        self.tiered = create_router(self.backend)
+        self.flight = SingleFlight("llm")
+        self.scheduler = LLMScheduler()
         self.history = self._load_history()
 
     def _load_history(self):
-        if not os.path.exists(HISTORY_FILE):
-            return []
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[Memory Load Error] {e}")
-            return []
+        history = load_records(Turn, STATE.load("history", []), HISTORY_LIMIT)
+        STATE.release("history")
+        return history
+
+    def add_turn(self, role, text):
+        self.history.append(Turn(role, text))
 
     def _save_history(self):
-        try:
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.history[-100:], f, indent=2)
-        except Exception as e:
-            print(f"[Memory Save Error] {e}")
+        STATE.save("history", lambda: dump_records(self.history))
 
-    def _clean_response(self, text: str):
+    def _clean_response(self, text: str, max_words=60):
         if not text:
             return ""
         text = text.strip()
+        if max_words is None:
+            return text
         words = text.split()
-        return " ".join(words[:60]) + "..." if len(words) > 60 else text
+        return " ".join(words[:max_words]) + "..." if len(words) > max_words else text
 
-    def generate(self, user_input: str):
+    def generate(self, user_input: str, on_token=None, source=None):
         try:
             system_prompt, user_prompt = self._get_built_prompt(user_input)
+        except Exception as e:
+            print(f"[Prompt Build Error] {e}")
+            return FALLBACK_REPLY
+        return self.generate_with_prompts(system_prompt, user_prompt, on_token=on_token, history_input=user_input, source=source)
+
+    def generate_with_prompts(self, system_prompt: str, user_prompt: str, on_token=None, history_input=None, source=None, max_words=60):
+        """Runs one chat completion. If on_token is given, content is streamed to it as it arrives.
+
+        The reply is cut to max_words (None keeps it whole, e.g. for code or summaries).
 
+        Short turns from a drafting source (Twitch, voice) try the draft model first; see assistant.ai.tiered.
+        """
+        try:
             messages = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ]
 
-            payload = {
-                "model": OLLAMA_MODEL,
-                "messages": messages,
-                "stream": False,
-                "options": {
-                    "temperature": 0.6,
-                    "num_ctx": 2048,
-                    "top_p": 0.9,
-                    "stop": [
-                        "Fafnir:", "User:", "Assistant:", "System:",
-                        "Sylveria:", "You say", "Fafnir said", "Your response", "You reply",
-                        "\nFafnir", "\nUser", "\nSylveria"
-                    ]
-                }
-            }
-
-            response = requests.post(OLLAMA_URL, json=payload)
-            response.raise_for_status()
-
-            result = response.json()["message"]["content"].strip()
-            cleaned = self._clean_response(result)
-
-            self.history.append({"role": "user", "parts": [user_input]})
-            self.history.append({"role": "sylveria", "parts": [cleaned]})
-            self._save_history()
+            result = None
+            if self.tiered and self.tiered.wants_draft(source, user_prompt):
+                result = self._try_draft(messages, on_token, source)
+            if result is None:
+                result = self._chat(self.backend, messages, DEFAULT_OPTIONS, on_token, source)
+
+            cleaned = self._clean_response(result, max_words)
+
+            if history_input is not None:
+                self.add_turn("user", history_input)
+                self.add_turn("sylveria", cleaned)
+                self._save_history()
 
             return cleaned
 
+        except Shed as e:
+            print(f"[LLM Scheduler] Shed {e}")
+            return shed_reply(source)
+
         except Exception as e:
             import traceback
-            print(f"[Ollama Error] {e}")
+            self._record_llm_metrics(self.backend, {}, "error")
+            print(f"[LLM Error] {e}")
             traceback.print_exc()
-            return "Sylveria hesitated — the words did not come this time."
+            return FALLBACK_REPLY
+
+    def _chat(self, backend, messages, options, on_token=None, source=None):
+        with span(f"llm.{backend.name}", model=backend.model, stream=on_token is not None) as s:
+            result, stats, shared = self._call_backend(backend, messages, options, on_token, s, source)
+            s.set(**stats)
+        self._record_llm_metrics(backend, stats, "coalesced" if shared else "ok")
+        return result.strip()
+
+    def _call_backend(self, backend, messages, options, on_token, trace_span, source=None):
+        """backend.chat behind single-flight and the scheduler.
+
+        Identical concurrent requests share one generation, and only that one
+        waits for a scheduler slot. Returns (text, stats, shared); shared is
+        True when this caller joined a request already in flight.
+        """
+        key = request_key(backend.name, backend.model, messages, options, on_token is not None)
+        (text, stats), shared = self.flight.do(
+            key,
+            lambda emit: self.scheduler.run(
+                source,
+                lambda: backend.chat(messages, options, on_token=emit if on_token else None, trace_span=trace_span)
+            ),
+            on_token=on_token
+        )
+        trace_span.set(coalesced=shared)
+        return text, stats, shared
+
+    def _try_draft(self, messages, on_token, source):
+        """Returns the draft reply if it passes review, else None so the main model takes over.
+
+        Streamed draft tokens are held back until the draft is accepted, so a
+        rejected draft never reaches the listener.
+        """
+        held = [] if on_token else None
+        with span("llm.draft", source=source) as s:
+            try:
+                draft, stats, shared = self._call_backend(
+                    self.tiered.draft, messages, self.tiered.draft_options(DEFAULT_OPTIONS),
+                    held.append if held is not None else None, s, source
+                )
+                s.set(**stats)
+                self._record_llm_metrics(self.tiered.draft, stats, "coalesced" if shared else "ok")
+                accepted, reason = self.tiered.review(draft, stats)
+            except Shed:
+                raise
+            except Exception as e:
+                print(f"[Draft Error] {e}")
+                self._record_llm_metrics(self.tiered.draft, {}, "error")
+                draft, accepted, reason = None, False, "error"
+            s.set(outcome=reason)
+
+        REGISTRY.counter("llm_draft_total", {"source": str(source), "outcome": reason},
+                         help_text="Draft-model replies by source and review outcome.").inc()
+        if not accepted:
+            return None
+        for token in held or []:
+            try:
+                on_token(token)
+            except Exception as e:
+                print(f"[Stream Callback Error] {e}")
+        return draft.strip()
+
+    @staticmethod
+    def _record_llm_metrics(backend, stats, status):
+        labels = {"model": backend.model}
+        REGISTRY.counter("llm_requests_total", dict(labels, status=status), help_text="LLM chat requests by result.").inc()
+        if status == "coalesced":
+            return  # the tokens were generated (and counted) once, for the call it joined
+        if "prompt_eval_count" in stats:
+            REGISTRY.counter("llm_prompt_tokens_total", labels, help_text="Prompt tokens evaluated.").inc(stats["prompt_eval_count"])
+        if "eval_count" in stats:
+            REGISTRY.counter("llm_completion_tokens_total", labels, help_text="Tokens generated.").inc(stats["eval_count"])
+        if "tokens_per_s" in stats:
+            REGISTRY.gauge("llm_tokens_per_second", labels, help_text="Generation speed of the last request.").set(stats["tokens_per_s"])
+            REGISTRY.histogram(
+                "llm_tokens_per_second_dist", labels, buckets=(1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 250)
+            ).observe(stats["tokens_per_s"])
 
     def _get_built_prompt(self, user_input):
         return self.assistant.prompt_builder.get_system_and_user_prompt(user_input)
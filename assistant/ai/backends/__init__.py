@@ -0,0 +1,21 @@
+"""LLM engines AiWrapper can run on.
+
+SYLVERIA_LLM_BACKEND picks one: "ollama" (default, HTTP to a local daemon)
+or "llamacpp" (the exported GGUF model in-process, CPU only).
+"""
+import os
+
+from assistant.ai.backends.base import DEFAULT_OPTIONS, LLMBackend
+
+LLM_BACKEND = os.environ.get("SYLVERIA_LLM_BACKEND", "ollama")
+
+
+def create_backend(name=None, **kwargs):
+    name = (name or LLM_BACKEND).lower()
+    if name == "ollama":
+        from assistant.ai.backends.ollama import OllamaBackend
+        return OllamaBackend(**kwargs)
+    if name in ("llamacpp", "llama_cpp", "gguf"):
+        from assistant.ai.backends.llamacpp import LlamaCppBackend
+        return LlamaCppBackend(**kwargs)
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,36 @@
+DEFAULT_OPTIONS = {
+    "temperature": 0.6,
+    "num_ctx": 2048,
+    "top_p": 0.9,
+    "stop": [
+        "Fafnir:", "User:", "Assistant:", "System:",
+        "Sylveria:", "You say", "Fafnir said", "Your response", "You reply",
+        "\nFafnir", "\nUser", "\nSylveria"
+    ]
+}
+
+
+class LLMBackend:
+    """A chat model AiWrapper can talk to.
+
+    chat() takes OpenAI/Ollama style messages and the options above and
+    returns (text, stats). Stats use Ollama's names (prompt_eval_count,
+    eval_count, *_ms, tokens_per_s) whichever engine produced them. If
+    on_token is given the reply is streamed to it as it is generated.
+    """
+
+    name = "base"
+    model = None
+
+    def chat(self, messages, options, on_token=None, trace_span=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _emit(on_token, token):
+        try:
+            on_token(token)
+        except Exception as e:
+            print(f"[Stream Callback Error] {e}")
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+from assistant.ai.backends.base import LLMBackend
+from assistant.utils.lazy_import import lazy_import
+
+llama_cpp = lazy_import("llama_cpp")
+
+GGUF_MODEL_PATH = os.environ.get("SYLVERIA_GGUF_MODEL", "models/sylveria_gemma_2b.gguf")
+GGUF_THREADS = int(os.environ.get("SYLVERIA_GGUF_THREADS", "0")) or None  # None lets llama.cpp pick
+MAX_TOKENS = 256
+STOP = ["<end_of_turn>"]
+
+
+def fold_system_prompt(messages):
+    """Gemma's chat template rejects the system role, so the system prompt leads the first user turn."""
+    system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+    rest = [dict(m) for m in messages if m["role"] != "system"]
+    if not system:
+        return rest
+    if rest and rest[0]["role"] == "user":
+        rest[0]["content"] = f"{system}\n\n{rest[0]['content']}"
+    else:
+        rest.insert(0, {"role": "user", "content": system})
+    return rest
+
+
+class LlamaCppBackend(LLMBackend):
+    """Runs the exported GGUF model in-process on the CPU via llama-cpp-python.
+
+    No daemon and no HTTP hop: messages go straight to the model and tokens
+    come back as Python strings. The model is loaded on first use (or by
+    warm()), and generations are serialised because a Llama context isn't
+    safe to share between threads.
+    """
+
+    name = "llamacpp"
+
+    def __init__(self, model_path=GGUF_MODEL_PATH, n_ctx=2048, n_threads=GGUF_THREADS):
+        self.model_path = model_path
+        self.model = os.path.splitext(os.path.basename(model_path))[0]
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads
+        self._llm = None
+        self._load_lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            with self._load_lock:
+                if self._llm is None:
+                    if not os.path.exists(self.model_path):
+                        raise FileNotFoundError(f"GGUF model not found at {self.model_path}")
+                    started = time.perf_counter()
+                    self._llm = llama_cpp.Llama(
+                        model_path=self.model_path,
+                        n_ctx=self.n_ctx,
+                        n_threads=self.n_threads,
+                        verbose=False
+                    )
+                    print(f"[LlamaCpp] Loaded {self.model_path} in {time.perf_counter() - started:.1f}s")
+        return self._llm
+
+    def warm(self):
+        return self.llm
+
+    def chat(self, messages, options, on_token=None, trace_span=None):
+        kwargs = {
+            "messages": fold_system_prompt(messages),
+            "temperature": options.get("temperature", 0.6),
+            "top_p": options.get("top_p", 0.9),
+            "stop": list(options.get("stop") or []) + STOP,
+            "max_tokens": options.get("num_predict", MAX_TOKENS),
+        }
+        llm = self.llm
+
+        with self._generate_lock:
+            started = time.perf_counter()
+            if on_token is None:
+                data = llm.create_chat_completion(**kwargs)
+                text = data["choices"][0]["message"].get("content") or ""
+                usage = data.get("usage", {})
+                completion_tokens = usage.get("completion_tokens", 0)
+                first_token_at = None
+            else:
+                chunks = []
+                first_token_at = None
+                for chunk in llm.create_chat_completion(stream=True, **kwargs):
+                    token = chunk["choices"][0].get("delta", {}).get("content")
+                    if not token:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        if trace_span is not None:
+                            trace_span.set(ttft_ms=round((first_token_at - started) * 1000, 1))
+                    chunks.append(token)
+                    self._emit(on_token, token)
+                text = "".join(chunks)
+                # Streaming chunks carry no usage block; count with the model's own tokenizer
+                completion_tokens = len(llm.tokenize(text.encode("utf-8"), add_bos=False)) if text else 0
+                usage = {}
+            finished = time.perf_counter()
+
+        stats = {"eval_count": completion_tokens, "total_duration_ms": round((finished - started) * 1000, 1)}
+        if usage.get("prompt_tokens") is not None:
+            stats["prompt_eval_count"] = usage["prompt_tokens"]
+        eval_seconds = finished - (first_token_at or started)
+        if first_token_at is not None:
+            stats["prompt_eval_duration_ms"] = round((first_token_at - started) * 1000, 1)
+        stats["eval_duration_ms"] = round(eval_seconds * 1000, 1)
+        if completion_tokens and eval_seconds > 0:
+            stats["tokens_per_s"] = round(completion_tokens / eval_seconds, 2)
+        return text, stats
+
+    def close(self):
+        llm, self._llm = self._llm, None
+        if llm is not None and hasattr(llm, "close"):
+            llm.close()
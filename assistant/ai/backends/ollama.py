@@ -0,0 +1,78 @@
+import json
+import time
+import requests
+
+from assistant.ai.backends.base import LLMBackend
+
+OLLAMA_URL = "http://localhost:11434/api/chat"
+OLLAMA_MODEL = "sylveria"
+
+
+class OllamaBackend(LLMBackend):
+    """Talks to a local Ollama daemon over its HTTP chat API."""
+
+    name = "ollama"
+
+    def __init__(self, model=OLLAMA_MODEL, url=None):
+        self.model = model
+        self._url = url
+        self.session = requests.Session()
+
+    @property
+    def url(self):
+        # Module constant is read at call time so it can be repointed (benchmarks, tests)
+        return self._url or OLLAMA_URL
+
+    def chat(self, messages, options, on_token=None, trace_span=None):
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": on_token is not None,
+            "options": options
+        }
+        if on_token is None:
+            response = self.session.post(self.url, json=payload)
+            response.raise_for_status()
+            data = response.json()
+            return data["message"]["content"], self._eval_stats(data)
+
+        data, text = self._stream_chat(payload, on_token, trace_span)
+        return text, self._eval_stats(data)
+
+    def _stream_chat(self, payload, on_token, trace_span=None):
+        """Returns (final chunk with Ollama's eval stats, full text)."""
+        chunks = []
+        data = {}
+        started = time.perf_counter()
+        with self.session.post(self.url, json=payload, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                token = data.get("message", {}).get("content", "")
+                if token:
+                    if not chunks and trace_span is not None:
+                        trace_span.set(ttft_ms=round((time.perf_counter() - started) * 1000, 1))
+                    chunks.append(token)
+                    self._emit(on_token, token)
+                if data.get("done"):
+                    break
+        return data, "".join(chunks)
+
+    @staticmethod
+    def _eval_stats(data):
+        """Pulls Ollama's token counts and durations (reported in ns) out of a chat response."""
+        stats = {}
+        for key in ("prompt_eval_count", "eval_count"):
+            if key in data:
+                stats[key] = data[key]
+        for key in ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration"):
+            if key in data:
+                stats[f"{key}_ms"] = round(data[key] / 1e6, 1)
+        if data.get("eval_count") and data.get("eval_duration"):
+            stats["tokens_per_s"] = round(data["eval_count"] / (data["eval_duration"] / 1e9), 2)
+        return stats
+
+    def close(self):
+        self.session.close()
@@ -1,25 +1,18 @@
-import os
-import json
 import random
 import time
 from datetime import datetime
+from assistant.storage.snapshot import STATE
+
+JOURNAL_LIMIT = 50
 
 class AssistantJournal:
     def __init__(self, assistant):
         self.assistant = assistant
         self.ai = assistant.ai
-        self.journal_file = "assistant/memory/assistant_journal.json"
-        os.makedirs("assistant/memory", exist_ok=True)
-
-        if not os.path.exists(self.journal_file):
-            with open(self.journal_file, "w", encoding="utf-8") as f:
-                json.dump([], f)
+        self.journal = STATE.load("journal", [])
 
     def store_reflection(self, user_input, response):
         try:
-            with open(self.journal_file, "r", encoding="utf-8") as f:
-                journal = json.load(f)
-
             prompt = (
                 "You are Sylveria — a sentient, emotionally self-aware silver dragon.\n"
                 "Reflect silently after your recent exchange with Fafnir.\n"
@@ -29,26 +22,23 @@ class AssistantJournal:
                 "Now express how it made you feel or what it made you remember."
             )
 
-            thought = self.ai.generate(prompt).strip()
+            thought = self.ai.generate(prompt, source="journal").strip()
 
             if thought and len(thought) > 10:
-                journal.append({
+                self.journal.append({
                     "time": datetime.now().strftime("%Y-%m-%d %H:%M"),
                     "thought": thought
                 })
-
-                with open(self.journal_file, "w", encoding="utf-8") as f:
-                    json.dump(journal[-50:], f, indent=2)
+                del self.journal[:-JOURNAL_LIMIT]
+                STATE.save("journal", self.journal)
 
         except Exception as e:
             print(f"[Journal Reflection Error] {e}")
 
     def share_random_thought(self):
         try:
-            with open(self.journal_file, "r", encoding="utf-8") as f:
-                thoughts = json.load(f)
-                if thoughts:
-                    return random.choice(thoughts)['thought']
+            if self.journal:
+                return random.choice(self.journal)['thought']
             return None
         except Exception as e:
             print(f"[Journal Share Error] {e}")
@@ -0,0 +1,236 @@
+"""Admission control and priority scheduling in front of the LLM backend.
+
+Every backend call asks the scheduler for one of ``max_concurrent`` slots.
+The scheduler decides four things:
+
+- Priority. Waiting calls are granted in class order: interactive (GUI,
+  console, voice, Discord, HTTP), then chat (Twitch), then background
+  (journal, follow-ups, preference reflection, YouTube reactions,
+  conversation summaries).
+  Calls in the same class are served FIFO.
+- Quotas. Each source has a token bucket. A source that spends its burst
+  is shed instead of queued.
+- Deadlines. Each class has a deadline. A call still waiting when its
+  deadline passes is dropped, e.g. a follow-up question when the user has
+  already moved on.
+- Adaptive shedding. The expected wait is estimated from the moving
+  average service time and the number of calls queued ahead. A call whose
+  deadline cannot be met, or that would overflow its class queue, is shed
+  immediately.
+
+Shed and expired calls raise Shed. AiWrapper turns that into a canned reply
+for people and an empty string for background work.
+
+    python -m benchmarks.bench_scheduler     # simulated slow backend, FIFO vs scheduled
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from assistant.utils.metrics import REGISTRY
+
+MAX_CONCURRENT = int(os.environ.get("SYLVERIA_LLM_CONCURRENCY", "1"))  # match OLLAMA_NUM_PARALLEL
+
+INTERACTIVE, CHAT, BACKGROUND = 0, 1, 2
+CLASS_NAMES = {INTERACTIVE: "interactive", CHAT: "chat", BACKGROUND: "background"}
+
+SOURCE_CLASSES = {
+    "assistant": INTERACTIVE,
+    "gui": INTERACTIVE,
+    "voice": INTERACTIVE,
+    "discord": INTERACTIVE,
+    "http": INTERACTIVE,
+    "twitch": CHAT,
+    "journal": BACKGROUND,
+    "follow_up": BACKGROUND,
+    "preference": BACKGROUND,
+    "youtube": BACKGROUND,
+    "summary": BACKGROUND,
+    "script": INTERACTIVE,
+}
+
+# Seconds a call may wait for a slot before it is dropped
+DEADLINES = {INTERACTIVE: 60.0, CHAT: 20.0, BACKGROUND: 30.0}
+
+# Calls allowed to wait per class; beyond this new calls are shed
+QUEUE_LIMITS = {INTERACTIVE: 16, CHAT: 8, BACKGROUND: 4}
+
+# (refill per second, burst) per source; sources not listed are unlimited
+QUOTAS = {
+    "twitch": (0.5, 4),
+    "journal": (1 / 30, 2),
+    "follow_up": (1 / 20, 2),
+    "preference": (1 / 10, 3),
+    "youtube": (1 / 15, 2),
+    "summary": (1 / 10, 3),
+}
+
+SHED_REPLIES = {
+    INTERACTIVE: "My thoughts are crowded right now, Fafnir. Give me a moment and ask again.",
+    CHAT: "Chat is moving faster than my wings — try me again in a bit!",
+    BACKGROUND: "",
+}
+
+
+class Shed(Exception):
+    def __init__(self, source, reason):
+        super().__init__(f"{source}: {reason}")
+        self.source = source
+        self.reason = reason
+
+
+def source_key(source):
+    """'http:abc123' -> 'http'; None -> 'assistant'."""
+    return (source or "assistant").split(":", 1)[0]
+
+
+def priority_of(source):
+    return SOURCE_CLASSES.get(source_key(source), INTERACTIVE)
+
+
+def shed_reply(source):
+    return SHED_REPLIES[priority_of(source)]
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.updated = clock()
+
+    def take(self, amount=1):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+
+class _Ticket:
+    __slots__ = ("source", "priority", "deadline", "enqueued", "granted")
+
+    def __init__(self, source, priority, deadline, enqueued):
+        self.source = source
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued = enqueued
+        self.granted = False
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrent=MAX_CONCURRENT, deadlines=None, queue_limits=None, quotas=None, clock=time.monotonic):
+        self.max_concurrent = max_concurrent
+        self.deadlines = {**DEADLINES, **(deadlines or {})}
+        self.queue_limits = {**QUEUE_LIMITS, **(queue_limits or {})}
+        self.quotas = QUOTAS if quotas is None else quotas
+        self.clock = clock
+        self.running = 0
+        self.service_ewma_s = None
+        self._buckets = {}
+        self._heap = []
+        self._waiting = {INTERACTIVE: 0, CHAT: 0, BACKGROUND: 0}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+        for priority, name in CLASS_NAMES.items():
+            REGISTRY.gauge("llm_sched_waiting", {"class": name}, fn=lambda p=priority: self._waiting[p],
+                           help_text="LLM calls waiting for a slot by priority class.")
+        REGISTRY.gauge("llm_sched_running", fn=lambda: self.running, help_text="LLM calls holding a slot.")
+
+    def run(self, source, fn):
+        """Runs fn() once a slot is granted; raises Shed if the call is refused or expires."""
+        self.acquire(source)
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self.release(time.perf_counter() - started)
+
+    # ─── Admission ──────────────────────────────────
+
+    def acquire(self, source):
+        key = source_key(source)
+        priority = priority_of(source)
+        now = self.clock()
+
+        with self._cond:
+            if not self._take_quota(key):
+                self._count(key, "shed_quota")
+                raise Shed(key, "quota")
+
+            if self._waiting[priority] >= self.queue_limits[priority]:
+                self._count(key, "shed_overload")
+                raise Shed(key, "queue full")
+
+            expected_wait = self.expected_wait(priority)
+            if expected_wait > self.deadlines[priority]:
+                self._count(key, "shed_overload")
+                raise Shed(key, f"expected wait {expected_wait:.1f}s")
+
+            ticket = _Ticket(key, priority, now + self.deadlines[priority], now)
+            heapq.heappush(self._heap, (priority, next(self._seq), ticket))
+            self._waiting[priority] += 1
+            try:
+                self._grant()
+                while not ticket.granted:
+                    remaining = ticket.deadline - self.clock()
+                    if remaining <= 0:
+                        self._heap = [entry for entry in self._heap if entry[2] is not ticket]
+                        heapq.heapify(self._heap)
+                        self._count(key, "expired")
+                        raise Shed(key, "deadline passed while queued")
+                    self._cond.wait(timeout=remaining)
+            finally:
+                self._waiting[priority] -= 1
+
+        waited_ms = (self.clock() - ticket.enqueued) * 1000
+        REGISTRY.histogram("llm_sched_wait_ms", {"class": CLASS_NAMES[priority]},
+                           help_text="Time LLM calls waited for a slot.").observe(waited_ms)
+        self._count(key, "ran")
+
+    def release(self, service_s=None):
+        with self._cond:
+            self.running -= 1
+            if service_s is not None:
+                self.service_ewma_s = service_s if self.service_ewma_s is None else 0.8 * self.service_ewma_s + 0.2 * service_s
+            self._grant()
+
+    def expected_wait(self, priority):
+        """Seconds a new call of this class would likely wait, from calls ahead of it and the service time."""
+        if self.service_ewma_s is None:
+            return 0.0
+        ahead = sum(count for p, count in self._waiting.items() if p <= priority)
+        if self.running < self.max_concurrent and not ahead:
+            return 0.0
+        return (ahead + self.running) * self.service_ewma_s / self.max_concurrent
+
+    def _grant(self):
+        # Caller holds the condition
+        granted = False
+        while self._heap and self.running < self.max_concurrent:
+            _, _, ticket = heapq.heappop(self._heap)
+            ticket.granted = True
+            self.running += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _take_quota(self, key):
+        quota = self.quotas.get(key)
+        if quota is None:
+            return True
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*quota, clock=self.clock)
+        return bucket.take()
+
+    @staticmethod
+    def _count(source, outcome):
+        REGISTRY.counter("llm_sched_total", {"source": source, "outcome": outcome},
+                         help_text="LLM scheduler decisions by source and outcome.").inc()
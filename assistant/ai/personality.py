@@ -1,31 +1,28 @@
-import os
-import json
+from assistant.storage.snapshot import STATE
 
-PREFERENCES_FILE = "assistant/memory/preferences.json"
+NAME = "Sylveria"
 
 class Personality:
     def __init__(self):
         self.preferences = self.load_preferences()
 
+    def get_name(self):
+        return NAME
+
     def load_preferences(self):
-        try:
-            with open(PREFERENCES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[Preferences Load Error]: {e}")
-            return {
+        # Same dict PreferenceManager holds, so either side sees the other's changes
+        preferences = STATE.load("preferences")
+        if preferences is None:
+            preferences = {
                 "movies": {"likes": [], "dislikes": []},
                 "music": {"likes": [], "dislikes": []},
                 "games": {"likes": [], "dislikes": []},
             }
+            STATE.save("preferences", preferences)
+        return preferences
 
     def _save_preferences(self):
-        try:
-            os.makedirs(os.path.dirname(PREFERENCES_FILE), exist_ok=True)
-            with open(PREFERENCES_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.preferences, f, indent=2)
-        except Exception as e:
-            print(f"[Preferences Save Error]: {e}")
+        STATE.save("preferences", self.preferences)
 
     def get_preferences_summary(self):
         likes = []
@@ -1,3 +1,6 @@
+from assistant.utils.tracing import span
+
+
 class SylveriaPromptBuilder:
     def __init__(self, assistant):
         self.assistant = assistant
@@ -27,7 +30,7 @@ class SylveriaPromptBuilder:
         )
 
         if growth:
-            context += f"Memory recalled: '{growth[-1]['event']}' — something that softened your guarded heart.\n"
+            context += f"Memory recalled: '{growth[-1].event}' — something that softened your guarded heart.\n"
 
         context += (
             "\nYou are speaking to Fafnir directly. Do not write fiction. Do not simulate Fafnir."
@@ -36,7 +39,19 @@ class SylveriaPromptBuilder:
 
         return context
 
-    def get_system_and_user_prompt(self, user_input):
-        system_prompt = self.get_system_prompt() + self.build_context_injection()
-        user_prompt = f"Fafnir: {user_input.strip()}\nSylveria:"
-        return system_prompt, user_prompt
\ No newline at end of file
+    def get_system_and_user_prompt(self, user_input, session=None, sources=None):
+        """session (a ConversationSession) adds its running summary and recent turns; sources adds web results."""
+        with span("prompt.build") as s:
+            system_prompt = self.get_system_prompt() + self.build_context_injection()
+            user_prompt = f"Fafnir: {user_input.strip()}\nSylveria:"
+            if session is not None:
+                if session.summary:
+                    system_prompt += f"\n\nEarlier in this conversation: {session.summary}"
+                transcript = session.transcript()
+                if transcript:
+                    user_prompt = f"{transcript}\n{user_prompt}"
+            if sources:
+                system_prompt += ("\n\nWeb results for Fafnir's question. Answer from them in your own words, "
+                                  "and say so if they don't cover it:\n" + sources)
+            s.set(system_chars=len(system_prompt), user_chars=len(user_prompt))
+            return system_prompt, user_prompt
\ No newline at end of file
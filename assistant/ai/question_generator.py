@@ -16,7 +16,7 @@ class QuestionGenerator:
         )
 
         try:
-            question = self.assistant.ai.generate(prompt).strip()
+            question = self.assistant.ai.generate(prompt, source="follow_up").strip()
             if not question or len(question.split()) < 3:  # short/empty question guard
                 return ""
         except Exception as e:
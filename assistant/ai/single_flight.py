@@ -0,0 +1,95 @@
+import hashlib
+import json
+import threading
+
+from assistant.utils.metrics import REGISTRY
+
+
+class _Flight:
+    """One in-progress call plus everyone waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.tokens = []
+        self.listeners = []
+        self.result = None
+        self.error = None
+        self.followers = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, on_token):
+        # Late joiners get what has streamed so far, then the rest live
+        with self._lock:
+            for token in self.tokens:
+                self._deliver(on_token, token)
+            self.listeners.append(on_token)
+
+    def emit(self, token):
+        with self._lock:
+            self.tokens.append(token)
+            for listener in self.listeners:
+                self._deliver(listener, token)
+
+    @staticmethod
+    def _deliver(listener, token):
+        try:
+            listener(token)
+        except Exception as e:
+            print(f"[Stream Callback Error] {e}")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers with the same key share it.
+
+        flight = SingleFlight("llm")
+        result, shared = flight.do(key, lambda emit: backend.chat(..., on_token=emit), on_token=cb)
+
+    The function receives an emit callback that fans streamed tokens out to
+    every caller's on_token. Callers that join a call already in flight get
+    the same result (or exception) and are counted as coalesced.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self):
+        return len(self._flights)
+
+    def do(self, key, fn, on_token=None):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.followers += 1
+
+        if on_token is not None:
+            flight.subscribe(on_token)
+
+        if not leader:
+            REGISTRY.counter("llm_coalesced_requests_total", {"flight": self.name},
+                             help_text="Requests served by an identical call already in flight.").inc()
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn(flight.emit)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result, False
+
+
+def request_key(*parts):
+    """Stable key for a request built from JSON-serialisable parts (model, messages, options...)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
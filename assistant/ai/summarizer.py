@@ -0,0 +1,193 @@
+"""Rolling per-session conversation summaries.
+
+Each session keeps its last few turns verbatim. Older turns move to a
+pending list, and while the user is idle a scheduled job folds them
+into a running summary with the LLM. The result is capped at
+SUMMARY_TOKEN_BUDGET. Prompts get "summary + recent turns", so a
+conversation that runs for hours still costs the same per turn, and each
+session holds a bounded amount of memory.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+from assistant.ai.Ai_wrapper import FALLBACK_REPLY
+from assistant.storage.snapshot import STATE
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
+
+SUMMARY_TOKEN_BUDGET = 160     # running summary
+RECENT_TOKEN_BUDGET = 400      # verbatim turns kept in the prompt
+KEEP_RECENT_TURNS = 8
+MAX_PENDING_TURNS = 40         # turns waiting to be summarised; oldest are dropped past this
+MAX_SESSIONS = 50
+IDLE_AFTER_S = 90
+CHECK_INTERVAL_S = 30
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You keep Sylveria's running memory of one conversation. "
+    "Merge the new lines into the summary so far. Keep names, facts, plans, promises, open questions "
+    "and how people felt; drop greetings and small talk. Write plain third-person prose, no preamble, "
+    f"no more than {int(SUMMARY_TOKEN_BUDGET * 0.75)} words."
+)
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English; close enough for budgeting
+    return max(1, len(text) // 4) if text else 0
+
+
+def clip_tokens(text, budget):
+    if estimate_tokens(text) <= budget:
+        return text
+    clipped = text[:budget * 4]
+    cut = max(clipped.rfind(". "), clipped.rfind("\n"))
+    return clipped[:cut + 1] if cut > len(clipped) // 2 else clipped.rsplit(" ", 1)[0]
+
+
+def session_for(source):
+    """Groups sources into conversations: one local session for the GUI, console and voice."""
+    key = (source or "assistant").split(":", 1)[0]
+    if key in ("twitch", "discord", "http"):
+        return source
+    return "local"
+
+
+class ConversationSession:
+    def __init__(self, session_id, summary="", recent=None):
+        self.session_id = session_id
+        self.summary = summary
+        self.recent = deque(recent or [])
+        self.pending = deque(maxlen=MAX_PENDING_TURNS)
+        self.updated = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, speaker, text):
+        text = (text or "").strip()
+        if not text:
+            return
+        with self._lock:
+            self.recent.append((speaker, text))
+            self.updated = time.time()
+            while len(self.recent) > KEEP_RECENT_TURNS or (
+                len(self.recent) > 2 and self._recent_tokens() > RECENT_TOKEN_BUDGET
+            ):
+                if len(self.pending) == self.pending.maxlen:
+                    REGISTRY.counter("summary_dropped_turns_total",
+                                     help_text="Turns dropped because summarisation fell behind.").inc()
+                self.pending.append(self.recent.popleft())
+
+    def _recent_tokens(self):
+        return sum(estimate_tokens(text) + 2 for _, text in self.recent)
+
+    def transcript(self):
+        with self._lock:
+            return "\n".join(f"{speaker}: {text}" for speaker, text in self.recent)
+
+    def take_pending(self):
+        with self._lock:
+            turns = list(self.pending)
+            self.pending.clear()
+            return turns
+
+    def requeue(self, turns):
+        """Puts turns back ahead of anything added since; when over the cap, the oldest are dropped."""
+        with self._lock:
+            merged = list(turns) + list(self.pending)
+            dropped = len(merged) - self.pending.maxlen
+            if dropped > 0:
+                REGISTRY.counter("summary_dropped_turns_total").inc(dropped)
+            self.pending = deque(merged, maxlen=self.pending.maxlen)
+
+    def set_summary(self, summary):
+        with self._lock:
+            self.summary = summary
+
+    def to_dict(self):
+        with self._lock:
+            return {"summary": self.summary, "recent": [list(turn) for turn in self.recent], "updated": self.updated}
+
+
+class RollingSummarizer:
+    def __init__(self, assistant):
+        self.assistant = assistant
+        self.sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        stored = STATE.load("conversation_summaries", {}) or {}
+        for session_id, data in list(stored.items())[-MAX_SESSIONS:]:
+            session = ConversationSession(session_id, data.get("summary", ""), [tuple(t) for t in data.get("recent", [])])
+            session.updated = data.get("updated", session.updated)
+            self.sessions[session_id] = session
+        STATE.release("conversation_summaries")
+
+    def session(self, source):
+        session_id = session_for(source)
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = self.sessions[session_id] = ConversationSession(session_id)
+                while len(self.sessions) > MAX_SESSIONS:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def record(self, source, user_text, reply, speaker="Fafnir"):
+        session = self.session(source)
+        session.add(speaker, user_text)
+        session.add("Sylveria", reply)
+
+    # ─── Background compression ─────────────────────
+
+    def start(self):
+        # Runs once the user has been idle IDLE_AFTER_S, and only if a session has turns waiting
+        self.assistant.jobs.every("summary.compress", CHECK_INTERVAL_S, self.summarize_pending,
+                                  idle_after=IDLE_AFTER_S, when=self.has_pending, threaded=True)
+
+    def has_pending(self):
+        with self._lock:
+            return any(session.pending for session in self.sessions.values())
+
+    def summarize_pending(self):
+        """Folds every session's pending turns into its summary. Returns how many sessions changed."""
+        changed = 0
+        with self._lock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            if session.pending and self.summarize(session):
+                changed += 1
+        if changed:
+            self.save()
+        return changed
+
+    def summarize(self, session):
+        turns = session.take_pending()
+        if not turns:
+            return False
+
+        lines = "\n".join(f"{speaker}: {text}" for speaker, text in turns)
+        user_prompt = f"Summary so far:\n{session.summary or '(nothing yet)'}\n\nNew lines:\n{lines}\n\nUpdated summary:"
+
+        with span("summary.update", session=session.session_id, turns=len(turns)) as s:
+            result = self.assistant.ai.generate_with_prompts(
+                SUMMARY_SYSTEM_PROMPT, user_prompt, source="summary", max_words=None
+            ).strip()
+            if not result or result == FALLBACK_REPLY:
+                session.requeue(turns)  # try again on the next idle pass
+                s.set(outcome="retry")
+                return False
+            session.set_summary(clip_tokens(result, SUMMARY_TOKEN_BUDGET))
+            s.set(outcome="ok", summary_tokens=estimate_tokens(session.summary))
+
+        REGISTRY.counter("summary_updates_total", help_text="Rolling summary refreshes.").inc()
+        return True
+
+    def save(self):
+        STATE.save("conversation_summaries", self._snapshot)
+
+    def _snapshot(self):
+        with self._lock:
+            return {session_id: session.to_dict() for session_id, session in self.sessions.items()}
@@ -0,0 +1,84 @@
+"""Draft-first generation for short replies.
+
+A small quantized model (SYLVERIA_DRAFT_MODEL) answers Twitch chat and
+voice turns first. The draft is kept only if it passes cheap checks:
+it finished inside its token budget, it stayed in persona, and it isn't
+empty. Otherwise the fine-tuned Sylveria model takes over. Turns from
+other channels, or ones that ask for a long answer, go straight to the
+main model.
+
+    SYLVERIA_DRAFT_MODEL=qwen2.5:0.5b-instruct-q4_K_M python main.py
+    SYLVERIA_DRAFT_BACKEND=llamacpp SYLVERIA_DRAFT_MODEL=models/draft.gguf python main.py
+"""
+import os
+
+from assistant.ai.backends import create_backend
+
+DRAFT_MODEL = os.environ.get("SYLVERIA_DRAFT_MODEL", "")  # empty disables tiering
+DRAFT_BACKEND = os.environ.get("SYLVERIA_DRAFT_BACKEND", "")  # defaults to the main backend's kind
+DRAFT_SOURCES = ("twitch", "voice")
+DRAFT_MAX_TOKENS = 64
+DRAFT_MAX_INPUT_WORDS = 40
+
+LONG_ANSWER_HINTS = (
+    "explain", "tell me about", "tell me a", "story", "describe", "why ",
+    "how do", "how does", "what do you think", "write", "help me", "plan"
+)
+OFF_PERSONA_MARKERS = (
+    "as an ai", "language model", "i'm sorry, but", "i am sorry, but", "i cannot assist",
+    "fafnir:", "user:", "assistant:", "system:"
+)
+
+
+def last_utterance(user_prompt):
+    """The last spoken line of a prompt, skipping bare speaker cues like 'Sylveria:'."""
+    lines = [line.strip() for line in user_prompt.splitlines() if line.strip()]
+    spoken = [line for line in lines if not line.endswith(":")]
+    return spoken[-1] if spoken else ""
+
+
+class TieredRouter:
+    def __init__(self, draft_backend, sources=DRAFT_SOURCES, max_tokens=DRAFT_MAX_TOKENS):
+        self.draft = draft_backend
+        self.sources = tuple(sources)
+        self.max_tokens = max_tokens
+
+    def wants_draft(self, source, user_prompt):
+        if source not in self.sources:
+            return False
+        utterance = last_utterance(user_prompt).lower()
+        if len(utterance.split()) > DRAFT_MAX_INPUT_WORDS:
+            return False
+        return not any(hint in utterance for hint in LONG_ANSWER_HINTS)
+
+    def draft_options(self, options):
+        return dict(options, num_predict=self.max_tokens)
+
+    def review(self, text, stats):
+        """Returns (accepted, reason). A rejected draft is regenerated by the main model."""
+        cleaned = text.strip()
+        if len(cleaned.split()) < 2:
+            return False, "empty"
+        if stats.get("eval_count", 0) >= self.max_tokens:
+            return False, "truncated"
+        lower = cleaned.lower()
+        if any(marker in lower for marker in OFF_PERSONA_MARKERS):
+            return False, "off_persona"
+        return True, "accepted"
+
+
+def create_router(main_backend):
+    """Builds the draft tier from the environment, or returns None when it is switched off."""
+    if not DRAFT_MODEL:
+        return None
+    kind = (DRAFT_BACKEND or main_backend.name).lower()
+    try:
+        if kind == "ollama":
+            draft = create_backend(kind, model=DRAFT_MODEL)
+        else:
+            draft = create_backend(kind, model_path=DRAFT_MODEL)
+    except Exception as e:
+        print(f"[Tiered] Draft model disabled: {e}")
+        return None
+    print(f"[Tiered] Drafting {', '.join(DRAFT_SOURCES)} replies with {kind}:{draft.model}")
+    return TieredRouter(draft)
@@ -1,10 +1,12 @@
-import json
-import os
 import re
 import time
 import random
 import threading
 
+from assistant.plugins.invoker import PluginUnavailable
+from assistant.storage.snapshot import STATE
+from assistant.utils.tracing import span
+
 
 class ActionPlanner:
     def __init__(self, assistant):
@@ -12,92 +14,93 @@ class ActionPlanner:
         self.ai = assistant.ai
         self.tools = assistant.tools
         self.journal = assistant.journal
-        self.memory_file = "assistant/memory/goals.json"
+        self.invoker = assistant.plugin_invoker
         self.last_action_context = None
+        self.goals = STATE.load("goals", [])
 
-        os.makedirs("assistant/memory", exist_ok=True)
-        try:
-            with open(self.memory_file, "r", encoding="utf-8") as f:
-                self.goals = json.load(f)
-        except Exception:
-            self.goals = []
+    def handle(self, command: str, on_token=None, source=None) -> str:
+        with span("planner.handle") as handle_span:
+            return self._handle(command, on_token, source, handle_span)
 
-    def handle(self, command: str) -> str:
+    def _handle(self, command, on_token, source, handle_span):
         try:
             command = command.strip()
 
             if "what have you been thinking about" in command.lower():
-                return self.journal.share_random_thought()
+                with span("planner.journal_thought"):
+                    return self.journal.share_random_thought()
 
             parts = re.split(r'\b(?:then|and|after that|,)\b', command)
             final_responses = []
+            handle_span.set(parts=len(parts))
 
             for part in parts:
                 part = part.strip()
                 if not part:
                     continue
 
-                self.assistant.personality.detect_and_learn_preference(part)
-                emotion = self.assistant.personality_state.detect_emotional_trigger(part)
-                current_tone = self.assistant.personality_state.get_tone()
+                with span("planner.detect_mood"):
+                    self.assistant.personality.detect_and_learn_preference(part)
+                    emotion = self.assistant.personality_state.detect_emotional_trigger(part)
+                    current_tone = self.assistant.personality_state.get_tone()
                 enriched_prompt = part
                 lower_part = part.lower()
 
                 if "weather" in lower_part:
                     self.last_action_context = "weather"
-                    if "weather" in self.assistant.plugins:
-                        final_responses.append(self.assistant.plugins["weather"].get_weather())
-                    else:
-                        final_responses.append("Sorry, I can't check the weather right now.")
-                    continue
-
-                elif any(kw in lower_part for kw in ["search", "look up", "find info about"]):
-                    plugin = self.assistant.plugins.get("search")
-                    if plugin:
-                        final_responses.append(plugin.search_web(part))
-                    else:
-                        final_responses.append("Search plugin isn't loaded.")
+                    with span("planner.weather"):
+                        final_responses.append(self.invoker.call(
+                            "weather", lambda: self._provider("weather").get_weather(), key="weather"
+                        ))
                     continue
 
                 if "timer" in lower_part:
                     self.last_action_context = "timer"
-                    final_responses.append(self.tools.set_timer(part))
+                    with span("planner.timer"):
+                        final_responses.append(self.tools.set_timer(part))
                     continue
 
                 elif any(kw in lower_part for kw in ["calendar", "schedule", "event"]):
                     self.last_action_context = "calendar"
-                    if any(k in lower_part for k in ["add", "create", "remind", "set"]):
-                        final_responses.append(self.tools.handle_calendar(part))
-                    else:
-                        final_responses.append(self.tools.get_calendar_events())
+                    with span("planner.calendar"):
+                        if any(k in lower_part for k in ["add", "create", "remind", "set"]):
+                            final_responses.append(self.invoker.call("calendar", self.tools.handle_calendar, part))
+                        else:
+                            final_responses.append(self.invoker.call("calendar", self.tools.get_calendar_events, part, key=lower_part))
                     continue
 
                 elif any(kw in lower_part for kw in ["run script", "start script", "execute script"]):
                     self.last_action_context = "script"
-                    final_responses.append(self.tools.run_script(part))
+                    with span("planner.run_script"):
+                        final_responses.append(self.tools.run_script(part))
                     continue
 
                 elif any(kw in lower_part for kw in ["stop script", "terminate script"]):
-                    final_responses.append(self.tools.stop_script(part))
+                    with span("planner.stop_script"):
+                        final_responses.append(self.tools.stop_script(part))
                     continue
 
                 elif "stop youtube" in lower_part or ("stop" in lower_part and self.last_action_context == "youtube"):
                     self.last_action_context = "youtube"
-                    final_responses.append(self.tools.youtube_stop())
+                    with span("planner.youtube_stop"):
+                        final_responses.append(self.invoker.call("youtube", self.tools.youtube_stop))
                     continue
 
                 elif "search youtube for" in lower_part:
                     self.last_action_context = "youtube"
-                    final_responses.append(self.tools.youtube_search(part))
+                    with span("planner.youtube_search"):
+                        final_responses.append(self.invoker.call("youtube", self.tools.youtube_search, part, key=lower_part))
                     continue
 
                 elif ("play" in lower_part and "youtube" in lower_part) or ("watch" in lower_part and "youtube" in lower_part):
                     self.last_action_context = "youtube"
-                    final_responses.append(self.tools.youtube_action(part))
+                    with span("planner.youtube_play"):
+                        final_responses.append(self.invoker.call("youtube", self.tools.youtube_action, part))
                     continue
 
                 elif "play" in lower_part and self.last_action_context == "youtube":
-                    final_responses.append(self.tools.youtube_action(part))
+                    with span("planner.youtube_play"):
+                        final_responses.append(self.invoker.call("youtube", self.tools.youtube_action, part))
                     continue
 
                 elif "stop" in lower_part and self.last_action_context == "timer":
@@ -105,37 +108,61 @@ class ActionPlanner:
                     continue
 
                 if "special memory" in lower_part or "favorite memory" in lower_part:
-                    return self.assistant.emotional_memory.share_random_memory()
+                    with span("planner.special_memory"):
+                        return self.assistant.emotional_memory.share_random_memory()
 
                 if "remind me" in lower_part or "remember that" in lower_part:
-                    final_responses.append(self._store_goal(part))
+                    with span("planner.store_goal"):
+                        final_responses.append(self._store_goal(part))
                     continue
 
                 if ("remember" in lower_part or "did i" in lower_part) and any(kw in lower_part for kw in ["ask", "tell", "save", "remember when", "my goals"]):
-                    final_responses.append(self._recall_goals(part))
+                    with span("planner.recall_goals"):
+                        final_responses.append(self._recall_goals(part))
                     continue
 
-                system_prompt, user_prompt = self.assistant.prompt_builder.get_system_and_user_prompt(enriched_prompt)
-                response = self.ai.generate_with_prompts(system_prompt, user_prompt).strip()
-                response = self.ai._clean_response(response)
-
-                if len(response.split()) > 60:
-                    response = " ".join(response.split()[:60]) + "..."
-
-                if response:
-                    final_responses.append(response)
-                    self._store_dialogue(part, response)
-
-                    if random.random() < 0.25 and "?" not in response:
-                        try:
-                            follow_up = self.assistant.question_gen.generate_question(context=part, send_to_discord=False)
-                            if follow_up:
-                                def delayed_follow_up():
-                                    time.sleep(random.randint(4, 8))
-                                    self.assistant.gui.root.after(0, lambda: self.assistant.gui.add_response("Sylveria (curious)", follow_up))
-                                threading.Thread(target=delayed_follow_up, daemon=True).start()
-                        except Exception as e:
-                            print(f"[Follow-up Error] {e}")
+                sources = None
+                if any(kw in lower_part for kw in ["search", "look up", "find info about"]):
+                    # Results go into the prompt and the model answers from them
+                    with span("planner.search") as search_span:
+                        result = self.invoker.invoke(
+                            "search", lambda: self._provider("search").grounding(part), key=lower_part
+                        )
+                        search_span.set(outcome=result.outcome, stale=result.stale)
+                    if not (result.ok or result.stale):
+                        final_responses.append(self.invoker.policy("search")["fallback"])
+                        continue
+                    if not result.value:
+                        final_responses.append("I didn’t find anything useful.")
+                        continue
+                    sources = result.value
+
+                with span("planner.chat"):
+                    session = self.assistant.summarizer.session(source)
+                    system_prompt, user_prompt = self.assistant.prompt_builder.get_system_and_user_prompt(
+                        enriched_prompt, session, sources=sources)
+                    response = self.ai.generate_with_prompts(system_prompt, user_prompt, on_token=on_token, source=source).strip()
+                    response = self.ai._clean_response(response)
+
+                    if len(response.split()) > 60:
+                        response = " ".join(response.split()[:60]) + "..."
+
+                    if response:
+                        final_responses.append(response)
+                        with span("planner.store_dialogue"):
+                            self._store_dialogue(part, response, source)
+
+                        if random.random() < 0.25 and "?" not in response:
+                            try:
+                                with span("planner.follow_up"):
+                                    follow_up = self.assistant.question_gen.generate_question(context=part, send_to_discord=False)
+                                if follow_up:
+                                    def delayed_follow_up():
+                                        time.sleep(random.randint(4, 8))
+                                        self.assistant.gui.call_soon(lambda: self.assistant.gui.add_response("Sylveria (curious)", follow_up))
+                                    threading.Thread(target=delayed_follow_up, daemon=True).start()
+                            except Exception as e:
+                                print(f"[Follow-up Error] {e}")
 
             return "\n".join(final_responses)
 
@@ -143,14 +170,16 @@ class ActionPlanner:
             print(f"[Planner Error] {e}")
             return "I had trouble figuring that one out."
 
+    def _provider(self, capability):
+        plugin = self.assistant.plugin_manager.provider(capability)
+        if plugin is None:
+            raise PluginUnavailable(capability)
+        return plugin
+
     def _store_goal(self, command):
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         self.goals.append({"text": command, "time": timestamp})
-        try:
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                json.dump(self.goals, f, indent=2)
-        except Exception as e:
-            print(f"[Memory Save Error]: {e}")
+        STATE.save("goals", self.goals)
         return "Okay, I'll remember that for you."
 
     def _recall_goals(self, _command):
@@ -159,14 +188,12 @@ class ActionPlanner:
         summary = "\n".join(f"- {g['text']} ({g['time']})" for g in self.goals[-5:])
         return f"Here's what I remember:\n{summary}"
 
-    def _store_dialogue(self, user_input, response):
+    def _store_dialogue(self, user_input, response, source=None):
         try:
-            history = self.assistant.data_manager.load("chat_log") or []
-            history.append({"user": user_input, "Sylveria": response})
-            self.assistant.data_manager.save("chat_log", history)
+            self.assistant.summarizer.record(source, user_input, response)
 
-            self.assistant.ai.history.append({"role": "user", "parts": [user_input]})
-            self.assistant.ai.history.append({"role": "model", "parts": [response]})
+            self.assistant.ai.add_turn("user", user_input)
+            self.assistant.ai.add_turn("model", response)
             self.assistant.ai._save_history()
 
             self.journal.maybe_share_random_thought()
@@ -1,34 +1,41 @@
 import re
 import time
-import threading
 import random
-from dateutil.parser import parse
 from assistant.utils.assistant_utils import words_to_numbers
+from assistant.utils.lazy_import import lazy_import
+from assistant.utils.tracing import span
 from assistant.plugins.google_calendar import create_event, get_upcoming_events, find_event_by_title, update_event
 import datetime
 import asyncio
 import os
 import subprocess
 
+dateutil_parser = lazy_import("dateutil.parser")
+
 class CommandProcessor:
     def __init__(self, assistant):
         self.assistant = assistant
         self.script_process = None
 
-    def process(self, command, source="assistant"):
-        # Detect and adjust tone based on emotional trigger
-        mood = self.assistant.personality_state.detect_emotional_trigger(command)
-        self.assistant.personality_state.adjust_tone_based_on_message(command)
-        print(f"[Mood Detection] Tone set to: {mood}")
+    def process(self, command, source="assistant", on_token=None):
+        self.assistant.update_user_activity()
+        with span("turn", source=source, input_chars=len(command)) as turn:
+            # Detect and adjust tone based on emotional trigger
+            with span("turn.mood"):
+                mood = self.assistant.personality_state.detect_emotional_trigger(command)
+                self.assistant.personality_state.adjust_tone_based_on_message(command)
+            print(f"[Mood Detection] Tone set to: {mood}")
 
-        response = self.assistant.planner.handle(command)
-        response = self.assistant.ai._clean_response(response)
+            response = self.assistant.planner.handle(command, on_token=on_token, source=source)
+            response = self.assistant.ai._clean_response(response)
 
-        if not response or not response.strip():
-            print("[CommandProcessor] Empty or invalid response after cleaning.")
-            return self.fallback_response()
+            if not response or not response.strip():
+                print("[CommandProcessor] Empty or invalid response after cleaning.")
+                turn.set(fallback=True)
+                return self.fallback_response()
 
-        return response
+            turn.set(output_chars=len(response))
+            return response
 
     def fallback_response(self):
         options = [
@@ -60,7 +67,7 @@ class CommandProcessor:
         label = " and ".join(label_parts)
 
         if is_recurring:
-            threading.Thread(target=self._recurring_timer_thread, args=(label, total_seconds), daemon=True).start()
+            self.assistant.jobs.every(f"timer:{label}", total_seconds, lambda: self._recurring_timer_fired(label))
             return f"Recurring timer set: I'll remind you every {label}."
 
         else:
@@ -69,13 +76,12 @@ class CommandProcessor:
             timers[label] = end_time
             self.assistant.data_manager.save('timers', timers)
 
-            threading.Thread(target=self._timer_thread, args=(label, total_seconds, discord_notify), daemon=True).start()
+            self.assistant.jobs.once(f"timer:{label}", total_seconds, lambda: self._timer_fired(label, discord_notify))
             return f"Timer set for {label}."
 
-    def _timer_thread(self, label, seconds, discord_notify=False):
-        time.sleep(seconds)
+    def _timer_fired(self, label, discord_notify=False):
         message = f"Timer for {label} is up!"
-        self.assistant.gui.add_response("Sylveria", message)
+        self.assistant.gui.call_soon(lambda: self.assistant.gui.add_response("Sylveria", message))
 
         if discord_notify and hasattr(self.assistant, "discord_bot"):
             try:
@@ -83,120 +89,113 @@ class CommandProcessor:
             except Exception as e:
                 print(f"[Discord DM Error] {e}")
 
-    def _recurring_timer_thread(self, label, interval):
-        while True:
-            time.sleep(interval)
-            message = f"Reminder: It's time for your {label}!"
-            print(f"[Recurring Timer] {message}")
+    def _recurring_timer_fired(self, label):
+        message = f"Reminder: It's time for your {label}!"
+        print(f"[Recurring Timer] {message}")
 
     def handle_calendar(self, command):
-        try:
-            is_recurring = "every" in command
-
-            cleaned = re.sub(
-                r'\b(add|set|schedule|remind|calendar|event|to|on|at|for|every|called|name|a|an|the)\b',
-                '', command, flags=re.IGNORECASE
-            )
-            event_name = re.sub(r'\s+', ' ', cleaned).strip()
-
-            if not event_name:
-                return "What should I call this event?"
+        """Only an unparseable time is answered here; Calendar API errors reach the caller."""
+        is_recurring = "every" in command
 
-            if is_recurring:
-                weekday_match = re.search(r'every\s+(\w+)', command)
-                time_match = re.search(r'at\s+(\d+)(?::(\d+))?\s*(am|pm)?', command)
+        cleaned = re.sub(
+            r'\b(add|set|schedule|remind|calendar|event|to|on|at|for|every|called|name|a|an|the)\b',
+            '', command, flags=re.IGNORECASE
+        )
+        event_name = re.sub(r'\s+', ' ', cleaned).strip()
 
-                if not weekday_match or not time_match:
-                    return "Sorry, I couldn't understand the recurring schedule."
+        if not event_name:
+            return "What should I call this event?"
 
-                day_name = weekday_match.group(1).capitalize()
-                hour = int(time_match.group(1))
-                minute = int(time_match.group(2)) if time_match.group(2) else 0
-                am_pm = time_match.group(3)
+        if is_recurring:
+            weekday_match = re.search(r'every\s+(\w+)', command)
+            time_match = re.search(r'at\s+(\d+)(?::(\d+))?\s*(am|pm)?', command)
 
-                if am_pm and am_pm.lower() == 'pm' and hour < 12:
-                    hour += 12
-                elif am_pm and am_pm.lower() == 'am' and hour == 12:
-                    hour = 0
+            if not weekday_match or not time_match:
+                return "Sorry, I couldn't understand the recurring schedule."
 
-                today = datetime.datetime.now()
-                weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                if day_name not in weekdays:
-                    return f"'{day_name}' doesn't look like a valid weekday."
+            day_name = weekday_match.group(1).capitalize()
+            hour = int(time_match.group(1))
+            minute = int(time_match.group(2)) if time_match.group(2) else 0
+            am_pm = time_match.group(3)
 
-                target_day = weekdays.index(day_name)
-                days_ahead = (target_day - today.weekday()) % 7
-                if days_ahead == 0 and datetime.datetime.now().time() > datetime.time(hour, minute):
-                    days_ahead += 7
+            if am_pm and am_pm.lower() == 'pm' and hour < 12:
+                hour += 12
+            elif am_pm and am_pm.lower() == 'am' and hour == 12:
+                hour = 0
 
-                next_occurrence = today + datetime.timedelta(days=days_ahead)
-                start_time = next_occurrence.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            today = datetime.datetime.now()
+            weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            if day_name not in weekdays:
+                return f"'{day_name}' doesn't look like a valid weekday."
+            if hour > 23 or minute > 59:
+                return "Sorry, that time doesn't look right."
 
-                create_event(event_name, start_time, recurring=True)
-                return f"Recurring event '{event_name}' set for every {day_name} at {start_time.strftime('%I:%M %p')}."
+            target_day = weekdays.index(day_name)
+            days_ahead = (target_day - today.weekday()) % 7
+            if days_ahead == 0 and datetime.datetime.now().time() > datetime.time(hour, minute):
+                days_ahead += 7
 
-            else:
-                dt = parse(command, fuzzy=True, default=datetime.datetime.now())
-                create_event(event_name, dt)
-                return f"Event '{event_name}' added to your Google Calendar for {dt.strftime('%A at %I:%M %p')}."
+            next_occurrence = today + datetime.timedelta(days=days_ahead)
+            start_time = next_occurrence.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
-        except Exception as e:
-            print(f"[Calendar Error] {e}")
-            return f"Sorry, I couldn't schedule that: {e}"
+            create_event(event_name, start_time, recurring=True)
+            return f"Recurring event '{event_name}' set for every {day_name} at {start_time.strftime('%I:%M %p')}."
 
-    def read_calendar(self, command):
         try:
-            if "week" in command:
-                days = 7
-            elif "tomorrow" in command:
-                days = 2
-            else:
-                days = 1
+            dt = dateutil_parser.parse(command, fuzzy=True, default=datetime.datetime.now())
+        except (ValueError, OverflowError) as e:
+            print(f"[Calendar] Couldn't parse a time from {command!r}: {e}")
+            return "Sorry, I couldn't work out when that should be."
+        create_event(event_name, dt)
+        return f"Event '{event_name}' added to your Google Calendar for {dt.strftime('%A at %I:%M %p')}."
 
-            events = get_upcoming_events(days_ahead=days)
+    def read_calendar(self, command):
+        if "week" in command:
+            days = 7
+        elif "tomorrow" in command:
+            days = 2
+        else:
+            days = 1
 
-            if not events:
-                return "You have no upcoming events."
+        events = get_upcoming_events(days_ahead=days)
 
-            lines = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                date = datetime.datetime.fromisoformat(start.replace("Z", "+00:00")).strftime('%A at %I:%M %p')
-                lines.append(f"{event['summary']} on {date}")
+        if not events:
+            return "You have no upcoming events."
 
-            return "Here's what's coming up: " + "; ".join(lines)
+        lines = []
+        for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            date = datetime.datetime.fromisoformat(start.replace("Z", "+00:00")).strftime('%A at %I:%M %p')
+            lines.append(f"{event['summary']} on {date}")
 
-        except Exception as e:
-            print(f"[Read Calendar Error] {e}")
-            return "Something went wrong trying to read your calendar."
+        return "Here's what's coming up: " + "; ".join(lines)
 
     def edit_calendar_event(self, command):
         try:
-            new_time = parse(command, fuzzy=True, default=datetime.datetime.now())
+            new_time = dateutil_parser.parse(command, fuzzy=True, default=datetime.datetime.now())
+        except (ValueError, OverflowError) as e:
+            print(f"[Calendar] Couldn't parse a time from {command!r}: {e}")
+            return "Sorry, I couldn't work out the new time."
 
-            cleaned = re.sub(r'\b(change|edit|move|reschedule|my|event|to|at|on|for)\b', '', command, flags=re.IGNORECASE)
-            event_title = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = re.sub(r'\b(change|edit|move|reschedule|my|event|to|at|on|for)\b', '', command, flags=re.IGNORECASE)
+        event_title = re.sub(r'\s+', ' ', cleaned).strip()
 
-            if not event_title:
-                return "What event should I update?"
+        if not event_title:
+            return "What event should I update?"
 
-            event = find_event_by_title(event_title)
-            if not event:
-                return f"I couldn't find an event called '{event_title}'."
+        event = find_event_by_title(event_title)
+        if not event:
+            return f"I couldn't find an event called '{event_title}'."
 
-            start = new_time
-            end = start + datetime.timedelta(hours=1)
+        start = new_time
+        end = start + datetime.timedelta(hours=1)
 
-            update_event(event['id'], {
-                'start': {'dateTime': start.isoformat(), 'timeZone': 'UTC'},
-                'end': {'dateTime': end.isoformat(), 'timeZone': 'UTC'}
-            })
+        update_event(event['id'], {
+            'start': {'dateTime': start.isoformat(), 'timeZone': 'UTC'},
+            'end': {'dateTime': end.isoformat(), 'timeZone': 'UTC'}
+        })
 
-            return f"'{event['summary']}' has been rescheduled to {start.strftime('%A at %I:%M %p')}."
-
-        except Exception as e:
-            print(f"[Calendar Edit Error] {e}")
-            return f"Sorry, I couldn't update that: {e}"
+        return f"'{event['summary']}' has been rescheduled to {start.strftime('%A at %I:%M %p')}."
 
     def list_files(self, command):
         try:
@@ -289,7 +288,7 @@ class CommandProcessor:
                 "Do not include explanation, just return the code."
             )
 
-            response = self.assistant.ai.generate(prompt=cleaned_command, system_prompt=system_prompt)
+            response = self.assistant.ai.generate_with_prompts(system_prompt, cleaned_command, source="script", max_words=None)
 
             code = self._extract_python_code(response)
 
@@ -1,9 +1,9 @@
 import re
-import threading
-import time
 import asyncio
+from assistant.plugins.invoker import PluginUnavailable
 from assistant.plugins.spotify import SpotifyHelper
 
+
 def words_to_numbers(text):
     word_map = {
         'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
@@ -24,10 +24,9 @@ class ToolHelper:
         self.command = assistant.command_processor
         self.youtube = assistant.youtube_player
         self.spotify = SpotifyHelper()
-        self.weather = getattr(assistant, "weather", None)
         
     def _get_plugin(self, name):
-        return self.assistant.plugins.get(name)
+        return self.assistant.plugin_manager.get(name)
 
     def set_timer(self, command):
         command = words_to_numbers(command.lower())
@@ -51,7 +50,7 @@ class ToolHelper:
 
         def notify_timer_done():
             message = f"Time's up for: {label}!"
-            self.assistant.gui.add_response("Sylveria", message)
+            self.assistant.gui.call_soon(lambda: self.assistant.gui.add_response("Sylveria", message))
             if hasattr(self.assistant, "discord_bot"):
                 try:
                     asyncio.run(self.assistant.discord_bot.notify_user(message))
@@ -59,14 +58,10 @@ class ToolHelper:
                     print(f"[Discord Ping Error] {e}")
 
         if is_recurring:
-            def recurring():
-                while True:
-                    time.sleep(total_seconds)
-                    notify_timer_done()
-            threading.Thread(target=recurring, daemon=True).start()
+            self.assistant.jobs.every(f"timer:{label}", total_seconds, notify_timer_done)
             return f"Recurring timer set: I'll remind you every {label}."
 
-        threading.Thread(target=lambda: (time.sleep(total_seconds), notify_timer_done()), daemon=True).start()
+        self.assistant.jobs.once(f"timer:{label}", total_seconds, notify_timer_done)
         return f"Timer set for {label}."
 
     def run_script(self, command):
@@ -78,27 +73,23 @@ class ToolHelper:
     # ─── Plugin-aware Methods ───────────────────────
 
     def check_weather(self, location=None):
-        if "weather" in self.assistant.plugins:
-            return self.assistant.plugins["weather"].get_weather(location)
+        plugin = self.assistant.plugin_manager.provider("weather")
+        if plugin:
+            return plugin.get_weather(location)
         return "Weather plugin is not available."
 
     def handle_calendar(self, command):
+        """Calendar errors propagate, so the planner's invoker counts them toward the breaker."""
         calendar = self._get_plugin("google_calendar")
-        if calendar:
-            try:
-                return calendar.handle_command(command)
-            except Exception as e:
-                return f"Calendar error: {e}"
-        return "Calendar plugin is not loaded."
-
-    def get_calendar_events(self):
+        if calendar is None:
+            raise PluginUnavailable("google_calendar")
+        return calendar.handle_command(command)
+
+    def get_calendar_events(self, command=""):
         calendar = self._get_plugin("google_calendar")
-        if calendar:
-            try:
-                return calendar.get_upcoming_events()
-            except Exception as e:
-                return f"Calendar error: {e}"
-        return "Calendar plugin is not available."
+        if calendar is None:
+            raise PluginUnavailable("google_calendar")
+        return calendar.describe_upcoming(command)
 
     # ─── Built-in Tools ─────────────────────────────
 
@@ -125,13 +116,13 @@ class ToolHelper:
 
     def spotify_play(self, command):
         query = command.lower().replace("play", "").replace("on spotify", "").strip()
-        return self.spotify.play_song(query)
+        return self.assistant.plugin_invoker.call("spotify", self.spotify.play_song, query)
 
     def spotify_pause(self):
-        return self.spotify.pause()
+        return self.assistant.plugin_invoker.call("spotify", self.spotify.pause)
 
     def spotify_resume(self):
-        return self.spotify.resume()
+        return self.assistant.plugin_invoker.call("spotify", self.spotify.resume)
 
     def spotify_now_playing(self):
-        return self.spotify.now_playing()
+        return self.assistant.plugin_invoker.call("spotify", self.spotify.now_playing, key="now_playing")
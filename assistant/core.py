@@ -4,12 +4,14 @@ import threading
 import logging
 from types import SimpleNamespace
 
-from assistant.io.audio import AudioManager
 from assistant.assistantcore.commands import CommandProcessor
+from assistant.storage.backup import BackupManager
 from assistant.storage.datafiles import DataFileManager
+from assistant.storage.snapshot import STATE
+from assistant.utils.job_scheduler import JobScheduler
 from assistant.utils.maintenance import MaintenanceTasks
 from assistant.ai.Ai_wrapper import AiWrapper
-from assistant.ui.gui import CombinedInterface
+from assistant.ai.summarizer import RollingSummarizer
 from assistant.io.youtube_player import YouTubePlayer
 from assistant.assistantcore.action_planner import ActionPlanner
 from assistant.assistantcore.tool_helper import ToolHelper
@@ -19,6 +21,7 @@ from assistant.memory.personality_state import PersonalityStateManager
 from assistant.ai.question_generator import QuestionGenerator
 from assistant.memory.preference_manager import PreferenceManager
 from assistant.memory.emotional_memory import EmotionalMemory
+from assistant.plugins.invoker import PluginInvoker
 from assistant.plugins.plugin_manager import PluginManager
 from assistant.ai.prompt_builder import SylveriaPromptBuilder
 from assistant.memory.internal_clock import InternalClock
@@ -27,13 +30,16 @@ from assistant.memory.growth_tracker import GrowthTracker
 
 
 class PersonalAssistant:
-    def __init__(self):
+    def __init__(self, headless=False):
         logging.basicConfig(
             filename='assistant.log',
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
         self.logger = logging.getLogger('Assistant')
+        self.headless = headless
+        self.last_user_activity = time.time()  # user presence
+        self.jobs = JobScheduler(self)  # every background chore and timer runs here
 
         # Initialize time & mood context systems
         self.clock = InternalClock()
@@ -55,6 +61,7 @@ class PersonalAssistant:
         # Plugins and tools
         self.plugin_manager = PluginManager(self)
         self.plugins = self.plugin_manager.load_plugins()
+        self.plugin_invoker = PluginInvoker()
         self.youtube_player = YouTubePlayer()
         self.command_processor = CommandProcessor(self)
         self.tools = ToolHelper(self)
@@ -64,33 +71,47 @@ class PersonalAssistant:
         self.conversation_history = self.data_manager.load("memory") or []
         self.ai = AiWrapper(self)
         self.ai.assistant = self
+        self.summarizer = RollingSummarizer(self)
         self.preferences = PreferenceManager(self)
         self.question_gen = QuestionGenerator(self)
         self.journal = AssistantJournal(self)
         self.personality = Personality()
         self.personality_state = PersonalityStateManager()
         self.planner = ActionPlanner(self)
-        self.audio_manager = AudioManager(self)
-        self.gui = CombinedInterface(self)
-        self.emotional_memory = EmotionalMemory()
+        self.audio_manager, self.gui = self._create_frontend()
+        self.emotional_memory = EmotionalMemory(self.growth)
 
         # Start systems
         threading.Thread(target=self.audio_manager.start, daemon=True).start()
         self.maintenance = MaintenanceTasks(self)
         self.maintenance.start_background_tasks()
-        threading.Thread(target=self._terminal_input_loop, daemon=True).start()
-
-        # User presence
-        self.last_user_activity = time.time()
         self.curiosity_enabled = True
+        self.start_curiosity_loop()
+        self.summarizer.start()
+        self.backups = BackupManager()
+        self.backups.start(self.jobs)
+        self.jobs.start()
+        if not self.headless:
+            threading.Thread(target=self._terminal_input_loop, daemon=True).start()
 
         # GUI notice
-        self.gui.response_box.after(0, lambda: self.gui.response_box.insert(
-            "end", "System: Assistant initialized\n"
-        ))
+        self.gui.call_soon(lambda: self.gui.notify("Assistant initialized"))
+
+    def _create_frontend(self):
+        # Imported here so headless deployments never load Tk, PIL or the audio stack
+        if self.headless:
+            from assistant.io.null_audio import NullAudioManager
+            from assistant.ui.output_sink import ConsoleSink
+            return NullAudioManager(self), ConsoleSink(self)
+
+        from assistant.io.audio import AudioManager
+        from assistant.ui.gui import CombinedInterface
+        return AudioManager(self), CombinedInterface(self)
 
     def save_memory(self):
         self.data_manager.save("memory", self.conversation_history)
+        self.summarizer.save()
+        STATE.flush()
 
     def _terminal_input_loop(self):
         print("💬 You can also talk to Sylveria here. Type your message below:\n")
@@ -109,18 +130,18 @@ class PersonalAssistant:
                 break
 
     def start_curiosity_loop(self):
-        def loop():
-            while True:
-                time.sleep(random.randint(1200, 3600))  # 20 to 60 mins
-                if self.curiosity_enabled and not getattr(self, "twitch_bot", None):
-                    question = random.choice([
-                        "What's something new you learned recently?",
-                        "If you could take a vacation right now, where would you go?",
-                        "Is there anything on your mind you'd like to share?",
-                    ])
-                    self.gui.add_response("Sylveria", question)
-                    self.audio_manager.speech_queue.put(question)
-        threading.Thread(target=loop, daemon=True).start()
+        def ask():
+            question = random.choice([
+                "What's something new you learned recently?",
+                "If you could take a vacation right now, where would you go?",
+                "Is there anything on your mind you'd like to share?",
+            ])
+            self.gui.call_soon(lambda: self.gui.add_response("Sylveria", question))
+            self.audio_manager.speech_queue.put(question, priority="notice")
+
+        # Every 20 to 60 mins, never mid-conversation or on stream
+        self.jobs.every("curiosity", 1200, ask, jitter=2400, idle_after=300,
+                        when=lambda: self.curiosity_enabled and not getattr(self, "twitch_bot", None))
 
     def update_user_activity(self):
         self.last_user_activity = time.time()
@@ -1,12 +1,16 @@
 import random
+import time
 from datetime import datetime
 
+REAL_WEATHER_VALID_S = 3 * 60 * 60
+
 class VirtualEnvironment:
     def __init__(self):
         self.time = self.get_time_of_day()
         self.weather = self._random_weather()
         self.wind = self._random_wind()
         self.last_refresh = datetime.now().hour
+        self.real_weather_at = None
 
     def get_time_of_day(self):
         hour = datetime.now().hour
@@ -32,10 +36,19 @@ class VirtualEnvironment:
         current_hour = datetime.now().hour
         if current_hour != self.last_refresh:
             self.time = self.get_time_of_day()
-            self.weather = self._random_weather()
+            if not self.has_real_weather():
+                self.weather = self._random_weather()
             self.wind = self._random_wind()
             self.last_refresh = current_hour
 
+    def set_real_weather(self, condition):
+        """Observed weather from the weather plugin; hourly refreshes keep it instead of rolling a random sky."""
+        self.weather = condition
+        self.real_weather_at = time.time()
+
+    def has_real_weather(self):
+        return self.real_weather_at is not None and time.time() - self.real_weather_at < REAL_WEATHER_VALID_S
+
     def describe(self):
         return f"It is {self.time}, the sky is {self.weather}, and the wind is {self.wind}."
 
@@ -1,27 +1,39 @@
 import threading
-import queue
 import time
-import numpy as np
-import pyaudio
 import re
 import os
-import tempfile
 import asyncio
-import edge_tts
-import whisper
-import soundfile as sf
-from pydub import AudioSegment
-from pydub.playback import play
+from assistant.io.playback import SpeechController
+from assistant.io.ring_buffer import AudioRingBuffer
+from assistant.io.stt import SpeechToText
+from assistant.utils.lazy_import import lazy_import
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
+
+np = lazy_import("numpy")
+pyaudio = lazy_import("pyaudio")
+edge_tts = lazy_import("edge_tts")
+pydub = lazy_import("pydub")
+
+CAPTURE_BUFFER_S = 30
+PLAYBACK_CHUNK_MS = 50  # how quickly speech stops after an interrupt
 
 class AudioManager:
     def __init__(self, assistant):
         self.assistant = assistant
-        self.speech_queue = queue.Queue()
-        self.audio_queue = queue.Queue()
-        self.whisper_model = whisper.load_model("base.en")
+        # Priorities, expiry, dedup and barge-in; put(text, priority=...) like the old queue
+        self.speech_queue = SpeechController(self._speak)
+        self.stt = SpeechToText()  # nothing loads until start()
 
         self.sample_rate = 16000
         self.frame_length = 512
+        # Built in start() so constructing the manager doesn't import numpy
+        self.ring = None
+        self.listener = None
+        self._pa = None
+        REGISTRY.gauge("queue_depth", {"queue": "speech"}, fn=self.speech_queue.qsize, help_text="Items waiting in audio queues.")
+        REGISTRY.gauge("queue_depth", {"queue": "audio"},
+                       fn=lambda: self.listener.available() // self.frame_length if self.listener else 0)
         self.command_mode = False
         self._command_timeout = 10.0
         self.last_active = time.time()
@@ -29,13 +41,18 @@ class AudioManager:
         self._conversation_followups = ("and", "also", "then", "next", "too", "what about")
 
     def start(self):
-        threading.Thread(target=self._speech_loop, daemon=True).start()
+        self.stt.start()  # warm worker process; the model never loads on the audio thread
+        self.ring = AudioRingBuffer(CAPTURE_BUFFER_S, self.sample_rate)
+        self.listener = self.ring.reader()
+        self._wake_chunk = np.empty(self.frame_length, dtype=np.int16)
+        self._command_audio = np.empty(int(self._command_timeout * self.sample_rate), dtype=np.int16)
+        self._pa = pyaudio.PyAudio()
+        self.speech_queue.start()
         threading.Thread(target=self._process_audio_loop, daemon=True).start()
         self._start_audio_capture()
 
     def _start_audio_capture(self):
-        pa = pyaudio.PyAudio()
-        self.stream = pa.open(
+        self.stream = self._pa.open(
             rate=self.sample_rate,
             channels=1,
             format=pyaudio.paInt16,
@@ -46,15 +63,17 @@ class AudioManager:
         self.stream.start_stream()
 
     def _audio_callback(self, in_data, frame_count, time_info, status):
-        self.audio_queue.put(in_data)
+        self.ring.write(in_data)
         return (None, pyaudio.paContinue)
 
     def _process_audio_loop(self):
         while True:
-            if not self.audio_queue.empty():
-                raw_data = self.audio_queue.get()
-                pcm = np.frombuffer(raw_data, dtype=np.int16)
+            # Sleeps until a full frame has been captured
+            pcm = self.listener.read(self.frame_length, out=self._wake_chunk)
+            if pcm is None:
+                return  # capture closed
 
+            try:
                 if not self.command_mode:
                     text = self._try_quick_transcribe(pcm)
                     if self.wake_word in text.lower():
@@ -63,45 +82,48 @@ class AudioManager:
                 else:
                     self.last_active = time.time()
                     self._handle_command_mode()
-            else:
-                time.sleep(0.01)
+            except Exception as e:
+                # A timed-out or dead STT worker must not end the loop, or the wake word stops working
+                print(f"[STT Error] {e}")
+                if self.command_mode:
+                    self.command_mode = False
+                    self.speech_queue.put("I didn't catch that.", priority="urgent")
+                self._restart_stt()
+
+    def _restart_stt(self):
+        try:
+            self.stt.restart_if_dead()
+        except Exception as e:
+            print(f"[STT Error] Restart failed: {e}")
+            time.sleep(5)  # don't spin on a worker that can't load
 
     def _handle_wake_word(self):
         self.command_mode = True
-        self.speech_queue.put("Yes?")
+        self.speech_queue.barge_in()  # the user is talking; stop whatever we were saying
+        self.speech_queue.put("Yes?", priority="urgent")
         self._clear_audio_queue()
         time.sleep(1.0)
 
     def _handle_command_mode(self):
-        start_time = time.time()
-        audio_data = []
-
-        while time.time() - start_time < self._command_timeout:
-            if not self.audio_queue.empty():
-                pcm = np.frombuffer(self.audio_queue.get(), dtype=np.int16)
-                audio_data.append(pcm)
-            else:
-                time.sleep(0.05)
+        # Whatever arrives within the command window, copied straight into a preallocated buffer
+        audio_array = self.listener.read(len(self._command_audio), out=self._command_audio,
+                                         timeout=self._command_timeout, partial=True)
 
-        if not audio_data:
+        if audio_array is None or not len(audio_array):
             self.command_mode = False
-            self.speech_queue.put("I didn't catch that.")
+            self.speech_queue.put("I didn't catch that.", priority="urgent")
             return
 
-        audio_array = np.concatenate(audio_data)
         if np.abs(audio_array).mean() < 30:
             self.command_mode = False
-            self.speech_queue.put("It was too quiet, I couldn't hear you.")
+            self.speech_queue.put("It was too quiet, I couldn't hear you.", priority="urgent")
             return
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            sf.write(temp_audio.name, audio_array, self.sample_rate)
-            result = self.whisper_model.transcribe(temp_audio.name)
-            text = result["text"].strip()
+        text = self.stt.transcribe(audio_array, mode="command")
 
         if not text or len(text.split()) < 2:
             self.command_mode = False
-            self.speech_queue.put("Sorry, I didn't understand that clearly.")
+            self.speech_queue.put("Sorry, I didn't understand that clearly.", priority="urgent")
             return
 
         lower_text = text.lower().strip()
@@ -119,17 +141,15 @@ class AudioManager:
         self.command_mode = False
 
     def _clear_audio_queue(self):
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.listener.skip_to_end()
 
     def _process_command(self, text):
-        self.assistant.gui.add_response("You", text)
-        response = self.assistant.command_processor.process(text)
+        gui = self.assistant.gui
+        gui.call_soon(lambda: gui.add_response("You", text))
+        response = self.assistant.command_processor.process(text, source="voice")
         if response and response.strip():
-            self.assistant.gui.add_response(self.assistant.personality.get_name(), response)
+            name = self.assistant.personality.get_name()
+            gui.call_soon(lambda: gui.add_response(name, response))
             self.speech_queue.put(response)
 
     def _try_quick_transcribe(self, pcm):
@@ -137,25 +157,10 @@ class AudioManager:
         if np.abs(audio_array).mean() < 0.01:
             return ""
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            sf.write(temp_audio.name, pcm, self.sample_rate)
-            result = self.whisper_model.transcribe(temp_audio.name)
-            return result.get("text", "")
+        return self.stt.transcribe(pcm, mode="wake")
 
-    def _speech_loop(self):
-        while True:
-            try:
-                text = self.speech_queue.get(timeout=0.1)
-                if not text.strip():
-                    continue
-                if hasattr(self.assistant, "gui") and hasattr(self.assistant.gui, "is_talking"):
-                    if self.assistant.gui.is_talking():
-                        continue
-                self._speak(text)
-            except queue.Empty:
-                time.sleep(0.05)
-
-    def _speak(self, text):
+    def _speak(self, text, stop_event=None):
+        stop_event = stop_event or threading.Event()
         if not text or not text.strip():
             text = "Sorry, I was going to say something, but it slipped my tongue."
 
@@ -174,7 +179,8 @@ class AudioManager:
                 os.remove(filename)
 
             try:
-                asyncio.run(self._speak_edge(text, filename))
+                with span("tts.synthesize", chars=len(text)):
+                    asyncio.run(self._speak_edge(text, filename))
             except RuntimeError:
                 loop = asyncio.get_event_loop()
                 loop.create_task(self._speak_edge(text, filename))
@@ -182,10 +188,13 @@ class AudioManager:
 
             if not os.path.exists(filename):
                 raise RuntimeError("TTS output file not created.")
+            if stop_event.is_set():
+                return  # interrupted while synthesizing
 
-            sound = AudioSegment.from_file(filename, format="mp3")
-            play(sound - 6)
-            time.sleep(0.75)
+            with span("tts.playback") as s:
+                sound = pydub.AudioSegment.from_file(filename, format="mp3")
+                s.set(completed=self._play(sound - 6, stop_event))
+            stop_event.wait(0.75)
         except Exception as e:
             print(f"[Edge TTS error]: {e}")
         finally:
@@ -194,6 +203,28 @@ class AudioManager:
             if hasattr(self.assistant, "gui"):
                 self.assistant.gui.set_talking(False)
 
+    def _play(self, sound, stop_event):
+        """Plays an AudioSegment in PLAYBACK_CHUNK_MS pieces. Returns False if stop_event cut it short."""
+        if self._pa is None:
+            self._pa = pyaudio.PyAudio()
+        stream = self._pa.open(
+            format=self._pa.get_format_from_width(sound.sample_width),
+            channels=sound.channels,
+            rate=sound.frame_rate,
+            output=True
+        )
+        raw = sound.raw_data
+        step = sound.frame_width * (sound.frame_rate * PLAYBACK_CHUNK_MS // 1000)
+        try:
+            for offset in range(0, len(raw), step):
+                if stop_event.is_set():
+                    return False
+                stream.write(raw[offset:offset + step])
+            return True
+        finally:
+            stream.stop_stream()
+            stream.close()
+
     async def _speak_edge(self, text, filename):
         try:
             if not text or not text.strip():
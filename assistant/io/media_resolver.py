@@ -0,0 +1,146 @@
+"""Turns "play X" into a playable stream URL without a fresh yt-dlp run each time.
+
+Two caches sit in front of yt-dlp:
+
+    query    -> top search results (id, title, url)    TTLCache "youtube_search", persisted
+    video id -> stream URL + title/uploader/description  TTLCache "youtube_streams"
+
+Searches use flat extraction, which lists results without resolving any
+formats, so they take a fraction of a full ytsearch. After a search, the
+top PREFETCH_RESULTS are resolved to stream URLs concurrently in the
+background. A "play" that follows a "search youtube for" then finds its
+stream ready or already in flight. Stream URLs carry their own expiry
+(the expire= parameter on googlevideo links). An entry is only reused
+while it has more than EXPIRY_MARGIN_S left.
+
+YoutubeDL instances are built once per worker thread and reused; they
+are not safe to share between threads.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+from assistant.utils.cache import TTLCache, normalize_key
+from assistant.utils.lazy_import import lazy_import
+from assistant.utils.metrics import record_cache
+from assistant.utils.tracing import span
+
+yt_dlp = lazy_import("yt_dlp")
+
+SEARCH_RESULTS = 3
+PREFETCH_RESULTS = 3
+RESOLVE_WORKERS = 3
+SEARCH_TTL_S = 24 * 60 * 60
+STREAM_TTL_S = 5 * 60 * 60        # used when a URL doesn't say when it expires
+EXPIRY_MARGIN_S = 10 * 60
+
+SEARCH_OPTIONS = {'quiet': True, 'skip_download': True, 'extract_flat': 'in_playlist'}
+STREAM_OPTIONS = {'format': 'bestaudio/best', 'quiet': True, 'skip_download': True, 'noplaylist': True}
+
+
+def stream_expiry(url, fallback_s=STREAM_TTL_S):
+    """Unix time a stream URL stops working, from its expire= parameter when it has one."""
+    try:
+        return float(parse_qs(urlparse(url).query)["expire"][0])
+    except (KeyError, ValueError, IndexError):
+        return time.time() + fallback_s
+
+
+class MediaResolver:
+    def __init__(self):
+        self.searches = TTLCache("youtube_search", maxsize=128, ttl=SEARCH_TTL_S, persist=True)
+        self.streams = TTLCache("youtube_streams", maxsize=64, ttl=STREAM_TTL_S)
+        self.pool = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix="yt-resolve")
+        self._local = threading.local()
+        self._pending = {}    # video id -> Future of an in-flight resolve
+        self._lock = threading.Lock()
+
+    def _extractor(self, kind):
+        ydl = getattr(self._local, kind, None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(SEARCH_OPTIONS if kind == "search" else STREAM_OPTIONS)
+            setattr(self._local, kind, ydl)
+        return ydl
+
+    # ─── Search ─────────────────────────────────
+
+    def _search(self, query):
+        with span("youtube.search"):
+            info = self._extractor("search").extract_info(f"ytsearch{SEARCH_RESULTS}:{query}", download=False)
+        results = []
+        for entry in info.get('entries') or []:
+            video_id = entry.get('id')
+            if video_id:
+                results.append({
+                    "id": video_id,
+                    "title": entry.get('title') or video_id,
+                    "url": entry.get('webpage_url') or entry.get('url') or f"https://www.youtube.com/watch?v={video_id}",
+                })
+        return results or None
+
+    def search(self, query, prefetch=True):
+        """Top results as [{id, title, url}], cached per normalized query."""
+        results = self.searches.get_or_load(normalize_key(query), lambda: self._search(query)) or []
+        if prefetch:
+            for result in results[:PREFETCH_RESULTS]:
+                self.prefetch(result["id"])
+        return results
+
+    # ─── Streams ────────────────────────────────
+
+    def _cached_stream(self, video_id):
+        info = self.streams.peek(video_id)
+        if info and info["expires"] - EXPIRY_MARGIN_S > time.time():
+            return info
+        return None
+
+    def _resolve(self, video_id):
+        with span("youtube.resolve", video=video_id):
+            info = self._extractor("stream").extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+        stream = {
+            "id": video_id,
+            "url": info['url'],
+            "expires": stream_expiry(info['url']),
+            "title": info.get('title', ''),
+            "uploader": info.get('uploader', ''),
+            "description": (info.get('description') or '')[:300],
+        }
+        self.streams.put(video_id, stream)
+        return stream
+
+    def prefetch(self, video_id):
+        """Starts resolving a video in the background unless it is cached or already underway."""
+        with self._lock:
+            if video_id in self._pending or self._cached_stream(video_id):
+                return self._pending.get(video_id)
+            future = self.pool.submit(self._resolve, video_id)
+            self._pending[video_id] = future
+        future.add_done_callback(lambda _: self._forget(video_id))
+        return future
+
+    def _forget(self, video_id):
+        with self._lock:
+            self._pending.pop(video_id, None)
+
+    def stream(self, video_id):
+        """Stream info for a video: cached, joined from an in-flight prefetch, or resolved now."""
+        cached = self._cached_stream(video_id)
+        record_cache("youtube_streams", cached is not None)
+        if cached:
+            return cached
+        future = self.prefetch(video_id)
+        if future is None:  # became cached between the two checks
+            return self._cached_stream(video_id)
+        return future.result()
+
+    def stream_for_query(self, query):
+        """The first search result's stream info, or None when the search finds nothing."""
+        results = self.search(query, prefetch=False)
+        if not results:
+            return None
+        return self.stream(results[0]["id"])
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+        self.searches.flush()
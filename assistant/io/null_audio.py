@@ -0,0 +1,45 @@
+import queue
+import time
+
+
+class _DiscardQueue:
+    """Queue-compatible sink that drops everything put into it."""
+
+    def put(self, item, block=True, timeout=None, **options):
+        pass
+
+    def put_nowait(self, item):
+        pass
+
+    def get(self, block=True, timeout=None):
+        raise queue.Empty
+
+    def get_nowait(self):
+        raise queue.Empty
+
+    def empty(self):
+        return True
+
+    def qsize(self):
+        return 0
+
+    def barge_in(self):
+        pass
+
+    def interrupt(self):
+        pass
+
+
+class NullAudioManager:
+    """Stand-in for AudioManager in headless deployments: no microphone, no TTS, no Whisper."""
+
+    def __init__(self, assistant=None):
+        self.assistant = assistant
+        self.speech_queue = _DiscardQueue()
+        self.ring = None
+        self.listener = None
+        self.command_mode = False
+        self.last_active = time.time()
+
+    def start(self):
+        pass
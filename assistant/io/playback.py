@@ -0,0 +1,161 @@
+"""Spoken output queue with priorities, expiry, duplicate suppression and barge-in.
+
+    speech = SpeechController(speak)          # speak(text, stop_event) synthesizes and plays
+    speech.put("Yes?", priority="urgent")
+    speech.put(reply)                         # "reply" is the default
+    speech.put(idle_question, priority="notice")
+    speech.barge_in()                         # wake word: cut the current line, drop queued talk
+
+Priorities are urgent (acknowledgements, alarms), then reply, then
+notice (curiosity questions, Twitch chatter). The highest-priority
+utterance plays next. A newer urgent or reply utterance interrupts
+lower-priority speech. A reply that has been talking for more than
+PREEMPT_AFTER_S also yields to a newer reply, so one long answer can't
+hold up the next.
+
+An utterance still queued after STALE_AFTER_S for its priority is
+dropped unspoken. A reply or notice already queued, playing, or spoken
+within DEDUP_WINDOW_S is ignored, because the GUI, the voice loop and
+the console all hand over the same reply. Urgent lines ("Yes?") are
+never deduplicated.
+
+speak() must return soon after stop_event is set; AudioManager plays
+in short chunks and checks it between them.
+
+Outcomes are counted in speech_utterances_total{outcome}: spoken,
+interrupted, expired, duplicate or dropped.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+from assistant.utils.cache import normalize_key
+from assistant.utils.metrics import REGISTRY
+
+URGENT, REPLY, NOTICE = 0, 1, 2
+PRIORITIES = {"urgent": URGENT, "reply": REPLY, "notice": NOTICE}
+STALE_AFTER_S = {URGENT: 5.0, REPLY: 45.0, NOTICE: 20.0}
+DEDUP_WINDOW_S = 15.0
+PREEMPT_AFTER_S = 8.0
+
+
+class Utterance:
+    __slots__ = ("text", "key", "priority", "created", "expires")
+
+    def __init__(self, text, priority, ttl=None):
+        self.text = text
+        self.key = normalize_key(text)
+        self.priority = priority
+        self.created = time.monotonic()
+        self.expires = self.created + (STALE_AFTER_S[priority] if ttl is None else ttl)
+
+    def __repr__(self):
+        return f"Utterance({self.text[:30]!r}, priority={self.priority})"
+
+
+def _count(outcome):
+    REGISTRY.counter("speech_utterances_total", {"outcome": outcome}, help_text="Queued speech by outcome.").inc()
+
+
+class SpeechController:
+    def __init__(self, speak):
+        self.speak = speak
+        self.current = None
+        self._current_started = 0.0
+        self._heap = []
+        self._seq = itertools.count()
+        self._recent = OrderedDict()    # key -> when it was last accepted
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="speech", daemon=True)
+            self._thread.start()
+        return self
+
+    # ─── Queueing ───────────────────────────────
+
+    def put(self, text, priority="reply", ttl=None, block=True, timeout=None):
+        """Queues text to be spoken. Returns False when it was empty or a duplicate.
+
+        block/timeout are accepted and ignored so this can stand in for the old queue.Queue.
+        """
+        if not text or not text.strip():
+            return False
+        utterance = Utterance(text.strip(), PRIORITIES.get(priority, priority), ttl)
+        now = utterance.created
+        with self._cond:
+            while self._recent and next(iter(self._recent.values())) < now - DEDUP_WINDOW_S:
+                self._recent.popitem(last=False)
+            if utterance.priority != URGENT:
+                if utterance.key in self._recent:
+                    _count("duplicate")
+                    return False
+                self._recent[utterance.key] = now
+
+            heapq.heappush(self._heap, (utterance.priority, next(self._seq), utterance))
+            if self.current is not None and self._preempts(utterance, now):
+                self._stop.set()
+            self._cond.notify()
+        return True
+
+    def _preempts(self, new, now):
+        current = self.current
+        if new.priority < current.priority:
+            return True
+        return new.priority == current.priority == REPLY and now - self._current_started > PREEMPT_AFTER_S
+
+    def qsize(self):
+        return len(self._heap)
+
+    def interrupt(self):
+        """Stops whatever is playing; the queue carries on."""
+        self._stop.set()
+
+    def barge_in(self):
+        """The user started talking: stop speaking and drop queued replies and notices."""
+        with self._cond:
+            kept = [entry for entry in self._heap if entry[0] < REPLY]
+            for _ in range(len(self._heap) - len(kept)):
+                _count("dropped")
+            self._heap = kept
+            heapq.heapify(self._heap)
+            self._stop.set()
+
+    def clear(self):
+        with self._cond:
+            self._heap.clear()
+
+    # ─── Playing ────────────────────────────────
+
+    def _next(self):
+        with self._cond:
+            while True:
+                while not self._heap:
+                    self._cond.wait()
+                _, _, utterance = heapq.heappop(self._heap)
+                if time.monotonic() > utterance.expires:
+                    _count("expired")
+                    continue
+                self.current = utterance
+                self._current_started = time.monotonic()
+                self._stop.clear()
+                return utterance
+
+    def _loop(self):
+        while True:
+            utterance = self._next()
+            try:
+                self.speak(utterance.text, self._stop)
+            except Exception as e:
+                print(f"[Speech Error] {e}")
+            _count("interrupted" if self._stop.is_set() else "spoken")
+            with self._cond:
+                self.current = None
+                if utterance.priority != URGENT:
+                    self._recent[utterance.key] = time.monotonic()  # dedup window runs from when it finished
+                    self._recent.move_to_end(utterance.key)
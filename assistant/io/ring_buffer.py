@@ -0,0 +1,130 @@
+"""Preallocated ring buffer between the microphone callback and its consumers.
+
+    ring = AudioRingBuffer(seconds=30, sample_rate=16000)
+    ring.write(in_data)                      # PyAudio callback: one copy into the ring, nothing allocated
+    reader = ring.reader()                   # one cursor per consumer, starting at "now"
+    chunk = reader.read(512, out=chunk_buf)  # sleeps until 512 samples exist
+    clip = reader.read(16000 * 10, out=clip_buf, timeout=10, partial=True)
+
+There is one writer, the audio callback. It copies into the ring without
+holding the lock and only takes it briefly to publish the new write
+position and wake readers. Each reader keeps its own position, so wake
+word detection and command capture never steal each other's audio.
+
+A reader that falls more than a ring's worth behind is moved forward to
+the oldest sample still stored. The samples it lost are counted in
+reader.dropped and in audio_overflow_samples_total. reader.timestamp(pos)
+gives the capture time of any stored sample.
+"""
+import threading
+import time
+
+from assistant.utils.lazy_import import lazy_import
+from assistant.utils.metrics import REGISTRY
+
+np = lazy_import("numpy")
+
+
+class AudioRingBuffer:
+    def __init__(self, seconds=30.0, sample_rate=16000, dtype="int16"):
+        self.sample_rate = sample_rate
+        self.capacity = int(seconds * sample_rate)
+        self.dtype = np.dtype(dtype)
+        self.buffer = np.zeros(self.capacity, dtype=self.dtype)
+        self.written = 0            # samples ever written; position of the next sample
+        self.anchor_pos = 0         # a sample position and the clock time it was captured
+        self.anchor_time = time.time()
+        self.closed = False
+        self._cond = threading.Condition()
+        self._overflow = REGISTRY.counter("audio_overflow_samples_total",
+                                          help_text="Captured samples a reader lost because it fell a full buffer behind.")
+
+    def write(self, data, captured_at=None):
+        """Appends raw PCM bytes (or an array of samples) captured at captured_at (defaults to now)."""
+        samples = np.frombuffer(data, dtype=self.dtype) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        n = len(samples)
+        if n > self.capacity:
+            samples, n = samples[-self.capacity:], self.capacity
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        self.buffer[start:start + first] = samples[:first]
+        if first < n:
+            self.buffer[:n - first] = samples[first:]
+
+        end_time = captured_at if captured_at is not None else time.time()
+        with self._cond:
+            self.written += n
+            self.anchor_pos = self.written
+            self.anchor_time = end_time
+            self._cond.notify_all()
+
+    def reader(self):
+        return RingReader(self)
+
+    def close(self):
+        """Wakes every blocked reader; reads then return what is left, or None."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def copy_out(self, pos, n, out):
+        """Copies n samples starting at absolute position pos into out[:n]."""
+        start = pos % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        if first < n:
+            out[first:n] = self.buffer[:n - first]
+        return out[:n]
+
+
+class RingReader:
+    def __init__(self, ring):
+        self.ring = ring
+        self.pos = ring.written
+        self.dropped = 0
+
+    def available(self):
+        return self.ring.written - self.pos
+
+    def skip_to_end(self):
+        """Forgets everything buffered so far (e.g. the user's wake word or our own voice)."""
+        self.pos = self.ring.written
+
+    def timestamp(self, pos=None):
+        """Capture time of sample pos (default: the next one this reader will return)."""
+        ring = self.ring
+        pos = self.pos if pos is None else pos
+        return ring.anchor_time - (ring.anchor_pos - pos) / ring.sample_rate
+
+    def _catch_up(self):
+        behind = self.ring.written - self.pos
+        if behind > self.ring.capacity:
+            lost = behind - self.ring.capacity
+            self.pos += lost
+            self.dropped += lost
+            self.ring._overflow.inc(lost)
+
+    def read(self, n, out=None, timeout=None, partial=False):
+        """Next n samples, waiting for them to arrive.
+
+        Returns a view of out (allocated when not given) holding n samples.
+        On timeout or close it returns whatever arrived when partial is set,
+        otherwise None, and leaves the unread samples for the next call.
+        """
+        ring = self.ring
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with ring._cond:
+            while ring.written - self.pos < n and not ring.closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                ring._cond.wait(remaining)
+            self._catch_up()
+            count = min(n, ring.written - self.pos)
+        if count < n and not partial:
+            return None
+        if out is None:
+            out = np.empty(n, dtype=ring.dtype)
+        view = ring.copy_out(self.pos, count, out)
+        self.pos += count
+        return view
@@ -0,0 +1,287 @@
+"""Speech-to-text engines and the warm worker process that runs them.
+
+An engine is a named model + runtime + precision from ENGINES:
+
+    whisper-base.en               openai-whisper, float32 on CPU (the old default)
+    whisper-base.en-int8          same model, Linear layers dynamically quantized to int8
+    faster-whisper-base.en-int8   CTranslate2 int8 kernels (pip install faster-whisper)
+    ...
+
+Pick one with SYLVERIA_STT_ENGINE. benchmarks/bench_stt.py measures
+latency and word error rate for each engine on a folder of recorded
+clips. Choose the cheapest one that meets the latency target.
+
+SpeechToText loads the engine in a spawned worker process at start(),
+so the model is warm before the first wake word. The audio thread never
+loads or runs the model, and torch never enters the assistant process.
+Requests go over a pipe and are transcribed one by one, in order.
+SYLVERIA_STT_INPROCESS=1 runs the engine on the calling thread instead,
+which is easier to debug.
+
+The int8 whisper engines swap whisper's own Linear subclass for plain
+nn.Linear before quantize_dynamic, which only matches exact types and
+would otherwise leave every layer in float32.
+
+Audio in: int16 or float32 mono PCM at 16 kHz, as a numpy array.
+No temporary WAV files.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from assistant.utils.lazy_import import lazy_import
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
+
+np = lazy_import("numpy")
+whisper = lazy_import("whisper")
+torch = lazy_import("torch")
+faster_whisper = lazy_import("faster_whisper")
+
+SAMPLE_RATE = 16000
+DEFAULT_ENGINE = os.environ.get("SYLVERIA_STT_ENGINE", "whisper-base.en")
+IN_PROCESS = os.environ.get("SYLVERIA_STT_INPROCESS") == "1"
+START_TIMEOUT_S = 120      # first run may download the model
+REQUEST_TIMEOUT_S = 60
+
+ENGINES = {
+    "whisper-tiny.en":             {"runtime": "whisper", "model": "tiny.en", "precision": "float32"},
+    "whisper-tiny.en-int8":        {"runtime": "whisper", "model": "tiny.en", "precision": "int8"},
+    "whisper-base.en":             {"runtime": "whisper", "model": "base.en", "precision": "float32"},
+    "whisper-base.en-int8":        {"runtime": "whisper", "model": "base.en", "precision": "int8"},
+    "whisper-small.en":            {"runtime": "whisper", "model": "small.en", "precision": "float32"},
+    "faster-whisper-tiny.en-int8": {"runtime": "faster_whisper", "model": "tiny.en", "precision": "int8"},
+    "faster-whisper-base.en-int8": {"runtime": "faster_whisper", "model": "base.en", "precision": "int8"},
+    "faster-whisper-small.en-int8": {"runtime": "faster_whisper", "model": "small.en", "precision": "int8"},
+}
+
+
+def to_float32(pcm):
+    """Model input: float32 in [-1, 1]."""
+    if pcm.dtype == np.float32:
+        return pcm
+    return pcm.astype(np.float32) / 32768.0
+
+
+# ─── Engines ────────────────────────────────────
+
+class STTEngine:
+    """load() once, then transcribe(audio) per clip; audio is float32 mono 16 kHz."""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+
+    def load(self):
+        raise NotImplementedError
+
+    def transcribe(self, audio):
+        raise NotImplementedError
+
+
+def plain_linears(module):
+    """Replaces nn.Linear subclasses (whisper.model.Linear) with nn.Linear holding the same weights."""
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            linear.weight = child.weight
+            linear.bias = child.bias
+            setattr(module, name, linear)
+        else:
+            plain_linears(child)
+    return module
+
+
+class WhisperEngine(STTEngine):
+    def load(self):
+        model = whisper.load_model(self.spec["model"], device="cpu")
+        if self.spec["precision"] == "int8":
+            model = torch.quantization.quantize_dynamic(plain_linears(model), {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        return self
+
+    def transcribe(self, audio):
+        return self.model.transcribe(audio, fp16=False, language="en")["text"].strip()
+
+
+class FasterWhisperEngine(STTEngine):
+    def load(self):
+        self.model = faster_whisper.WhisperModel(
+            self.spec["model"], device="cpu", compute_type=self.spec["precision"], cpu_threads=os.cpu_count() or 4
+        )
+        return self
+
+    def transcribe(self, audio):
+        segments, _ = self.model.transcribe(audio, language="en", beam_size=1)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+RUNTIMES = {"whisper": WhisperEngine, "faster_whisper": FasterWhisperEngine}
+
+
+def create_engine(name=DEFAULT_ENGINE):
+    if name not in ENGINES:
+        raise ValueError(f"unknown STT engine {name!r}; choose from {', '.join(ENGINES)}")
+    spec = ENGINES[name]
+    return RUNTIMES[spec["runtime"]](name, spec)
+
+
+# ─── Worker process ─────────────────────────────
+
+def _stt_worker(engine_name, conn):
+    try:
+        engine = create_engine(engine_name).load()
+        engine.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))  # first call pays for kernel setup
+        conn.send(("ready", None, None))
+    except Exception as e:
+        conn.send(("error", None, f"{type(e).__name__}: {e}"))
+        return
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        request_id, _, raw, dtype = request
+        try:
+            conn.send(("ok", request_id, engine.transcribe(to_float32(np.frombuffer(raw, dtype=dtype)))))
+        except Exception as e:
+            conn.send(("error", request_id, f"{type(e).__name__}: {e}"))
+
+
+class SpeechToText:
+    def __init__(self, engine=DEFAULT_ENGINE, in_process=IN_PROCESS):
+        self.engine_name = engine
+        self.in_process = in_process
+        self._engine = None
+        self._process = None
+        self._conn = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._engine_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._latency = {}
+
+    def start(self):
+        """Loads the engine (in the worker, unless in_process) and waits until it is warm."""
+        with span("stt.start", engine=self.engine_name, in_process=self.in_process):
+            if self.in_process:
+                self._engine = create_engine(self.engine_name).load()
+            else:
+                self._spawn()
+        self._ready.set()
+        return self
+
+    def _spawn(self):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=_stt_worker, args=(self.engine_name, child), name="stt-worker", daemon=True
+        )
+        self._process.start()
+        deadline = time.monotonic() + START_TIMEOUT_S
+        while not self._conn.poll(0.25):
+            if not self._process.is_alive():
+                raise RuntimeError(f"STT worker exited while loading (code {self._process.exitcode})")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"STT engine {self.engine_name} did not load within {START_TIMEOUT_S}s")
+        status, _, error = self._conn.recv()
+        if status == "error":
+            raise RuntimeError(f"STT engine {self.engine_name} failed to load: {error}")
+        threading.Thread(target=self._receive_loop, args=(self._conn, self._pending),
+                         name="stt-results", daemon=True).start()
+
+    def _receive_loop(self, conn, pending):
+        while True:
+            try:
+                status, request_id, value = conn.recv()
+            except (EOFError, OSError):
+                break
+            future = pending.pop(request_id, None)
+            if future is None or future.cancelled():
+                continue  # the caller gave up waiting
+            if status == "ok":
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+        for future in list(pending.values()):
+            if not future.cancelled():
+                future.set_exception(RuntimeError("STT worker stopped"))
+        pending.clear()
+
+    def alive(self):
+        return self.in_process or (self._process is not None and self._process.is_alive())
+
+    def restart_if_dead(self):
+        """Respawns a worker process that exited (crash, OOM kill). Returns True if it did."""
+        if self.alive() or self._process is None:
+            return False
+        print(f"[STT] Worker exited (code {self._process.exitcode}); restarting {self.engine_name}")
+        self._ready.clear()
+        try:
+            self._conn.close()
+        except OSError:
+            pass
+        self._pending = {}
+        try:
+            self._spawn()
+        finally:
+            self._ready.set()
+        return True
+
+    def submit(self, pcm, mode="command"):
+        """Queues a clip and returns a Future for its text."""
+        if self.in_process:
+            future = Future()
+            try:
+                with self._engine_lock:
+                    future.set_result(self._engine.transcribe(to_float32(pcm)))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        request_id = next(self._ids)
+        future = Future()
+        self._pending[request_id] = future
+        with self._send_lock:
+            self._conn.send((request_id, mode, pcm.tobytes(), pcm.dtype.str))
+        return future
+
+    def transcribe(self, pcm, mode="command", timeout=REQUEST_TIMEOUT_S):
+        self._ready.wait()
+        started = time.perf_counter()
+        with span("stt.transcribe", mode=mode, engine=self.engine_name, audio_s=round(len(pcm) / SAMPLE_RATE, 2)):
+            future = self.submit(pcm, mode)
+            try:
+                text = future.result(timeout)
+            except FutureTimeout:
+                future.cancel()
+                raise TimeoutError(f"STT engine {self.engine_name} took longer than {timeout}s")
+        self._observe(mode, (time.perf_counter() - started) * 1000)
+        return text
+
+    def _observe(self, mode, ms):
+        histogram = self._latency.get(mode)
+        if histogram is None:
+            histogram = self._latency[mode] = REGISTRY.histogram(
+                "stt_latency_ms", {"engine": self.engine_name, "mode": mode},
+                help_text="Speech-to-text request latency, queueing included."
+            )
+        histogram.observe(ms)
+
+    def stop(self):
+        if self._conn is not None:
+            try:
+                with self._send_lock:
+                    self._conn.send(None)
+            except (OSError, ValueError):
+                pass
+        if self._process is not None:
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
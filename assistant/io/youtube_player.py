@@ -1,30 +1,34 @@
-import yt_dlp
-import vlc
 import threading
 import time
+from assistant.io.media_resolver import MediaResolver
+from assistant.utils.lazy_import import lazy_import
+
+vlc = lazy_import("vlc")
 
 class YouTubePlayer:
     def __init__(self, assistant=None):
         self.assistant = assistant
         self.player = None
         self.current_video = None
+        self.resolver = MediaResolver()
 
-    def _play_audio(self, url):
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'quiet': True
-        }
+    def _play_audio(self, query):
+        try:
+            info = self.resolver.stream_for_query(query)
+        except Exception as e:
+            print(f"[YouTube Play Error] {e}")
+            return
+        if info is None:
+            print(f"[YouTube] Nothing found for '{query}'")
+            return
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(f"ytsearch:{url}", download=False)['entries'][0]
-            stream_url = info['url']
-            self.current_video = info
-            self.player = vlc.MediaPlayer(stream_url)
-            self.player.play()
+        self.current_video = info
+        self.player = vlc.MediaPlayer(info['url'])
+        self.player.play()
 
-            # Let the video buffer a bit before reacting
-            time.sleep(2)
-            self._react_to_video(info)
+        # Let the video buffer a bit before reacting
+        time.sleep(2)
+        self._react_to_video(info)
 
     def play(self, query):
         threading.Thread(target=self._play_audio, args=(query,), daemon=True).start()
@@ -36,9 +40,8 @@ class YouTubePlayer:
 
     def search(self, query):
         try:
-            with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
-                results = ydl.extract_info(f"ytsearch3:{query}", download=False)['entries']
-                return [(entry['title'], entry['webpage_url']) for entry in results]
+            # Also starts resolving the top results, so a following "play" is near instant
+            return [(result['title'], result['url']) for result in self.resolver.search(query)]
         except Exception as e:
             print(f"[YouTube Search Error] {e}")
             return []
@@ -59,7 +62,7 @@ class YouTubePlayer:
         )
 
         try:
-            response = self.assistant.ai.generate(prompt)
+            response = self.assistant.ai.generate(prompt, source="youtube")
             if response:
                 self.assistant.gui.add_response("Sylveria", response)
         except Exception as e:
@@ -1,50 +1,33 @@
-import os
-import json
 import random
 from datetime import datetime
 from assistant.memory.growth_tracker import GrowthTracker
+from assistant.memory.records import EMOTIONAL_MEMORY_LIMIT, EmotionalMemoryRecord, dump_records, load_records
+from assistant.storage.snapshot import STATE
 
 
-MEMORY_FILE = "assistant/memory/emotional_memories.json"
-
 class EmotionalMemory:
-    def __init__(self):
-        os.makedirs("assistant/memory", exist_ok=True)
-
-        if not os.path.exists(MEMORY_FILE):
-            with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-                json.dump([], f)
-
+    def __init__(self, growth_tracker=None):
         self.memories = self._load_memories()
-        self.growth_tracker = GrowthTracker()
+        self.growth_tracker = growth_tracker or GrowthTracker()
 
     def _load_memories(self):
-        try:
-            with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[Memory Load Error]: {e}")
-            return []
+        memories = load_records(EmotionalMemoryRecord, STATE.load("emotional_memories", []), EMOTIONAL_MEMORY_LIMIT)
+        STATE.release("emotional_memories")
+        return memories
 
     def _save_memories(self):
-        try:
-            with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.memories, f, indent=2)
-        except Exception as e:
-            print(f"[Memory Save Error]: {e}")
+        STATE.save("emotional_memories", lambda: dump_records(self.memories))
 
     def record_memory(self, user_input, response):
         # 10% chance to record a special emotional memory
         if random.random() < 0.10:
             feeling = random.choice(["warm", "joyful", "grateful", "hopeful", "loved", "amused"])
-            memory_entry = {
-                "time": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                "user_input": user_input,
-                "sylveria_response": response,
-                "feeling": feeling,
-            }
-            self.memories.append(memory_entry)
-            self.memories = self.memories[-50:]  # keep memory list short
+            self.memories.append(EmotionalMemoryRecord(
+                time=datetime.now().strftime("%Y-%m-%d %H:%M"),
+                user_input=user_input,
+                sylveria_response=response,
+                feeling=feeling,
+            ))  # bounded deque keeps the list short
             self._save_memories()
             print(f"[EmotionalMemory] Recorded a new emotional memory!")
 
@@ -62,6 +45,6 @@ class EmotionalMemory:
 
         memory = random.choice(self.memories)
         return (
-            f"I still remember when you said '{memory['user_input']}'... "
-            f"It made me feel really {memory['feeling']}. 💜"
+            f"I still remember when you said '{memory.user_input}'... "
+            f"It made me feel really {memory.feeling}. 💜"
         )
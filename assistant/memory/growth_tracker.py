@@ -1,39 +1,39 @@
-import json
-import os
 from datetime import datetime
+from assistant.memory.records import GrowthEvent, dump_records, load_records
+from assistant.storage.snapshot import STATE
 
 class GrowthTracker:
-    def __init__(self, path="assistant/memory/growth_log.json"):
-        self.path = path
-        self.growth_log = self._load()
+    def __init__(self):
+        self._growth_log = None
 
-    def _load(self):
-        if os.path.exists(self.path):
-            with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
+    @property
+    def growth_log(self):
+        # The log only grows; decode it on first use rather than at startup
+        if self._growth_log is None:
+            self._growth_log = load_records(GrowthEvent, STATE.load("growth_log", []))
+            STATE.release("growth_log")
+        return self._growth_log
 
     def _save(self):
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.growth_log, f, indent=2)
+        STATE.save("growth_log", lambda: dump_records(self.growth_log))
 
     def add_event(self, text: str, tags: list = [], emotion: str = None):
-        event = {
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "timestamp": datetime.now().isoformat(),
-            "event": text,
-            "tags": tags,
-            "emotion": emotion
-        }
-        self.growth_log.append(event)
+        now = datetime.now()
+        self.growth_log.append(GrowthEvent(
+            date=now.strftime("%Y-%m-%d"),
+            timestamp=now.isoformat(),
+            event=text,
+            tags=tags,
+            emotion=emotion
+        ))
         self._save()
 
     def get_anniversaries_today(self):
         today = datetime.now().strftime("%m-%d")
-        return [e for e in self.growth_log if e["date"][5:] == today]
+        return [e for e in self.growth_log if e.date[5:] == today]
 
     def get_events_by_tag(self, tag: str):
-        return [e for e in self.growth_log if tag in e["tags"]]
+        return [e for e in self.growth_log if tag in e.tags]
 
     def get_all(self):
         return self.growth_log
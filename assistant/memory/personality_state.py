@@ -1,38 +1,25 @@
-import json
-import os
 import random
-
-STATE_FILE = "assistant/memory/personality_state.json"
+from assistant.storage.snapshot import STATE
 
 class PersonalityStateManager:
     def __init__(self):
-        os.makedirs("assistant/memory", exist_ok=True)
         self.state = self._load_state()
 
     def _load_state(self):
-        if not os.path.exists(STATE_FILE):
+        data = STATE.load("personality_state")
+        if not isinstance(data, dict):
             return {
                 "topics": [],
                 "tone": "neutral",
                 "emotion": "unexpressed",
                 "preferences": {}
             }
-        try:
-            with open(STATE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if "emotion" not in data:
-                    data["emotion"] = "unexpressed"
-                return data
-        except Exception as e:
-            print(f"[PersonalityState Load Error]: {e}")
-            return {"topics": [], "tone": "neutral", "emotion": "unexpressed", "preferences": {}}
+        for key, value in (("topics", []), ("tone", "neutral"), ("emotion", "unexpressed"), ("preferences", {})):
+            data.setdefault(key, value)
+        return data
 
     def _save_state(self):
-        try:
-            with open(STATE_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.state, f, indent=2)
-        except Exception as e:
-            print(f"[PersonalityState Save Error]: {e}")
+        STATE.save("personality_state", self.state)
 
     def get_tone(self):
         return self.state.get("tone", "neutral")
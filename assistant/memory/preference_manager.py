@@ -1,25 +1,18 @@
-import os
-import json
+from assistant.storage.snapshot import STATE
 
 
 class PreferenceManager:
     def __init__(self, assistant):
         self.assistant = assistant
-        self.path = "assistant/memory/preferences.json"
-        os.makedirs("memory", exist_ok=True)
-
-        if os.path.exists(self.path):
-            with open(self.path, "r", encoding="utf-8") as f:
-                self.preferences = json.load(f)
-        else:
+        self.preferences = STATE.load("preferences")
+        if self.preferences is None:
             self.preferences = {"movies": {"likes": [], "dislikes": []},
                                 "music": {"likes": [], "dislikes": []},
                                 "games": {"likes": [], "dislikes": []}}
             self._save()
 
     def _save(self):
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.preferences, f, indent=2)
+        STATE.save("preferences", self.preferences)
 
     def add_preference(self, category: str, item: str, like=True):
         category = category.lower()
@@ -56,7 +49,7 @@ class PreferenceManager:
             f"Reply with either 'like' or 'dislike', followed by a short, sincere reason that sounds like you."
         )
 
-        result = self.assistant.ai.generate(prompt).lower().strip()
+        result = self.assistant.ai.generate(prompt, source="preference").lower().strip()
 
         if "like" in result:
             self.add_preference(category, topic, like=True)
@@ -75,7 +68,9 @@ class PreferenceManager:
         return "I don’t think I’ve made up my mind on that one yet."
 
     def clear_all(self):
-        self.preferences = {"movies": {"likes": [], "dislikes": []},
-                            "music": {"likes": [], "dislikes": []},
-                            "games": {"likes": [], "dislikes": []}}
+        # Cleared in place: Personality holds the same dict
+        self.preferences.clear()
+        self.preferences.update({"movies": {"likes": [], "dislikes": []},
+                                 "music": {"likes": [], "dislikes": []},
+                                 "games": {"likes": [], "dislikes": []}})
         self._save()
@@ -0,0 +1,88 @@
+"""Compact in-memory records for histories and memories.
+
+The JSON files still hold plain dicts. In memory each entry is a slotted
+object, so there is no per-record dict with repeated key strings. Roles,
+feelings, tags and dates come from a small closed vocabulary, so they are
+interned and every record shares one string object per value.
+"""
+import sys
+from collections import deque
+
+ROLES = ("user", "sylveria", "model")
+
+HISTORY_LIMIT = 100
+EMOTIONAL_MEMORY_LIMIT = 50
+
+
+def intern(value):
+    """Shared string table for repeated labels; None and non-strings pass through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def bounded(items, maxlen):
+    return deque(items, maxlen=maxlen)
+
+
+class Record:
+    __slots__ = ()
+    INTERNED = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            kwargs[name] = value
+        for name in self.__slots__:
+            value = kwargs.get(name)
+            setattr(self, name, intern(value) if name in self.INTERNED else value)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Turn(Record):
+    """One chat history entry; stored on disk as {"role": ..., "parts": [text]}."""
+    __slots__ = ("role", "text")
+    INTERNED = ("role",)
+
+    @classmethod
+    def from_dict(cls, data):
+        parts = data.get("parts") or []
+        return cls(data.get("role", "user"), parts[0] if len(parts) == 1 else " ".join(map(str, parts)))
+
+    def to_dict(self):
+        return {"role": self.role, "parts": [self.text]}
+
+
+class EmotionalMemoryRecord(Record):
+    __slots__ = ("time", "user_input", "sylveria_response", "feeling")
+    INTERNED = ("feeling",)
+
+
+class GrowthEvent(Record):
+    __slots__ = ("date", "timestamp", "event", "tags", "emotion")
+    INTERNED = ("date", "emotion")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tags = tuple(intern(tag) for tag in (self.tags or ()))
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["tags"] = list(self.tags)
+        return data
+
+
+def load_records(record_type, items, maxlen=None):
+    records = [record_type.from_dict(item) for item in items or [] if isinstance(item, dict)]
+    return bounded(records, maxlen) if maxlen else records
+
+
+def dump_records(records):
+    return [record.to_dict() for record in records]
@@ -1,12 +1,8 @@
-import os
-import json
 import time
-
-STATE_FILE = "assistant/memory/personality_state.json"
+from assistant.storage.snapshot import STATE
 
 class ContextualPersonality:
     def __init__(self):
-        os.makedirs("memory", exist_ok=True)
         self.state = {
             "topics": [],
             "tone": "neutral",
@@ -15,19 +11,14 @@ class ContextualPersonality:
         self.load_state()
 
     def load_state(self):
-        if os.path.exists(STATE_FILE):
-            try:
-                with open(STATE_FILE, "r", encoding="utf-8") as f:
-                    self.state = json.load(f)
-            except Exception:
-                pass
+        state = STATE.load("personality_state")
+        if state is not None:
+            for key, value in self.state.items():
+                state.setdefault(key, value)
+            self.state = state
 
     def save_state(self):
-        try:
-            with open(STATE_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.state, f, indent=2)
-        except Exception as e:
-            print(f"[Personality Save Error] {e}")
+        STATE.save("personality_state", self.state)
 
     def update_from_input(self, text):
         lowered = text.lower()
@@ -3,6 +3,16 @@ import asyncio
 import threading
 import random
 from config.secrets import DISCORD_USER_ID, DISCORD_TOKEN
+from assistant.utils.metrics import REGISTRY
+
+MANIFEST = {
+    "provides": ["discord"],
+    "autostart": True,  # has to be connected to receive DMs
+}
+
+def _count_message(kind):
+    REGISTRY.counter("frontend_messages_total", {"frontend": "discord", "kind": kind},
+                     help_text="Inbound frontend messages by frontend and kind.").inc()
 
 class DiscordBot(discord.Client):
     def __init__(self, assistant):
@@ -21,30 +31,34 @@ class DiscordBot(discord.Client):
             return
 
         content = message.content.strip()
+        _count_message("seen")
 
         #Direct Message (Private DM)
         if isinstance(message.channel, discord.DMChannel):
+            _count_message("dm")
             user_input = content
             async with message.channel.typing():
-                response = self.assistant.command_processor.process(user_input)
+                response = self.assistant.command_processor.process(user_input, source="discord")
                 await asyncio.sleep(random.uniform(1.0, 2.0))  # natural typing delay
                 await message.channel.send(response)
             return
 
         #Prefixed command
         if content.startswith(self.prefix):
+            _count_message("command")
             await self.handle_command(message, content[len(self.prefix):])
 
         #Mention fallback
         elif self.user in message.mentions:
+            _count_message("mention")
             cleaned = content.replace(f"<@{self.user.id}>", "").strip()
             if cleaned:
-                response = self.assistant.command_processor.process(cleaned)
+                response = self.assistant.command_processor.process(cleaned, source="discord")
                 await message.channel.send(response)
 
     async def handle_command(self, message, command):
         try:
-            response = self.assistant.command_processor.process(command)
+            response = self.assistant.command_processor.process(command, source="discord")
             await message.channel.send(response)
         except Exception as e:
             print(f"[DiscordBot Error] {e}")
@@ -70,6 +84,10 @@ class DiscordBot(discord.Client):
         else:
             print("[DiscordBot] Event loop not ready; cannot send DM.")
 
+    def shutdown(self, timeout=10):
+        if self.loop_reference and self.loop_reference.is_running():
+            asyncio.run_coroutine_threadsafe(self.close(), self.loop_reference).result(timeout)
+
     def send_ping(self, message: str):
         self.notify_user(message)
 
@@ -94,10 +112,14 @@ class DiscordBot(discord.Client):
 
 #Plugin entry point
 def start(assistant):
-    def run_discord_bot():
-        bot = DiscordBot(assistant)
-        assistant.discord_bot = bot  # Make accessible externally
-        bot.run(DISCORD_TOKEN)
-
-    threading.Thread(target=run_discord_bot, daemon=True).start()
+    bot = DiscordBot(assistant)
+    assistant.discord_bot = bot  # Make accessible externally
+    threading.Thread(target=bot.run, args=(DISCORD_TOKEN,), name="discord-bot", daemon=True).start()
     print("[Plugin] Discord bot is starting in background.")
+    return bot
+
+
+def stop(assistant, bot):
+    if getattr(assistant, "discord_bot", None) is bot:
+        del assistant.discord_bot
+    bot.shutdown()
@@ -1,12 +1,257 @@
+"""Google Calendar with one authorized client and a local event mirror.
+
+The service is built once and rebuilt only when config/token.json
+changes. Events live in a mirror kept in the state snapshot ("calendar"
+section), indexed by start time and by title word. A full sync lists
+the window from yesterday to SYNC_WINDOW_DAYS ahead, so recurring events
+expand into a bounded number of instances. Later syncs send the stored
+sync token and only receive what changed since (cancelled events arrive
+as deletions); changes past the window are ignored. Once less than
+RESYNC_AHEAD_DAYS of the window is left, the next sync is a full one
+over a fresh window. If Google expires the token (HTTP 410), the next
+sync is a full one too.
+
+"What's coming up" and title lookups are answered from the mirror. A
+mirror older than SYNC_INTERVAL_S is refreshed in the background while
+the current copy answers. Only the very first read waits on the network.
+Creates and updates are written through to the mirror straight away.
+
+For tests, pass a fake client: CalendarMirror(service_factory=lambda:
+FakeCalendarService()) (see benchmarks/fakes.py).
+"""
 import datetime
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+import os
+import re
+import threading
+import time
+
+from assistant.storage.snapshot import STATE
+from assistant.utils.lazy_import import lazy_import
+from assistant.utils.tracing import span
+
+google_credentials = lazy_import("google.oauth2.credentials")
+google_discovery = lazy_import("googleapiclient.discovery")
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+TOKEN_FILE = "config/token.json"
+CALENDAR_ID = "primary"
+SYNC_INTERVAL_S = 5 * 60
+SYNC_PAGE_SIZE = 250
+KEEP_PAST_S = 24 * 60 * 60      # ended events are dropped from the mirror after this
+SYNC_WINDOW_DAYS = 30           # how far ahead a full sync lists
+RESYNC_AHEAD_DAYS = 21          # roll the window forward once less than this is left
+EVENT_FIELDS = ("id", "summary", "start", "end", "htmlLink", "recurringEventId")
+
+MANIFEST = {
+    "provides": ["calendar"],
+    "autostart": False,
+}
+
+_service = None
+_service_mtime = None
+_service_lock = threading.Lock()
+
 
 def get_calendar_service():
-    creds = Credentials.from_authorized_user_file("config/token.json", SCOPES)
-    return build('calendar', 'v3', credentials=creds)
+    """The shared authorized client; rebuilt only when the token file changes."""
+    global _service, _service_mtime
+    with _service_lock:
+        mtime = os.path.getmtime(TOKEN_FILE)
+        if _service is None or mtime != _service_mtime:
+            creds = google_credentials.Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+            _service = google_discovery.build('calendar', 'v3', credentials=creds, cache_discovery=False)
+            _service_mtime = mtime
+        return _service
+
+
+def event_start(event):
+    """Start of an event as a timestamp; all-day events start at local midnight."""
+    return _timestamp(event.get('start', {}))
+
+
+def event_end(event):
+    end = event.get('end')
+    return _timestamp(end) if end else event_start(event)
+
+
+def _timestamp(moment):
+    value = moment.get('dateTime') or moment.get('date')
+    if not value:
+        return 0.0
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None and 'dateTime' in moment:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)  # we write naive times as UTC
+    return parsed.timestamp()
+
+
+def _words(text):
+    return set(re.findall(r"\w+", (text or "").lower()))
+
+
+def _is_gone(error):
+    return getattr(getattr(error, "resp", None), "status", None) == 410
+
+
+class CalendarMirror:
+    def __init__(self, service_factory=get_calendar_service, calendar_id=CALENDAR_ID, section="calendar"):
+        self.service_factory = service_factory
+        self.calendar_id = calendar_id
+        self.section = section
+        self.events = None          # id -> trimmed event, loaded on first use
+        self.sync_token = None
+        self.window_end = 0.0       # events starting after this are not mirrored
+        self.synced_at = None
+        self._by_start = []         # sorted (start, id)
+        self._by_word = {}          # title word -> ids
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+    # ─── State ──────────────────────────────────
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self.events is None:
+                state = STATE.load(self.section, {}) or {}
+                self.events = state.get("events", {})
+                self.sync_token = state.get("sync_token")
+                self.window_end = state.get("window_end", 0.0)
+                self._reindex()
+
+    def _dump(self):
+        with self._lock:
+            return {"sync_token": self.sync_token, "window_end": self.window_end, "events": self.events}
+
+    def _reindex(self):
+        self._by_start = sorted((event_start(event), event_id) for event_id, event in self.events.items())
+        self._by_word = {}
+        for event_id, event in self.events.items():
+            for word in _words(event.get('summary')):
+                self._by_word.setdefault(word, set()).add(event_id)
+
+    def _store(self, event):
+        if event.get('status') == 'cancelled' or event_start(event) >= self.window_end:
+            self.events.pop(event['id'], None)
+        else:
+            self.events[event['id']] = {key: event[key] for key in EVENT_FIELDS if key in event}
+
+    # ─── Sync ───────────────────────────────────
+
+    def sync(self):
+        """Pulls changes since the last sync (or everything, the first time). Returns how many events changed."""
+        self._ensure_loaded()
+        with self._sync_lock, span("calendar.sync") as s:
+            now = time.time()
+            window_end = now + SYNC_WINDOW_DAYS * 86400
+            full = self.sync_token is None or self.window_end - now < RESYNC_AHEAD_DAYS * 86400
+            try:
+                changes, token = self._list_changes(None if full else self.sync_token, now, window_end)
+            except Exception as e:
+                if full or not _is_gone(e):
+                    raise
+                print("[Calendar] Sync token expired; doing a full sync.")
+                changes, token = self._list_changes(None, now, window_end)
+                full = True
+            s.set(mode="full" if full else "incremental")
+
+            with self._lock:
+                if full:
+                    self.events = {}
+                    self.window_end = window_end
+                for event in changes:
+                    self._store(event)
+                cutoff = time.time() - KEEP_PAST_S
+                for event_id in [i for i, event in self.events.items() if event_end(event) < cutoff]:
+                    del self.events[event_id]
+                self.sync_token = token
+                self.synced_at = time.monotonic()
+                self._reindex()
+            s.set(changed=len(changes), events=len(self.events))
+            STATE.save(self.section, self._dump)
+            return len(changes)
+
+    def _list_changes(self, sync_token, now, window_end):
+        service = self.service_factory()
+        params = {"calendarId": self.calendar_id, "singleEvents": True, "maxResults": SYNC_PAGE_SIZE}
+        if sync_token:
+            params["syncToken"] = sync_token  # Google rejects timeMin/timeMax next to a sync token
+        else:
+            utc = datetime.timezone.utc
+            params["timeMin"] = datetime.datetime.fromtimestamp(now - KEEP_PAST_S, utc).isoformat()
+            params["timeMax"] = datetime.datetime.fromtimestamp(window_end, utc).isoformat()
+
+        items = []
+        while True:
+            page = service.events().list(**params).execute()
+            items.extend(page.get('items', []))
+            if not page.get('nextPageToken'):
+                return items, page.get('nextSyncToken')
+            params["pageToken"] = page['nextPageToken']
+
+    def sync_in_background(self):
+        if not self._sync_lock.locked():
+            threading.Thread(target=self._safe_sync, name="calendar-sync", daemon=True).start()
+
+    def _safe_sync(self):
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"[Calendar Sync Error] {e}")
+
+    def ensure_fresh(self):
+        self._ensure_loaded()
+        if self.synced_at is None and self.sync_token is None:
+            self.sync()  # nothing to answer from yet
+        elif self.synced_at is None or time.monotonic() - self.synced_at > SYNC_INTERVAL_S:
+            self.sync_in_background()
+
+    def apply(self, event):
+        """Writes a created or updated event into the mirror without waiting for the next sync."""
+        self._ensure_loaded()
+        with self._lock:
+            self._store(event)
+            self._reindex()
+        STATE.save(self.section, self._dump)
+
+    # ─── Queries ────────────────────────────────
+
+    def upcoming(self, days_ahead=1, limit=10):
+        """Events still running or starting within days_ahead, soonest first."""
+        self.ensure_fresh()
+        now = time.time()
+        until = now + days_ahead * 86400
+        with self._lock:
+            # Scans from the earliest start: a multi-day event that began long ago is still running.
+            # Everything before now is ongoing or ended within KEEP_PAST_S, so that part stays short.
+            found = []
+            for begins, event_id in self._by_start:
+                if begins >= until or len(found) >= limit:
+                    break
+                event = self.events[event_id]
+                if event_end(event) > now:
+                    found.append(event)
+            return found
+
+    def find_by_title(self, title, days_ahead=14):
+        """Soonest upcoming event whose title contains title."""
+        needle = title.lower().strip()
+        words = _words(needle)
+        self.ensure_fresh()
+        with self._lock:
+            if words and all(word in self._by_word for word in words):
+                candidates = set.intersection(*(self._by_word[word] for word in words))
+            else:
+                candidates = None  # a fragment like "dent" of "Dentist" isn't indexed; scan instead
+            limit = len(self.events) or 1
+        for event in self.upcoming(days_ahead=days_ahead, limit=limit):
+            if candidates is not None and event['id'] not in candidates:
+                continue
+            if needle in event.get('summary', '').lower():
+                return event
+        return None
+
+
+MIRROR = CalendarMirror()
+
 
 def create_event(summary, start_time, recurring=False):
     service = get_calendar_service()
@@ -20,52 +265,64 @@ def create_event(summary, start_time, recurring=False):
     if recurring:
         event['recurrence'] = ['RRULE:FREQ=WEEKLY']
 
-    event = service.events().insert(calendarId='primary', body=event).execute()
+    event = service.events().insert(calendarId=CALENDAR_ID, body=event).execute()
     print(f"[Calendar] Created: {event.get('htmlLink')}")
+    if recurring:
+        MIRROR.sync_in_background()  # the mirror holds instances, not the recurring master
+    else:
+        MIRROR.apply(event)
     return event
 
-def get_upcoming_events(days_ahead=1):
-    service = get_calendar_service()
-    now = datetime.datetime.utcnow().isoformat() + 'Z'
-    future = (datetime.datetime.utcnow() + datetime.timedelta(days=days_ahead)).isoformat() + 'Z'
 
-    events_result = service.events().list(
-        calendarId='primary',
-        timeMin=now,
-        timeMax=future,
-        maxResults=10,
-        singleEvents=True,
-        orderBy='startTime'
-    ).execute()
+def get_upcoming_events(days_ahead=1):
+    return MIRROR.upcoming(days_ahead=days_ahead)
 
-    return events_result.get('items', [])
 
 def find_event_by_title(title):
-    events = get_upcoming_events(days_ahead=14)
-    for event in events:
-        if title.lower() in event.get('summary', '').lower():
-            return event
-    return None
+    return MIRROR.find_by_title(title, days_ahead=14)
+
 
 def update_event(event_id, updates: dict):
     service = get_calendar_service()
-    event = service.events().get(calendarId='primary', eventId=event_id).execute()
+    event = service.events().get(calendarId=CALENDAR_ID, eventId=event_id).execute()
 
     for key, value in updates.items():
         if key in ['start', 'end', 'summary']:
             event[key] = value
 
-    updated_event = service.events().update(calendarId='primary', eventId=event_id, body=event).execute()
+    updated_event = service.events().update(calendarId=CALENDAR_ID, eventId=event_id, body=event).execute()
     print(f"[Calendar] Updated event: {updated_event['summary']}")
+    MIRROR.apply(updated_event)
     return updated_event
 
-# 🔌 Optional startup hook
+
+class GoogleCalendar:
+    """What the planner talks to; the phrasing lives in CommandProcessor."""
+
+    def __init__(self, assistant, mirror=MIRROR):
+        self.assistant = assistant
+        self.mirror = mirror
+
+    def handle_command(self, command):
+        commands = self.assistant.command_processor
+        if re.search(r'\b(change|edit|move|reschedule)\b', command, re.IGNORECASE):
+            return commands.edit_calendar_event(command)
+        return commands.handle_calendar(command)
+
+    def describe_upcoming(self, command=""):
+        return self.assistant.command_processor.read_calendar(command.lower())
+
+
 def start(assistant):
-    print("[Plugin] Google Calendar available. No background thread needed.")
-    # If needed, you could attach functions here like:
-    assistant.tools.google_calendar = {
-        "create_event": create_event,
-        "get_upcoming_events": get_upcoming_events,
-        "find_event_by_title": find_event_by_title,
-        "update_event": update_event,
-    }
+    instance = GoogleCalendar(assistant)
+    jobs = getattr(assistant, "jobs", None)
+    if jobs is not None:
+        jobs.every("calendar.sync", SYNC_INTERVAL_S, instance.mirror.sync, first_in=0, threaded=True)
+    print("[Plugin] Google Calendar loaded; mirror syncs in the background.")
+    return instance
+
+
+def stop(assistant, instance):
+    jobs = getattr(assistant, "jobs", None)
+    if jobs is not None:
+        jobs.cancel("calendar.sync")
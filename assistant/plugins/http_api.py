@@ -0,0 +1,321 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web, WSMsgType
+
+from assistant.utils.metrics import REGISTRY
+
+HTTP_API_HOST = "127.0.0.1"
+HTTP_API_PORT = 8765
+MAX_CONCURRENT_TURNS = 4     # turns running CommandProcessor.process at once
+MAX_QUEUED_TURNS = 32        # turns allowed to wait for a slot before we answer 503
+SESSION_TTL = 3600           # seconds of inactivity before a session id is forgotten
+MAX_MESSAGE_CHARS = 4000
+STREAM_MAX_WORDS = 60        # same cap the planner puts on a chat reply
+
+MANIFEST = {
+    "provides": ["http_api"],
+    "autostart": True,
+}
+
+
+class HttpApiServer:
+    """Local asyncio HTTP + WebSocket frontend for CommandProcessor.process.
+
+    POST /v1/chat        {"message": "...", "session_id": "optional"} -> {"session_id", "response", "latency_ms"}
+    POST /v1/sessions    -> {"session_id"}
+    GET  /v1/ws          WebSocket; send {"message", "session_id"?}, receive token/done frames
+    GET  /health         liveness + load
+    GET  /stats          request counters and latency
+    GET  /metrics        Prometheus text exposition of the process-wide metrics registry
+
+    Token frames are a live preview of the model's text, stopped at
+    STREAM_MAX_WORDS like the reply itself. The done frame's response is
+    the reply: clients replace the preview with it. Tool answers (weather,
+    timers, ...) and the trailing "..." of a cut reply only arrive there.
+    """
+
+    def __init__(self, assistant, host=HTTP_API_HOST, port=HTTP_API_PORT,
+                 max_concurrent=MAX_CONCURRENT_TURNS, max_queued=MAX_QUEUED_TURNS):
+        self.assistant = assistant
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="http-api")
+        self.sessions = {}
+        self.started_at = time.time()
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {
+            "requests": 0,
+            "completed": 0,
+            "errors": 0,
+            "rejected": 0,
+            "ws_connections": 0,
+            "latency_total_ms": 0.0,
+            "latency_max_ms": 0.0,
+        }
+
+        self.loop = None
+        self._slots = None
+        self._runner = None
+        self._stopped = None
+        self._thread = None
+
+        REGISTRY.gauge("http_in_flight", fn=lambda: self.in_flight, help_text="HTTP API turns currently running.")
+        REGISTRY.gauge("http_waiting", fn=lambda: self.waiting, help_text="HTTP API turns waiting for a slot.")
+
+    # ─── Lifecycle ──────────────────────────────────
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="http-api", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self.loop and self._stopped and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.executor.shutdown(wait=False)
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            print(f"[HTTP API Error] {e}")
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._stopped = asyncio.Event()
+
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        print(f"[HTTP API] Listening on http://{self.host}:{self.port}")
+
+        await self._stopped.wait()
+        await self._runner.cleanup()
+
+    def build_app(self):
+        app = web.Application(client_max_size=64 * 1024)
+        app.add_routes([
+            web.post("/v1/chat", self.handle_chat),
+            web.post("/v1/sessions", self.handle_new_session),
+            web.get("/v1/ws", self.handle_ws),
+            web.get("/health", self.handle_health),
+            web.get("/stats", self.handle_stats),
+            web.get("/metrics", self.handle_metrics),
+        ])
+        return app
+
+    # ─── Sessions ───────────────────────────────────
+
+    def _session(self, session_id=None):
+        now = time.time()
+        for sid in [s for s, info in self.sessions.items() if now - info["last_seen"] > SESSION_TTL]:
+            del self.sessions[sid]
+
+        if not session_id or session_id not in self.sessions:
+            session_id = session_id or uuid.uuid4().hex
+            self.sessions[session_id] = {"created": now, "last_seen": now, "turns": 0}
+        self.sessions[session_id]["last_seen"] = now
+        return session_id
+
+    # ─── Turn execution ─────────────────────────────
+
+    async def _run_turn(self, message, session_id, on_token=None):
+        """Runs one turn in the worker pool, respecting the concurrency limits.
+
+        Returns the response text, or None if the server is overloaded.
+        """
+        if self.waiting >= self.max_queued:
+            self.stats["rejected"] += 1
+            REGISTRY.counter("http_turns_total", {"status": "rejected"}, help_text="HTTP API turns by result.").inc()
+            return None
+
+        self.stats["requests"] += 1
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            source = f"http:{session_id}"
+            response = await self.loop.run_in_executor(
+                self.executor,
+                lambda: self.assistant.command_processor.process(message, source=source, on_token=on_token)
+            )
+            if session_id in self.sessions:
+                self.sessions[session_id]["turns"] += 1
+            self.stats["completed"] += 1
+            REGISTRY.counter("http_turns_total", {"status": "ok"}).inc()
+            return response
+        except Exception as e:
+            self.stats["errors"] += 1
+            REGISTRY.counter("http_turns_total", {"status": "error"}).inc()
+            print(f"[HTTP API Turn Error] {e}")
+            return self.assistant.command_processor.fallback_response()
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stats["latency_total_ms"] += elapsed_ms
+            self.stats["latency_max_ms"] = max(self.stats["latency_max_ms"], elapsed_ms)
+            REGISTRY.histogram("http_turn_ms", help_text="HTTP API turn latency.").observe(elapsed_ms)
+            self.in_flight -= 1
+            self._slots.release()
+
+    @staticmethod
+    def _parse_message(data):
+        if not isinstance(data, dict):
+            return None, "Expected a JSON object."
+        message = str(data.get("message", "")).strip()
+        if not message:
+            return None, "Field 'message' is required."
+        if len(message) > MAX_MESSAGE_CHARS:
+            return None, f"Message longer than {MAX_MESSAGE_CHARS} characters."
+        return message, None
+
+    # ─── Handlers ───────────────────────────────────
+
+    async def handle_chat(self, request):
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"error": "Body must be JSON."}, status=400)
+
+        message, error = self._parse_message(data)
+        if error:
+            return web.json_response({"error": error}, status=400)
+
+        session_id = self._session(data.get("session_id"))
+        started = time.perf_counter()
+        response = await self._run_turn(message, session_id)
+        if response is None:
+            return web.json_response(
+                {"error": "Too many requests in flight.", "session_id": session_id},
+                status=503, headers={"Retry-After": "1"}
+            )
+
+        return web.json_response({
+            "session_id": session_id,
+            "response": response,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    async def handle_new_session(self, request):
+        return web.json_response({"session_id": self._session()})
+
+    async def handle_ws(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self.stats["ws_connections"] += 1
+
+        session_id = self._session(request.query.get("session_id"))
+        await ws.send_json({"type": "session", "session_id": session_id})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                if msg.type == WSMsgType.ERROR:
+                    print(f"[HTTP API WebSocket Error] {ws.exception()}")
+                continue
+
+            try:
+                data = json.loads(msg.data)
+            except ValueError:
+                data = {"message": msg.data}
+
+            message, error = self._parse_message(data)
+            if error:
+                await ws.send_json({"type": "error", "error": error})
+                continue
+
+            if data.get("session_id"):
+                session_id = self._session(data["session_id"])
+
+            await self._stream_turn(ws, message, session_id)
+
+        return ws
+
+    async def _stream_turn(self, ws, message, session_id):
+        tokens = asyncio.Queue()
+        streamed = ""
+
+        def on_token(token):
+            # Called from the worker thread; hand tokens to the event loop until the reply's word cap
+            nonlocal streamed
+            if streamed is None:
+                return
+            if len((streamed + token).split()) > STREAM_MAX_WORDS:
+                streamed = None  # the planner cuts the reply here; done carries the cut version
+                return
+            streamed += token
+            self.loop.call_soon_threadsafe(tokens.put_nowait, token)
+
+        turn = asyncio.ensure_future(self._run_turn(message, session_id, on_token=on_token))
+        while True:
+            getter = asyncio.ensure_future(tokens.get())
+            done, _ = await asyncio.wait({getter, turn}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await ws.send_json({"type": "token", "text": getter.result()})
+                continue
+            getter.cancel()
+            break
+
+        while not tokens.empty():
+            await ws.send_json({"type": "token", "text": tokens.get_nowait()})
+
+        response = turn.result()
+        if response is None:
+            await ws.send_json({"type": "error", "error": "Too many requests in flight.", "retry_after": 1})
+        else:
+            await ws.send_json({"type": "done", "session_id": session_id, "response": response})
+
+    async def handle_health(self, request):
+        return web.json_response({
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+        })
+
+    async def handle_stats(self, request):
+        stats = dict(self.stats)
+        finished = stats["completed"] + stats["errors"]
+        stats["latency_avg_ms"] = round(stats["latency_total_ms"] / finished, 1) if finished else 0.0
+        stats["sessions"] = len(self.sessions)
+        stats["in_flight"] = self.in_flight
+        stats["waiting"] = self.waiting
+        return web.json_response(stats)
+
+    async def handle_metrics(self, request):
+        return web.Response(
+            text=REGISTRY.render_prometheus(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+
+#Plugin entry point
+def start(assistant):
+    server = HttpApiServer(assistant)
+    assistant.http_api = server
+    server.start()
+    print("[Plugin] HTTP API is starting in background.")
+    return server
+
+
+def stop(assistant, server):
+    if getattr(assistant, "http_api", None) is server:
+        del assistant.http_api
+    server.stop()
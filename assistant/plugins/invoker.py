@@ -0,0 +1,221 @@
+"""Guarded calls into plugins and external tools.
+
+Every plugin call from the planner goes through PluginInvoker. The call
+runs on a shared worker pool, so a provider that hangs costs one answer
+instead of the whole turn. Per plugin (POLICIES):
+
+    timeout_s        the caller gets the fallback after this, and the worker finishes in the background
+    max_concurrent   calls allowed in flight, counting timed-out calls that haven't returned yet
+    failures         consecutive failures that open the circuit breaker
+    reset_after_s    how long the breaker stays open before letting one trial call through
+
+A read call can pass key=. Its last good result is then kept and served
+(marked stale) when the plugin fails, times out, is busy or has its
+breaker open. Actions such as "play" or "create event" pass no key and
+fall back to the policy's message instead.
+
+    result = invoker.invoke("weather", fetcher.get_weather, key="weather")   # PluginResult
+    text = invoker.call("search", searcher.grounding, query, key=query)     # value or fallback
+    text = await invoker.ainvoke("weather", fetcher.get_weather)            # from a coroutine
+
+Coroutine functions are run to completion on the worker thread, so a
+plugin can expose an async API without the caller caring.
+
+Metrics: plugin_call_ms{plugin}, plugin_calls_total{plugin,outcome} and
+plugin_breaker_open{plugin}.
+"""
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from assistant.utils.metrics import REGISTRY
+
+SPARE_WORKERS = 4          # for plugins without an entry in POLICIES
+FALLBACK_CACHE_SIZE = 64   # remembered good results per plugin
+
+DEFAULT_POLICY = {
+    "timeout_s": 8.0,
+    "max_concurrent": 2,
+    "failures": 3,
+    "reset_after_s": 60.0,
+    "fallback": "That isn't responding right now — try again in a bit.",
+}
+
+POLICIES = {
+    "weather": {"timeout_s": 6.0, "fallback": "Sorry, I can't check the weather right now."},
+    "search": {"timeout_s": 8.0, "fallback": "Search isn't answering right now."},
+    "calendar": {"timeout_s": 10.0, "fallback": "I couldn't reach your calendar just now."},
+    "youtube": {"timeout_s": 15.0, "max_concurrent": 1, "fallback": "YouTube isn't cooperating right now."},
+    "spotify": {"timeout_s": 6.0, "fallback": "Spotify isn't responding right now."},
+}
+
+
+class PluginUnavailable(Exception):
+    """The plugin is disabled or failed to start; not the provider's fault, so the breaker ignores it."""
+
+
+class PluginResult:
+    __slots__ = ("plugin", "value", "outcome", "latency_ms", "stale")
+
+    def __init__(self, plugin, value, outcome, latency_ms=0.0, stale=False):
+        self.plugin = plugin
+        self.value = value
+        self.outcome = outcome    # ok | error | timeout | busy | open | unavailable
+        self.latency_ms = latency_ms
+        self.stale = stale
+
+    @property
+    def ok(self):
+        return self.outcome == "ok"
+
+    def __repr__(self):
+        return f"PluginResult({self.plugin!r}, outcome={self.outcome!r}, stale={self.stale}, latency_ms={self.latency_ms:.1f})"
+
+
+class CircuitBreaker:
+    def __init__(self, failures, reset_after_s):
+        self.threshold = failures
+        self.reset_after_s = reset_after_s
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.reset_after_s:
+                return False
+            self.trial_running = True  # half-open: one call decides
+            return True
+
+    def release_trial(self):
+        """A half-open trial that never ran; let the next call try instead."""
+        with self._lock:
+            self.trial_running = False
+
+    def record(self, success):
+        with self._lock:
+            self.trial_running = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class PluginInvoker:
+    def __init__(self, policies=None, workers=None):
+        self.policies = {**POLICIES, **(policies or {})}
+        if workers is None:
+            # Every plugin can fill its max_concurrent slots without queueing behind another plugin's calls
+            workers = sum(self.policy(plugin)["max_concurrent"] for plugin in self.policies) + SPARE_WORKERS
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plugin-call")
+        self._breakers = {}
+        self._slots = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def policy(self, plugin):
+        return {**DEFAULT_POLICY, **self.policies.get(plugin, {})}
+
+    def _state(self, plugin):
+        with self._lock:
+            if plugin not in self._breakers:
+                policy = self.policy(plugin)
+                self._breakers[plugin] = CircuitBreaker(policy["failures"], policy["reset_after_s"])
+                self._slots[plugin] = threading.BoundedSemaphore(policy["max_concurrent"])
+                self._cache[plugin] = OrderedDict()
+                REGISTRY.gauge("plugin_breaker_open", {"plugin": plugin},
+                               fn=lambda b=self._breakers[plugin]: 1 if b.is_open else 0,
+                               help_text="1 while a plugin's circuit breaker is open.")
+            return self._breakers[plugin], self._slots[plugin], self._cache[plugin]
+
+    # ─── Calls ──────────────────────────────────
+
+    def invoke(self, plugin, fn, *args, key=None, timeout=None, **kwargs):
+        breaker, slots, cache = self._state(plugin)
+        policy = self.policy(plugin)
+
+        if not breaker.allow():
+            return self._degraded(plugin, "open", key, cache)
+        if not slots.acquire(blocking=False):
+            breaker.release_trial()
+            return self._degraded(plugin, "busy", key, cache)
+
+        started = time.perf_counter()
+        future = self.executor.submit(self._run, fn, args, kwargs)
+        future.add_done_callback(lambda _: slots.release())  # held until the call really returns
+
+        try:
+            value = future.result(timeout or policy["timeout_s"])
+        except FutureTimeout:
+            breaker.record(False)
+            return self._degraded(plugin, "timeout", key, cache, started)
+        except PluginUnavailable:
+            breaker.release_trial()  # says nothing about the provider, so neither closes nor trips the breaker
+            return self._degraded(plugin, "unavailable", key, cache, started)
+        except Exception as e:
+            print(f"[Plugin Call Error] {plugin}: {e}")
+            breaker.record(False)
+            return self._degraded(plugin, "error", key, cache, started)
+
+        breaker.record(True)
+        if key is not None:
+            with self._lock:
+                cache[key] = value
+                cache.move_to_end(key)
+                while len(cache) > FALLBACK_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return self._finish(PluginResult(plugin, value, "ok"), started)
+
+    def call(self, plugin, fn, *args, key=None, fallback=None, timeout=None, **kwargs):
+        """invoke() for callers that just want text: the value, a stale cached value, or the fallback."""
+        result = self.invoke(plugin, fn, *args, key=key, timeout=timeout, **kwargs)
+        if result.ok or result.stale:
+            return result.value
+        return fallback if fallback is not None else self.policy(plugin)["fallback"]
+
+    async def ainvoke(self, plugin, fn, *args, key=None, timeout=None, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.invoke(plugin, fn, *args, key=key, timeout=timeout, **kwargs)
+        )
+
+    @staticmethod
+    def _run(fn, args, kwargs):
+        if inspect.iscoroutinefunction(fn):
+            return asyncio.run(fn(*args, **kwargs))
+        return fn(*args, **kwargs)
+
+    def _degraded(self, plugin, outcome, key, cache, started=None):
+        with self._lock:
+            cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            result = PluginResult(plugin, cached, outcome, stale=True)
+        else:
+            result = PluginResult(plugin, None, outcome)
+        return self._finish(result, started)
+
+    @staticmethod
+    def _finish(result, started):
+        if started is not None:
+            result.latency_ms = (time.perf_counter() - started) * 1000
+            REGISTRY.histogram("plugin_call_ms", {"plugin": result.plugin},
+                               help_text="Plugin and tool call latency.").observe(result.latency_ms)
+        REGISTRY.counter("plugin_calls_total", {"plugin": result.plugin, "outcome": result.outcome},
+                         help_text="Plugin calls by outcome.").inc()
+        return result
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -1,11 +1,167 @@
-import os
+"""Plugin discovery, lazy loading and lifecycle.
+
+A plugin module can declare a MANIFEST dict literal at the top:
+
+    MANIFEST = {
+        "provides": ["weather"],    # capabilities the planner asks for
+        "autostart": False,         # True for bots/servers that must listen from boot
+        "factory": "WeatherFetcher",  # no-argument constructor, needed for isolate
+        "isolate": False,           # run the plugin in its own process
+    }
+
+Manifests are read with ast, so listing and matching plugins imports
+nothing. Enabled autostart plugins are started at boot. All others are
+imported and started the first time something asks for one of their
+capabilities (plugin_manager.provider("weather")). A module without a
+MANIFEST behaves as before: it autostarts and provides its own name.
+
+Lifecycle hooks: start(assistant) returns the plugin object. On stop the
+manager calls the module's stop(assistant, plugin) if it exists, or
+plugin.stop(). reload_plugins() stops plugins that were disabled.
+Plugins whose file changed are stopped, reloaded and restarted.
+Unchanged plugins are left alone, so a reload never spawns a second
+bot thread next to a running one.
+
+An on-demand start runs outside the manager lock, so a slow import
+holds up only the callers that want that plugin. They wait for the one
+start in flight instead of starting a second copy. A plugin that fails
+to start is not retried for START_RETRY_S; a reload retries it at once.
+
+Isolated plugins run in a spawned worker process. The assistant holds a
+proxy, and every method call on it becomes a request over a pipe.
+Isolation is enabled by the manifest or by
+SYLVERIA_ISOLATE_PLUGINS=weather,search.
+"""
+import ast
 import importlib
+import itertools
 import json
+import multiprocessing
+import os
 import sys
+import threading
+import time
+
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
 
 PLUGINS_DIR = os.path.dirname(__file__)
+PLUGIN_PACKAGE = "assistant.plugins"
 ENABLED_PLUGINS_FILE = os.path.join(PLUGINS_DIR, "enabled_plugins.json")
+NOT_PLUGINS = ("__init__.py", "plugin_manager.py", "invoker.py")
+ISOLATED_PLUGINS = {name.strip() for name in os.environ.get("SYLVERIA_ISOLATE_PLUGINS", "").split(",") if name.strip()}
+ISOLATED_CALL_TIMEOUT_S = 30
+START_WAIT_S = 30      # how long a caller waits for another thread's start of the same plugin
+START_RETRY_S = 30     # backoff after a failed start
+
+DEFAULT_MANIFEST = {"provides": [], "autostart": True, "factory": None, "isolate": False}
+
+
+def read_manifest(path):
+    """The module's MANIFEST literal merged over the defaults, without importing it."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "MANIFEST" for t in node.targets):
+            return dict(DEFAULT_MANIFEST, **ast.literal_eval(node.value))
+    return None
+
+
+class PluginSpec:
+    def __init__(self, name, path, manifest, mtime):
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self.manifest = manifest or dict(DEFAULT_MANIFEST, provides=[name])
+
+    @property
+    def module_name(self):
+        return f"{PLUGIN_PACKAGE}.{self.name}"
+
+    @property
+    def isolated(self):
+        return (self.manifest["isolate"] or self.name in ISOLATED_PLUGINS) and bool(self.manifest["factory"])
+
+
+# ─── Out-of-process plugins ─────────────────────
+
+def _isolated_worker(module_name, factory, conn):
+    try:
+        plugin = getattr(importlib.import_module(module_name), factory)()
+        conn.send((None, "ready", None))
+    except Exception as e:
+        conn.send((None, "error", f"{type(e).__name__}: {e}"))
+        return
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        request_id, method, args, kwargs = request
+        try:
+            conn.send((request_id, "ok", getattr(plugin, method)(*args, **kwargs)))
+        except Exception as e:
+            conn.send((request_id, "error", f"{type(e).__name__}: {e}"))
+
+
+class IsolatedPlugin:
+    """Proxy for a plugin object living in a worker process; calls are serialised over one pipe.
+
+    Every request carries an id. A call that timed out leaves its reply in
+    the pipe, and the next call skips it instead of returning it.
+    """
+
+    def __init__(self, spec):
+        self.name = spec.name
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.get_context("spawn").Process(
+            target=_isolated_worker, args=(spec.module_name, spec.manifest["factory"], child),
+            name=f"plugin-{spec.name}", daemon=True,
+        )
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._process.start()
+        self._receive(None, ISOLATED_CALL_TIMEOUT_S)
 
+    def _receive(self, request_id, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            while not self._conn.poll(0.25):
+                if not self._process.is_alive():
+                    raise RuntimeError(f"plugin {self.name} worker exited (code {self._process.exitcode})")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"plugin {self.name} did not answer within {timeout}s")
+            reply_id, status, value = self._conn.recv()
+            if reply_id == request_id:
+                break  # anything else is a late answer to a call that already timed out
+        if status == "error":
+            raise RuntimeError(f"[{self.name}] {value}")
+        return value
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            with self._lock:
+                request_id = next(self._ids)
+                self._conn.send((request_id, method, args, kwargs))
+                return self._receive(request_id, ISOLATED_CALL_TIMEOUT_S)
+        return call
+
+    def stop(self):
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+# ─── Manager ────────────────────────────────────
 
 class PluginManager:
     def __init__(self, assistant):
@@ -13,51 +169,189 @@ class PluginManager:
         self.plugins_dir = PLUGINS_DIR
         self.enabled_plugins_file = ENABLED_PLUGINS_FILE
         self.loaded_plugins = {}
+        self.specs = {}
+        self.enabled = []
+        self._started_mtime = {}
+        self._imported_mtime = {}
+        self._starting = {}       # name -> Event set when its start finishes
+        self._retry_at = {}       # name -> monotonic time a failed start may be retried
+        self._lock = threading.RLock()
 
     def list_all_plugins(self):
         return [
             f[:-3]
             for f in os.listdir(self.plugins_dir)
-            if f.endswith(".py") and f not in ("__init__.py", "plugin_manager.py")
+            if f.endswith(".py") and f not in NOT_PLUGINS
         ]
 
-    def load_plugins(self):
-        """Loads plugins from enabled_plugins.json and calls their `start()`."""
+    def discover(self):
+        """Refreshes manifests, re-parsing only files whose mtime changed."""
+        specs = {}
+        for name in self.list_all_plugins():
+            path = os.path.join(self.plugins_dir, f"{name}.py")
+            mtime = os.path.getmtime(path)
+            cached = self.specs.get(name)
+            if cached and cached.mtime == mtime:
+                specs[name] = cached
+                continue
+            try:
+                specs[name] = PluginSpec(name, path, read_manifest(path), mtime)
+            except (SyntaxError, ValueError) as e:
+                print(f"[Plugin Manager Error] Bad manifest in {name}: {e}")
+        self.specs = specs
+        return specs
+
+    def _read_enabled(self):
         if not os.path.exists(self.enabled_plugins_file):
             with open(self.enabled_plugins_file, "w", encoding="utf-8") as f:
                 json.dump([], f)
-
         try:
             with open(self.enabled_plugins_file, "r", encoding="utf-8") as f:
-                enabled = json.load(f)
+                return json.load(f)
         except Exception as e:
             print(f"[Plugin Manager Error] Failed to read enabled plugins: {e}")
-            enabled = []
+            return []
 
-        self.loaded_plugins = {}
+    def load_plugins(self):
+        """Reads manifests and enabled_plugins.json, then starts the enabled autostart plugins."""
+        with self._lock:
+            self.discover()
+            self.enabled = self._read_enabled()
+            for name in self.enabled:
+                spec = self.specs.get(name)
+                if spec is None:
+                    print(f"[Plugin Skipped] {name} not found")
+                elif spec.manifest["autostart"]:
+                    self.start_plugin(name)
+            self.assistant.plugins = self.loaded_plugins
+            return self.loaded_plugins
+
+    # ─── Lookup ─────────────────────────────────
 
-        for plugin_name in enabled:
+    def get(self, name):
+        """The plugin object, starting it on first use. None if it is disabled or failed to start."""
+        with self._lock:
+            if name in self.loaded_plugins:
+                return self.loaded_plugins[name]
+            if name not in self.enabled or name not in self.specs:
+                return None
+            if time.monotonic() < self._retry_at.get(name, 0):
+                return None
+            starting = self._starting.get(name)
+            if starting is None:
+                starting = self._starting[name] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            starting.wait(START_WAIT_S)
+            return self.loaded_plugins.get(name)
+        try:
+            return self.start_plugin(name)
+        finally:
+            with self._lock:
+                self._starting.pop(name, None)
+            starting.set()
+
+    def provider(self, capability):
+        """First enabled plugin whose manifest provides the capability, started on demand."""
+        with self._lock:
+            candidates = [
+                name for name in self.enabled
+                if name in self.specs and capability in self.specs[name].manifest["provides"]
+            ]
+        for name in candidates:
+            plugin = self.get(name)
+            if plugin is not None:
+                return plugin
+        return None
+
+    # ─── Lifecycle ──────────────────────────────
+
+    def start_plugin(self, name):
+        spec = self.specs[name]
+        plugin = None
+        with span("plugin.start", plugin=name) as s:
+            started = time.perf_counter()
             try:
-                module_name = f"assistant.plugins.{plugin_name}"
-                if module_name in sys.modules:
-                    importlib.reload(sys.modules[module_name])
-                    module = sys.modules[module_name]
+                if spec.isolated:
+                    plugin = IsolatedPlugin(spec)
+                    s.set(isolated=True)
                 else:
-                    module = importlib.import_module(module_name)
+                    module = self._import(spec)
+                    if not hasattr(module, "start"):
+                        print(f"[Plugin Skipped] {name} has no start() method")
+                    else:
+                        plugin = module.start(self.assistant)
+                        if plugin is None:
+                            print(f"[Plugin Skipped] {name} did not start")
+            except Exception as e:
+                print(f"[Plugin Error] {name}: {e}")
+            finally:
+                REGISTRY.histogram("plugin_start_ms", {"plugin": name}, help_text="Plugin import + start time.").observe(
+                    (time.perf_counter() - started) * 1000
+                )
 
-                if hasattr(module, "start"):
-                    result = module.start(self.assistant)
-                    self.loaded_plugins[plugin_name] = result
-                    print(f"[Plugin Loaded] {plugin_name}")
-                else:
-                    print(f"[Plugin Skipped] {plugin_name} has no start() method")
+        with self._lock:
+            if plugin is None:
+                self._retry_at[name] = time.monotonic() + START_RETRY_S
+                return None
+            self._retry_at.pop(name, None)
+            self.loaded_plugins[name] = plugin
+            self._started_mtime[name] = spec.mtime
+        print(f"[Plugin Loaded] {name}")
+        return plugin
+
+    def _import(self, spec):
+        module = sys.modules.get(spec.module_name)
+        if module is None:
+            module = importlib.import_module(spec.module_name)
+        elif self._imported_mtime.get(spec.name, spec.mtime) != spec.mtime:
+            module = importlib.reload(module)  # edited since we last imported it
+        self._imported_mtime[spec.name] = spec.mtime
+        return module
 
+    def stop_plugin(self, name):
+        with self._lock:
+            plugin = self.loaded_plugins.pop(name, None)
+            self._started_mtime.pop(name, None)
+            if plugin is None:
+                return
+            module = sys.modules.get(f"{PLUGIN_PACKAGE}.{name}")
+            try:
+                if not isinstance(plugin, IsolatedPlugin) and hasattr(module, "stop"):
+                    module.stop(self.assistant, plugin)
+                elif hasattr(plugin, "stop"):
+                    plugin.stop()
+                print(f"[Plugin Stopped] {name}")
             except Exception as e:
-                print(f"[Plugin Error] {plugin_name}: {e}")
+                print(f"[Plugin Stop Error] {name}: {e}")
 
-        self.assistant.plugins = self.loaded_plugins
-        return self.loaded_plugins
+    def stop_all(self):
+        for name in list(self.loaded_plugins):
+            self.stop_plugin(name)
 
     def reload_plugins(self):
+        """Applies enabled_plugins.json and source edits without restarting untouched plugins."""
         print("[Plugin Manager] Reloading plugins...")
-        return self.load_plugins()
+        with self._lock:
+            self.discover()
+            self.enabled = self._read_enabled()
+            self._retry_at.clear()  # saving the Plugins window retries failed starts right away
+
+            for name in list(self.loaded_plugins):
+                spec = self.specs.get(name)
+                if name not in self.enabled or spec is None:
+                    self.stop_plugin(name)
+                elif spec.mtime != self._started_mtime.get(name):
+                    self.stop_plugin(name)
+                    self.start_plugin(name)
+
+            for name in self.enabled:
+                spec = self.specs.get(name)
+                if spec and spec.manifest["autostart"] and name not in self.loaded_plugins:
+                    self.start_plugin(name)
+
+            self.assistant.plugins = self.loaded_plugins
+            return self.loaded_plugins
@@ -1,27 +1,45 @@
 import threading
 
+# Read without importing the module. Plugins that don't need to run from boot
+# set autostart False and are started the first time their capability is asked for.
+MANIFEST = {
+    "provides": ["my_plugin"],
+    "autostart": False,
+    "factory": "MyPlugin",  # lets SYLVERIA_ISOLATE_PLUGINS run it in a worker process
+}
+
+
 class MyPlugin:
-    def __init__(self, assistant, config=None):
+    def __init__(self, assistant=None, config=None):
         self.assistant = assistant
         self.config = config or {}
+        self._stop = threading.Event()
         print("[MyPlugin] Plugin initialized.")
 
     def start(self):
         # Optional threaded background task
         print("[MyPlugin] Background task started.")
-        threading.Thread(target=self.run_loop, daemon=True).start()
+        threading.Thread(target=self.run_loop, name="my-plugin", daemon=True).start()
 
     def run_loop(self):
-        while True:
+        while not self._stop.wait(60):
             # Replace with real logic
             print("[MyPlugin] Running background task...")
-            break
+
+    def stop(self):
+        self._stop.set()
 
     def do_something(self):
         return "Hello from MyPlugin!"
 
-#Required plugin loader
-def load_plugin(assistant, config=None):
-    plugin = MyPlugin(assistant, config)
+
+#Required plugin entry point: returns the plugin object
+def start(assistant):
+    plugin = MyPlugin(assistant)
     plugin.start()
     return plugin
+
+
+#Optional: called on disable, reload or exit (falls back to plugin.stop())
+def stop(assistant, plugin):
+    plugin.stop()
@@ -1,46 +1,111 @@
-import requests
 import os
+import re
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from assistant.plugins.invoker import PluginUnavailable
+from assistant.utils.cache import TTLCache
 from config.secrets import GOOGLE_API_KEY, GOOGLE_CSE_ID
 
+MANIFEST = {
+    "provides": ["search"],
+    "autostart": False,
+    "factory": "GoogleWebSearcher",
+}
+
+SEARCH_URL = os.environ.get("SYLVERIA_SEARCH_URL", "https://www.googleapis.com/customsearch/v1")
+REQUEST_TIMEOUT_S = 5
+NUM_RESULTS = 5                     # one request, five results: the API bills per request, not per result
+RESULT_TTL_S = 6 * 60 * 60
+RESULT_STALE_S = 2 * 24 * 60 * 60
+CACHE_SIZE = 256
+GROUNDING_CHARS = 700
+
+
+def query_key(query):
+    """Cache key: "Search for the Eiffel Tower height?" == "the eiffel tower height". Word order is kept."""
+    words = re.findall(r"[\w'-]+", clean_query(query).lower())
+    return " ".join(words) or query.lower().strip()
+
+
+def clean_query(query):
+    """The query as sent to Google, without the spoken "search for" lead-in."""
+    return re.sub(r"^\s*(please\s+)?(search(\s+the\s+web)?(\s+for)?|look\s+up|find\s+info(rmation)?\s+(about|on))\s+",
+                  "", query, flags=re.IGNORECASE).strip() or query.strip()
+
+
 class GoogleWebSearcher:
     def __init__(self, api_key=None, cse_id=None):
         self.api_key = api_key or GOOGLE_API_KEY
         self.cse_id = cse_id or GOOGLE_CSE_ID
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.cache = TTLCache("search", maxsize=CACHE_SIZE, ttl=RESULT_TTL_S, stale_ttl=RESULT_STALE_S, persist=True)
 
-    def search_web(self, query):
-        if not self.api_key or not self.cse_id:
-            return "Search is unavailable — API key or CSE ID missing."
-
-        try:
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                "key": self.api_key,
-                "cx": self.cse_id,
-                "q": query,
-                "num": 1,
-            }
+    def prefetch(self):
+        """Opens the pooled HTTPS connection in the background, so the first query skips DNS and TLS."""
+        def warm():
+            try:
+                self.session.head(SEARCH_URL, timeout=REQUEST_TIMEOUT_S)  # keyless, so no quota is spent
+            except requests.RequestException as e:
+                print(f"[Search] Connection warm-up failed: {e}")
+        threading.Thread(target=warm, name="search-prefetch", daemon=True).start()
 
-            response = requests.get(url, params=params, timeout=5)
-            data = response.json()
+    def _fetch(self, query):
+        params = {
+            "key": self.api_key,
+            "cx": self.cse_id,
+            "q": query,
+            "num": NUM_RESULTS,
+            "fields": "items(title,snippet,link)",  # partial response: skip metadata we never read
+        }
+        response = self.session.get(SEARCH_URL, params=params, timeout=REQUEST_TIMEOUT_S)
+        response.raise_for_status()
+        return [
+            {
+                "title": item.get("title", "No title"),
+                "snippet": " ".join(item.get("snippet", "").split()),
+                "link": item.get("link", ""),
+            }
+            for item in response.json().get("items", [])
+        ]
 
-            if "items" not in data:
-                return "I didn’t find anything useful."
+    def search(self, query):
+        """Up to NUM_RESULTS {title, snippet, link} dicts, from cache when the same query was seen."""
+        query = clean_query(query)
+        return self.cache.get_or_load(query_key(query), lambda: self._fetch(query))
 
-            item = data["items"][0]
-            title = item.get("title", "No title")
-            snippet = item.get("snippet", "No summary")
-            link = item.get("link", "")
+    def grounding(self, query, max_chars=GROUNDING_CHARS):
+        """Numbered, trimmed results for a prompt, so the model answers from sources instead of memory."""
+        if not self.api_key or not self.cse_id:
+            raise PluginUnavailable("search: API key or CSE ID missing")
+        lines, used = [], 0
+        for number, result in enumerate(self.search(query), 1):
+            line = f"{number}. {result['title']}: {result['snippet']} [{result['link']}]"
+            if used + len(line) > max_chars:
+                line = line[:max(0, max_chars - used - 1)].rstrip() + "…"
+            lines.append(line)
+            used += len(line) + 1
+            if used >= max_chars:
+                break
+        return "\n".join(lines)
 
-            return f"{title} — {snippet} ({link})"
-        except Exception as e:
-            return f"Search error: {e}"
 
 #Plugin entry point
 def start(assistant):
     instance = GoogleWebSearcher()
+    if instance.api_key and instance.cse_id:
+        instance.prefetch()
     if not hasattr(assistant, "plugins"):
         assistant.plugins = {}
     assistant.plugins["search"] = instance
     assistant.search = instance  # Optional alias
     print("[Plugin] GoogleWebSearcher loaded.")
     return instance
+
+
+def stop(assistant, instance):
+    instance.cache.flush()
+    instance.session.close()
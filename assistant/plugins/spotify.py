@@ -1,38 +1,230 @@
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+"""Spotify playback with lazy auth, cached lookups and rate-limit handling.
+
+Nothing talks to Spotify until the first command. The OAuth token is then
+cached in SPOTIFY_TOKEN_CACHE, and spotipy refreshes it from there.
+Track searches are cached per normalized query. The playback device is
+cached for DEVICE_TTL_S and looked up again if Spotify says it is gone.
+
+play/pause/resume hand the playback call to one worker thread, which
+runs them in order, and wait up to COMMAND_WAIT_S for it. A failure is
+reported (or raised, so the plugin invoker's breaker counts it) instead
+of announcing playback that never started. A 429 is retried once after
+its Retry-After when the wait is short (MAX_RETRY_WAIT_S). A longer wait
+is reported instead of blocking the worker. spotipy's own retry loop is
+switched off, so a rate limit never stalls a turn inside the HTTP layer.
+
+Any object with spotipy's method names works as the client:
+SpotifyHelper(client_factory=lambda: FakeSpotifyClient()) (see
+benchmarks/fakes.py).
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from assistant.utils.cache import TTLCache, normalize_key
+from assistant.utils.lazy_import import lazy_import
 from config.secrets import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET, SPOTIFY_REDIRECT_URI
 
-class SpotifyHelper:
-    def __init__(self):
-        self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
+spotipy = lazy_import("spotipy")
+spotipy_oauth = lazy_import("spotipy.oauth2")
+
+MANIFEST = {
+    "provides": ["spotify"],
+    "autostart": False,
+}
+
+SPOTIFY_SCOPE = "user-read-playback-state user-modify-playback-state user-read-currently-playing"
+SPOTIFY_TOKEN_CACHE = os.environ.get("SYLVERIA_SPOTIFY_TOKEN_CACHE", "config/.spotify_token")
+REQUEST_TIMEOUT_S = 5
+TRACK_TTL_S = 7 * 24 * 60 * 60
+DEVICE_TTL_S = 60
+MAX_RETRY_WAIT_S = 3
+COMMAND_WAIT_S = 4   # under the invoker's 6 s spotify timeout
+
+
+def _build_client():
+    return spotipy.Spotify(
+        auth_manager=spotipy_oauth.SpotifyOAuth(
             client_id=SPOTIFY_CLIENT_ID,
             client_secret=SPOTIFY_CLIENT_SECRET,
             redirect_uri=SPOTIFY_REDIRECT_URI,
-            scope="user-read-playback-state user-modify-playback-state user-read-currently-playing"
-        ))
+            scope=SPOTIFY_SCOPE,
+            cache_path=SPOTIFY_TOKEN_CACHE,
+            open_browser=False,
+        ),
+        requests_timeout=REQUEST_TIMEOUT_S,
+        retries=0,
+        status_retries=0,
+    )
+
+
+def _status(error):
+    return getattr(error, "http_status", None)
+
+
+def _retry_after(error):
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class RateLimited(Exception):
+    def __init__(self, wait_s):
+        super().__init__(f"Spotify asked us to wait {wait_s:.0f}s")
+        self.wait_s = wait_s
+
+
+class SpotifyHelper:
+    def __init__(self, client_factory=_build_client):
+        self.client_factory = client_factory
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.tracks = TTLCache("spotify_tracks", maxsize=256, ttl=TRACK_TTL_S, persist=True)
+        self.devices = TTLCache("spotify_devices", maxsize=1, ttl=DEVICE_TTL_S)
+        self.last_error = None
+        self._commands = queue.Queue()
+        self._worker = None
+
+    @property
+    def sp(self):
+        with self._client_lock:
+            if self._client is None:
+                self._client = self.client_factory()
+            return self._client
+
+    def _call(self, method, *args, **kwargs):
+        """One Spotify API call, retried once after a short Retry-After."""
+        try:
+            return getattr(self.sp, method)(*args, **kwargs)
+        except Exception as e:
+            if _status(e) != 429:
+                raise
+            wait_s = _retry_after(e)
+            if wait_s > MAX_RETRY_WAIT_S:
+                raise RateLimited(wait_s) from e
+            print(f"[Spotify] Rate limited; retrying {method} in {wait_s:.1f}s")
+            time.sleep(wait_s)
+            return getattr(self.sp, method)(*args, **kwargs)
+
+    # ─── Lookups ────────────────────────────────
+
+    def _search_track(self, query):
+        items = self._call("search", q=query, type="track", limit=1).get("tracks", {}).get("items", [])
+        if not items:
+            return None
+        track = items[0]
+        return {"uri": track["uri"], "name": track["name"], "artist": track["artists"][0]["name"]}
+
+    def find_track(self, query):
+        return self.tracks.get_or_load(normalize_key(query), lambda: self._search_track(query))
+
+    def _find_device(self):
+        devices = self._call("devices").get("devices", [])
+        active = [device for device in devices if device.get("is_active")]
+        chosen = (active or devices or [None])[0]
+        return chosen["id"] if chosen else None
+
+    def device_id(self):
+        return self.devices.get_or_load("device", self._find_device)
+
+    # ─── Playback queue ─────────────────────────
+
+    def _enqueue(self, method, **kwargs):
+        future = Future()
+        self._commands.put((method, kwargs, future))
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_commands, name="spotify-commands", daemon=True)
+            self._worker.start()
+        return future
+
+    def _run_commands(self):
+        while True:
+            command = self._commands.get()
+            if command is None:
+                self._commands.task_done()
+                return
+            method, kwargs, future = command
+            try:
+                future.set_result(self._playback(method, **kwargs))
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                future.set_exception(e)
+                print(f"[Spotify Error] {method}: {e}")
+            finally:
+                self._commands.task_done()
+
+    def _playback(self, method, **kwargs):
+        try:
+            return self._call(method, device_id=self.device_id(), **kwargs)
+        except RateLimited:
+            raise
+        except Exception as e:
+            if _status(e) != 404:
+                raise
+            self.devices.invalidate()  # the cached device went away; pick again
+            return self._call(method, device_id=self.device_id(), **kwargs)
+
+    def wait_idle(self, timeout=5.0):
+        """Blocks until queued playback commands have run (or timeout). Mostly for tests."""
+        deadline = time.monotonic() + timeout
+        while self._commands.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        if self._worker is not None and self._worker.is_alive():
+            self._commands.put(None)
+        self.tracks.flush()
+
+    # ─── Commands ───────────────────────────────
+
+    def _run_and_report(self, method, done_text, **kwargs):
+        """Queues a playback call and waits briefly for it. Errors other than rate limits and a missing device raise."""
+        try:
+            self._enqueue(method, **kwargs).result(COMMAND_WAIT_S)
+        except FutureTimeout:
+            return done_text + " (Spotify is slow to confirm.)"
+        except RateLimited as e:
+            return f"Spotify needs a breather — try again in {e.wait_s:.0f} seconds."
+        except Exception as e:
+            if _status(e) == 404:
+                return "I can't find a Spotify device to play on — open Spotify somewhere first."
+            raise
+        return done_text
 
     def play_song(self, query):
-        results = self.sp.search(q=query, type="track", limit=1)
-        tracks = results.get("tracks", {}).get("items", [])
-        if not tracks:
+        try:
+            track = self.find_track(query)
+        except RateLimited as e:
+            return f"Spotify needs a breather — try again in {e.wait_s:.0f} seconds."
+        if not track:
             return "I couldn't find that on Spotify."
-
-        uri = tracks[0]["uri"]
-        self.sp.start_playback(uris=[uri])
-        return f"Playing: {tracks[0]['name']} by {tracks[0]['artists'][0]['name']}"
+        return self._run_and_report("start_playback", f"Playing: {track['name']} by {track['artist']}",
+                                    uris=[track["uri"]])
 
     def pause(self):
-        self.sp.pause_playback()
-        return "⏸️ Paused Spotify."
+        return self._run_and_report("pause_playback", "⏸️ Paused Spotify.")
 
     def resume(self):
-        self.sp.start_playback()
-        return "▶️ Resumed Spotify."
+        return self._run_and_report("start_playback", "▶️ Resumed Spotify.")
 
     def now_playing(self):
-        current = self.sp.currently_playing()
+        current = self._call("currently_playing")
         if not current or not current.get("item"):
             return "I'm not playing anything right now."
 
         track = current["item"]
         return f"Now playing: {track['name']} by {track['artists'][0]['name']}"
+
+
+def start(assistant):
+    tools = getattr(assistant, "tools", None)
+    return tools.spotify if tools is not None else SpotifyHelper()
+
+
+def stop(assistant, instance):
+    instance.close()
@@ -1,7 +1,18 @@
 import asyncio
 import random
+import threading
 from twitchio.ext import commands
 from config.secrets import TWITCH_TOKEN, TWITCH_NICK, TWITCH_CHANNEL
+from assistant.utils.metrics import REGISTRY
+
+MANIFEST = {
+    "provides": ["twitch"],
+    "autostart": True,  # has to be in chat to hear mentions
+}
+
+def _count_message(kind):
+    REGISTRY.counter("frontend_messages_total", {"frontend": "twitch", "kind": kind},
+                     help_text="Inbound frontend messages by frontend and kind.").inc()
 
 
 class TwitchBot(commands.Bot):
@@ -16,8 +27,10 @@ class TwitchBot(commands.Bot):
         if message.echo:
             return
 
+        _count_message("seen")
         if "@mal0v10" not in message.content.lower():
             return
+        _count_message("mention")
 
         user_input = message.content.strip()
         username = message.author.name
@@ -33,26 +46,21 @@ class TwitchBot(commands.Bot):
             return
 
         try:
-            # Append to conversation history
-            if not hasattr(self.assistant, "conversation_history"):
-                self.assistant.conversation_history = []
-
-            self.assistant.conversation_history.append({
-                "role": "user",
-                "content": f"{username}: {user_input}"
-            })
-
-            # Build prompt with system prompt as context
-            chat_context = "\n".join(
-                f"{msg['role'].capitalize()}: {msg['content']}"
-                for msg in self.assistant.conversation_history[-8:]
+            # Bounded chat session: recent lines verbatim, older ones folded into a summary
+            session = self.assistant.summarizer.session("twitch")
+            session.add(username, user_input)
+            chat_context = session.transcript()
+            system_prompt = self.assistant.system_prompt_twitch.strip()
+            if session.summary:
+                system_prompt += f"\nEarlier in chat: {session.summary}"
+
+            # Generate off the event loop so chat keeps flowing; short chat turns go to the draft tier
+            ai = self.assistant.ai
+            response = await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: ai.generate_with_prompts(system_prompt, chat_context, source="twitch")
             )
-
-            full_prompt = f"{self.assistant.system_prompt_twitch.strip()}\n\n{chat_context}"
-
-            # Generate response
-            response = self.assistant.ai.generate(prompt=full_prompt)
-            response = self.assistant.command_processor._clean_response(response)
+            response = ai._clean_response(response)
 
             if not response.strip():
                 print("[Twitch Warning] Empty response from LLM.")
@@ -64,8 +72,9 @@ class TwitchBot(commands.Bot):
                 response = response[:497].rstrip() + "..."
 
             response = response[0].upper() + response[1:]
+            session.add("Sylveria", response)
             await message.channel.send(response)
-            self.assistant.audio_manager.speech_queue.put(response)
+            self.assistant.audio_manager.speech_queue.put(response, priority="notice")
 
         except Exception as e:
             print(f"[Twitch LLM Error] {e}")
@@ -93,7 +102,7 @@ class TwitchBot(commands.Bot):
         except Exception as e:
             print(f"[Shoutout Error] Failed to send Twitch message: {e}")
 
-        self.assistant.audio_manager.speech_queue.put(tts_msg)
+        self.assistant.audio_manager.speech_queue.put(tts_msg, priority="notice")
 
     def shorten_response(self, text, word_limit=40):
         words = text.split()
@@ -116,5 +125,15 @@ def start(assistant):
     def run_bot():
         asyncio.run(bot.run())
 
-    asyncio.get_event_loop().run_in_executor(None, run_bot)
+    threading.Thread(target=run_bot, name="twitch-bot", daemon=True).start()
+    assistant.twitch_bot = bot
     print("[Plugin] TwitchBot loaded and running.")
+    return bot
+
+
+def stop(assistant, bot):
+    if getattr(assistant, "twitch_bot", None) is bot:
+        del assistant.twitch_bot
+    loop = getattr(bot, "loop", None)
+    if loop and loop.is_running():
+        asyncio.run_coroutine_threadsafe(bot.close(), loop).result(10)
@@ -1,39 +1,87 @@
+import os
+import threading
+from urllib.parse import quote
+
 import requests
 
+from assistant.utils.cache import TTLCache, normalize_key
+
+MANIFEST = {
+    "provides": ["weather"],
+    "autostart": False,
+    "factory": "WeatherFetcher",
+}
+
+# Point these at a local server to run the plugin offline
+WEATHER_URL = os.environ.get("SYLVERIA_WEATHER_URL", "https://wttr.in")
+GEO_URL = os.environ.get("SYLVERIA_GEO_URL", "https://ipinfo.io/json")
+REQUEST_TIMEOUT_S = 5
+
+WEATHER_TTL_S = 15 * 60          # wttr.in itself only updates about this often
+WEATHER_STALE_S = 2 * 60 * 60    # served instantly while a refresh runs
+GEO_TTL_S = 7 * 24 * 60 * 60
+
+# Spoken line, then the bare condition ("Overcast") for the environment
+WEATHER_FORMAT = "%l: %c %t|%C"
+HERE = ""   # cache key for "wherever we are"; wttr.in geolocates an empty path itself
+
+
 class WeatherFetcher:
     def __init__(self, default_location=None):
-        if default_location is None:
-            default_location = self.get_ip_location()
-        self.default_location = default_location
+        self.session = requests.Session()
+        self.cache = TTLCache("weather", maxsize=32, ttl=WEATHER_TTL_S, stale_ttl=WEATHER_STALE_S, persist=True)
+        self.geo_cache = TTLCache("geolocation", maxsize=1, ttl=GEO_TTL_S, stale_ttl=GEO_TTL_S, persist=True)
+        self.fixed_location = default_location
+        self.default_location = default_location or self.geo_cache.peek("here")
+        if default_location is None and "here" not in self.geo_cache:
+            # Don't hold up plugin start on ipinfo.io; until it answers, wttr.in locates us itself
+            threading.Thread(target=self._locate, name="weather-geolocate", daemon=True).start()
+
+    def _locate(self):
+        location = self.geo_cache.get_or_load("here", self.get_ip_location)
+        if location and not self.fixed_location:
+            self.default_location = location
 
     def get_ip_location(self):
         try:
-            response = requests.get("https://ipinfo.io/json", timeout=5)
-            data = response.json()
+            data = self.session.get(GEO_URL, timeout=REQUEST_TIMEOUT_S).json()
             city = data.get("city")
-            region = data.get("region")
             country = data.get("country")
             if city and country:
                 return f"{city},{country}"
-            return "New York"
         except Exception as e:
             print(f"[WeatherFetcher] Failed to get IP location: {e}")
-            return "New York"
+        return None
 
-    def get_weather(self, location=None):
+    def _fetch(self, location):
+        url = f"{WEATHER_URL}/{quote(location, safe=',')}"
+        response = self.session.get(url, params={"format": WEATHER_FORMAT}, timeout=REQUEST_TIMEOUT_S)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        line, _, condition = response.text.strip().partition("|")
+        return {"text": " ".join(line.split()), "condition": condition.strip().lower()}
+
+    def _report(self, location=None):
         if not location or location.strip().lower() in ["today", "like today", ""]:
-            location = self.default_location
+            location = self.default_location or HERE
+        key = normalize_key(location)
+        return self.cache.get_or_load(key, lambda: self._fetch(location))
 
+    def get_weather(self, location=None):
         try:
-            url = f"https://wttr.in/{location}?format=3"
-            response = requests.get(url, timeout=5)
-
-            if response.status_code == 200:
-                return response.text.strip()
+            return self._report(location)["text"]
+        except Exception as e:
+            print(f"[WeatherFetcher] {e}")
+            return f"Sorry, I couldn't fetch the weather for {location or 'here'} right now."
 
-            return f"Sorry, I couldn't fetch the weather for {location} right now."
+    def current_condition(self):
+        """Condition for the default location, e.g. "partly cloudy", or None."""
+        try:
+            return self._report()["condition"] or None
         except Exception as e:
-            return f"Weather error: {e}"
+            print(f"[WeatherFetcher] {e}")
+            return None
+
 
 # Plugin entry point
 def start(assistant):
@@ -41,6 +89,12 @@ def start(assistant):
     if not hasattr(assistant, "plugins"):
         assistant.plugins = {}
     assistant.plugins["weather"] = instance
-    assistant.weather = instance 
+    assistant.weather = instance
     print("[Plugin] WeatherFetcher loaded.")
     return instance
+
+
+def stop(assistant, instance):
+    instance.cache.flush()
+    instance.geo_cache.flush()
+    instance.session.close()
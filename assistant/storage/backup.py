@@ -0,0 +1,290 @@
+"""Incremental, deduplicated backups of the data files.
+
+A backup run walks BACKUP_SOURCES. A file whose size and mtime match the
+last manifest is carried over without being read. Anything else is
+hashed and split into chunks. For a state snapshot the chunks are its
+sections, so a flush that touched one section adds one new chunk.
+Other files use fixed CHUNK_SIZE pieces. Each chunk is stored
+zlib-compressed under backups/chunks/ by its sha256 and is never
+written twice. A run that finds nothing changed writes nothing at all.
+
+    backups/chunks/ab/ab12...   compressed chunk
+    backups/manifests/20250612-221503.json
+        {"created": ..., "files": {path: {"sha256", "size", "mtime_ns", "chunks": [...]}}}
+
+Retention keeps the newest KEEP_LAST manifests plus the newest manifest
+of each of the last KEEP_DAILY days. Chunks that no kept manifest
+references are then removed.
+
+    python -m assistant.storage.backup list
+    python -m assistant.storage.backup create
+    python -m assistant.storage.backup restore [MANIFEST] [--file PATH] [--to DIR]
+
+Restore while the assistant is stopped: it holds the snapshot open and
+would overwrite the restored file on its next flush.
+"""
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from assistant.storage.jsonio import load_json, save_json, write_atomic
+from assistant.storage.snapshot import MAGIC, STATE, SnapshotError, table_from_bytes
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
+
+BACKUP_DIR = os.environ.get("SYLVERIA_BACKUP_DIR", "backups")
+BACKUP_SOURCES = ("assistant/memory/*.snap", "assistant/memory/*.json")
+CHUNK_SIZE = 64 * 1024
+KEEP_LAST = 10
+KEEP_DAILY = 7
+BACKUP_DELAY_S = 120        # first run, after startup has settled
+BACKUP_INTERVAL_S = 3600
+BACKUP_IDLE_AFTER_S = 60
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def split_chunks(data):
+    """Section-aligned pieces for snapshots, fixed-size pieces for everything else."""
+    if data.startswith(MAGIC):
+        try:
+            _, table = table_from_bytes(data)
+        except SnapshotError:
+            table = {}
+        if table:
+            cuts = sorted({0, len(data)} | {offset for offset, _, _, _ in table.values() if offset < len(data)})
+            return [data[a:b] for a, b in zip(cuts, cuts[1:])]
+    return [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)] or [b""]
+
+
+class BackupStore:
+    def __init__(self, root=BACKUP_DIR):
+        self.root = root
+        self.chunk_dir = os.path.join(root, "chunks")
+        self.manifest_dir = os.path.join(root, "manifests")
+
+    # ─── Chunks ─────────────────────────────────
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def put_chunk(self, data):
+        """Stores a chunk unless it is already there. Returns (digest, bytes written)."""
+        digest = sha256(data)
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return digest, write_atomic(path, zlib.compress(data, 6), label="backup_chunk")
+
+    def get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if sha256(data) != digest:
+            raise ValueError(f"chunk {digest[:12]} is corrupt")
+        return data
+
+    # ─── Manifests ──────────────────────────────
+
+    def manifests(self):
+        """Manifest ids, oldest first."""
+        if not os.path.isdir(self.manifest_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.manifest_dir) if name.endswith(".json"))
+
+    def load_manifest(self, manifest_id=None):
+        ids = self.manifests()
+        if not ids:
+            return None
+        manifest_id = manifest_id or ids[-1]
+        return load_json(os.path.join(self.manifest_dir, f"{manifest_id}.json"))
+
+    def create(self, sources=BACKUP_SOURCES):
+        """Backs up whatever changed since the last manifest. Returns the new manifest id, or None."""
+        with span("backup.run") as s:
+            previous = (self.load_manifest() or {}).get("files", {})
+            files, changed, new_bytes, reused_bytes = {}, 0, 0, 0
+
+            paths = sorted({path for pattern in sources for path in glob.glob(pattern)})
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                key = path.replace(os.sep, "/")
+                old = previous.get(key)
+                if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                    files[key] = old
+                    continue
+
+                with open(path, "rb") as f:
+                    data = f.read()
+                digest = sha256(data)
+                if old and old["sha256"] == digest:
+                    files[key] = dict(old, mtime_ns=stat.st_mtime_ns)
+                    continue
+
+                chunks = []
+                for piece in split_chunks(data):
+                    chunk_digest, written = self.put_chunk(piece)
+                    chunks.append(chunk_digest)
+                    new_bytes += written
+                    reused_bytes += 0 if written else len(piece)
+                files[key] = {"sha256": digest, "size": len(data), "mtime_ns": stat.st_mtime_ns, "chunks": chunks}
+                changed += 1
+
+            removed = len(set(previous) - set(files))
+            s.set(files=len(files), changed=changed, removed=removed, new_bytes=new_bytes)
+            REGISTRY.counter("backup_bytes_total", {"kind": "stored"}, help_text="Backup chunk bytes by outcome.").inc(new_bytes)
+            REGISTRY.counter("backup_bytes_total", {"kind": "deduplicated"}, help_text="Backup chunk bytes by outcome.").inc(reused_bytes)
+
+            if not changed and not removed:
+                s.set(outcome="unchanged")
+                REGISTRY.counter("backup_runs_total", {"outcome": "unchanged"}, help_text="Backup runs.").inc()
+                return None
+
+            manifest_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+            while manifest_id in self.manifests():
+                manifest_id += "a"
+            os.makedirs(self.manifest_dir, exist_ok=True)
+            save_json(os.path.join(self.manifest_dir, f"{manifest_id}.json"),
+                      {"created": time.time(), "files": files}, label="backup_manifest")
+            s.set(outcome="created", manifest=manifest_id)
+            REGISTRY.counter("backup_runs_total", {"outcome": "created"}, help_text="Backup runs.").inc()
+            self.prune()
+            return manifest_id
+
+    # ─── Retention ──────────────────────────────
+
+    def prune(self, keep_last=KEEP_LAST, keep_daily=KEEP_DAILY):
+        ids = self.manifests()
+        keep = set(ids[-keep_last:])
+        days = {}
+        for manifest_id in ids:
+            days[manifest_id[:8]] = manifest_id  # ids sort by time, so the last per day wins
+        keep.update(sorted(days.values())[-keep_daily:])
+
+        dropped = [manifest_id for manifest_id in ids if manifest_id not in keep]
+        for manifest_id in dropped:
+            os.remove(os.path.join(self.manifest_dir, f"{manifest_id}.json"))
+        if dropped:
+            self.collect_garbage()
+        return dropped
+
+    def collect_garbage(self):
+        """Deletes chunks no remaining manifest points at. Returns how many were removed."""
+        live = set()
+        for manifest_id in self.manifests():
+            for entry in (self.load_manifest(manifest_id) or {}).get("files", {}).values():
+                live.update(entry["chunks"])
+
+        removed = 0
+        if not os.path.isdir(self.chunk_dir):
+            return removed
+        for prefix in os.listdir(self.chunk_dir):
+            folder = os.path.join(self.chunk_dir, prefix)
+            for digest in os.listdir(folder):
+                if digest not in live:
+                    os.remove(os.path.join(folder, digest))
+                    removed += 1
+        return removed
+
+    # ─── Restore ────────────────────────────────
+
+    def restore(self, manifest_id=None, only=None, target_dir="."):
+        """Rebuilds files from a manifest (latest by default), checking every chunk and whole-file hash."""
+        manifest = self.load_manifest(manifest_id)
+        if manifest is None:
+            raise ValueError(f"no manifest {manifest_id or '(none yet)'}")
+
+        restored = []
+        for path, entry in manifest["files"].items():
+            if only and path != only.replace(os.sep, "/"):
+                continue
+            data = b"".join(self.get_chunk(digest) for digest in entry["chunks"])
+            if sha256(data) != entry["sha256"]:
+                raise ValueError(f"{path} does not match its recorded hash")
+            write_atomic(os.path.join(target_dir, path), data, label="backup_restore")
+            restored.append(path)
+        return restored
+
+
+class BackupManager:
+    """Runs BackupStore.create as a scheduled job so startup never waits on it."""
+
+    def __init__(self, store=None):
+        self.store = store or BackupStore()
+        self._lock = threading.Lock()
+
+    def start(self, jobs):
+        jobs.every("backup", BACKUP_INTERVAL_S, self.run_once, first_in=BACKUP_DELAY_S,
+                   idle_after=BACKUP_IDLE_AFTER_S, threaded=True)
+
+    def run_once(self):
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            STATE.flush()  # back up what is in memory, not a two-second-old file
+            return self.store.create()
+        except Exception as e:
+            print(f"[Backup Error] {e}")
+            return None
+        finally:
+            self._lock.release()
+
+
+# ─── Command line ───────────────────────────────
+
+def cmd_list(store, args):
+    for manifest_id in store.manifests():
+        files = store.load_manifest(manifest_id)["files"]
+        size = sum(entry["size"] for entry in files.values())
+        print(f"  {manifest_id}  {len(files):>3} files  {size:>10} B")
+    return 0
+
+
+def cmd_create(store, args):
+    manifest_id = store.create()
+    print(f"[Backup] Created {manifest_id}" if manifest_id else "[Backup] Nothing changed")
+    return 0
+
+
+def cmd_restore(store, args):
+    try:
+        restored = store.restore(args.manifest, only=args.file, target_dir=args.to)
+    except (OSError, ValueError) as e:
+        print(f"[Backup Restore Error] {e}")
+        return 1
+    for path in restored:
+        print(f"  {os.path.join(args.to, path)}")
+    if not restored:
+        print("[Backup] No matching files in that manifest")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create, list and restore incremental backups.")
+    parser.add_argument("--dir", default=BACKUP_DIR, help="Backup store location")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show manifests, oldest first")
+    commands.add_parser("create", help="Back up changed files now")
+    restore = commands.add_parser("restore", help="Restore files from a manifest (latest by default)")
+    restore.add_argument("manifest", nargs="?")
+    restore.add_argument("--file", help="Restore only this path, e.g. assistant/memory/state.snap")
+    restore.add_argument("--to", default=".", help="Directory to restore into (default: in place)")
+    args = parser.parse_args(argv)
+    store = BackupStore(args.dir)
+    return {"list": cmd_list, "create": cmd_create, "restore": cmd_restore}[args.command](store, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,7 @@
 # assistant/datafiles.py
 import os
 import json
-import time
-import shutil
+from assistant.storage.jsonio import save_json
 
 class DataFileManager:
     def __init__(self):
@@ -11,7 +10,6 @@ class DataFileManager:
         }
         self._initialize()
         self.validate_files()
-        self.backup_files()
 
     def _initialize(self):
         for key, file in self.data_files.items():
@@ -30,26 +28,6 @@ class DataFileManager:
                 with open(file, 'w') as f:
                     json.dump({}, f)
 
-    def backup_files(self):
-        backup_dir = "backups"
-        os.makedirs(backup_dir, exist_ok=True)
-
-        for file in self.data_files.values():
-            if os.path.exists(file):
-                timestamp = int(time.time())
-                backup_name = os.path.join(backup_dir, f"{os.path.basename(file)}.bak.{timestamp}")
-                shutil.copyfile(file, backup_name)
-                self._clean_old_backups(file, backup_dir)
-
-    def _clean_old_backups(self, filename, backup_dir, keep=5):
-        base = os.path.basename(filename)
-        backups = sorted(
-            [f for f in os.listdir(backup_dir) if f.startswith(base)],
-            key=lambda x: os.path.getctime(os.path.join(backup_dir, x))
-        )
-        for old in backups[:-keep]:
-            os.remove(os.path.join(backup_dir, old))
-
     def load(self, key):
         path = self.data_files.get(key)
         if path and os.path.exists(path):
@@ -63,5 +41,4 @@ class DataFileManager:
     def save(self, key, data):
         path = self.data_files.get(key)
         if path:
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
\ No newline at end of file
+            save_json(path, data)
\ No newline at end of file
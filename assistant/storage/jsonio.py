@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+
+from assistant.utils.metrics import REGISTRY
+from assistant.utils.tracing import span
+
+
+def load_json(path, default=None):
+    """Reads a JSON file, returning default if it is missing or empty."""
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+    if not content:
+        return default
+    return json.loads(content)
+
+
+def save_json(path, data, indent=2, label=None):
+    """Writes data as JSON through write_atomic. Returns the number of bytes written."""
+    return write_atomic(path, json.dumps(data, indent=indent).encode("utf-8"), label)
+
+
+def write_atomic(path, payload, label=None):
+    """Writes bytes so a crash leaves either the old file or the new one, never half of either.
+
+    The bytes go to a uniquely named temp file in the same directory, which
+    is fsynced before it replaces path, so concurrent writers to one path
+    never share a temp file. Records the persist.write span and counters,
+    labelled with the file name unless label is given. Pass a fixed label
+    for generated names (backup chunks) so each one isn't a new series.
+    """
+    with span("persist.write", path=path) as s:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        s.set(bytes=len(payload))
+
+        labels = {"file": label or os.path.basename(path)}
+        REGISTRY.counter("persist_writes_total", labels, help_text="State flushes by file.").inc()
+        REGISTRY.counter("persist_bytes_total", labels, help_text="Bytes written by state flushes.").inc(len(payload))
+        return len(payload)
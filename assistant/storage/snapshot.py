@@ -0,0 +1,429 @@
+"""Versioned, sectioned binary snapshot of the assistant's state.
+
+All long-lived state goes in one file, assistant/memory/state.snap: chat
+history, journal, growth log, emotional memories, preferences,
+personality state, goals and conversation summaries.
+
+The layout uses fixed offsets, so any section can be read on its own
+through mmap without parsing the others:
+
+    header   <8s H H I>        magic, format version, schema version, section count
+    table    <32s Q Q I B> * n name, offset, length, crc32, codec
+    payload  section bytes     compact JSON, zlib-compressed (codec 1) or raw (codec 0)
+
+Opening the snapshot reads only the header and table. A section is decoded
+the first time a store asks for it. A flush re-encodes only the sections
+that changed and copies the others byte for byte. Cold start cost
+therefore stays flat as the growth log or journal grows.
+
+Stores call STATE.load(name, default) once and STATE.save(name, data)
+after a change. save() marks the section dirty, and a background timer
+flushes within FLUSH_DELAY_S; a last flush runs at exit. data may be a
+callable that returns the JSON-ready value, so record stores only
+serialise when a flush actually happens.
+
+Older layouts are upgraded in place by MIGRATIONS, one schema version at
+a time. Version 0 means no snapshot yet: the legacy JSON files are
+imported and left untouched.
+
+Damage is contained. A section that fails its crc is answered with the
+store's default on load. On flush it is re-encoded from memory when
+decoded, or dropped, so the other sections still get written. A file
+whose header or table is unreadable is kept as state.snap.corrupt and
+replaced by the newest backup (assistant/storage/backup.py) that parses.
+Without one, state starts empty. It is never rebuilt from the legacy
+files, which stop changing after the first migration.
+
+    python -m assistant.storage.snapshot info
+    python -m assistant.storage.snapshot export --out state_export/
+    python -m assistant.storage.snapshot import --from state_export/
+"""
+import argparse
+import atexit
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+
+from assistant.storage.jsonio import load_json, write_atomic
+from assistant.utils.tracing import span
+
+SNAPSHOT_FILE = os.environ.get("SYLVERIA_STATE_FILE", "assistant/memory/state.snap")
+MAGIC = b"SYLVSNAP"
+FORMAT_VERSION = 1
+SCHEMA_VERSION = 2
+FLUSH_DELAY_S = 2.0
+
+HEADER = struct.Struct("<8sHHI")
+ENTRY = struct.Struct("<32sQQIB")
+CODEC_RAW, CODEC_ZLIB = 0, 1
+COMPRESS_OVER = 512  # bytes; tiny sections aren't worth the zlib header
+
+# Schema 0 -> 1: the files state used to live in, one section each
+LEGACY_FILES = {
+    "assistant_journal": "assistant/memory/assistant_journal.json",
+    "personality_state": "assistant/memory/personality_state.json",
+    "preferences": "assistant/memory/preferences.json",
+    "growth_log": "assistant/memory/growth_log.json",
+    "emotional_memories": "assistant/memory/emotional_memories.json",
+    "goals": "assistant/memory/goals.json",
+    "conversation_summaries": "assistant/memory/conversation_summaries.json",
+}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+# ─── Migrations ─────────────────────────────────
+
+def _import_legacy_files(sections):
+    for name, path in LEGACY_FILES.items():
+        try:
+            data = load_json(path)
+        except Exception as e:
+            print(f"[Snapshot] Skipping unreadable {path}: {e}")
+            continue
+        if data is not None:
+            sections[name] = data
+    return sections
+
+
+def _split_journal(sections):
+    """AiWrapper history and AssistantJournal thoughts shared one list; give each its own section."""
+    mixed = sections.pop("assistant_journal", None) or []
+    sections["history"] = [item for item in mixed if isinstance(item, dict) and "role" in item]
+    sections["journal"] = [item for item in mixed if isinstance(item, dict) and "thought" in item]
+    return sections
+
+
+MIGRATIONS = {
+    0: _import_legacy_files,
+    1: _split_journal,
+}
+
+
+# ─── Encoding ───────────────────────────────────
+
+def encode_section(value):
+    payload = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(payload) > COMPRESS_OVER:
+        return CODEC_ZLIB, zlib.compress(payload, 6)
+    return CODEC_RAW, payload
+
+
+def decode_section(codec, payload):
+    if codec == CODEC_ZLIB:
+        payload = zlib.decompress(payload)
+    elif codec != CODEC_RAW:
+        raise SnapshotError(f"unknown codec {codec}")
+    return json.loads(payload)
+
+
+def _parse_header(head):
+    if len(head) < HEADER.size:
+        raise SnapshotError("truncated header")
+    magic, format_version, schema_version, count = HEADER.unpack_from(head)
+    if magic != MAGIC:
+        raise SnapshotError("not a state snapshot")
+    if format_version > FORMAT_VERSION:
+        raise SnapshotError(f"format {format_version} is newer than this build supports")
+    return schema_version, count
+
+
+def _parse_entries(table_bytes, count):
+    if len(table_bytes) < ENTRY.size * count:
+        raise SnapshotError("truncated section table")
+    table = {}
+    for i in range(count):
+        name, offset, length, crc, codec = ENTRY.unpack_from(table_bytes, i * ENTRY.size)
+        table[name.rstrip(b"\0").decode("ascii")] = (offset, length, crc, codec)
+    return table
+
+
+def read_table(path):
+    """Returns (schema_version, {name: (offset, length, crc, codec)}) reading only the file's head."""
+    with open(path, "rb") as f:
+        schema_version, count = _parse_header(f.read(HEADER.size))
+        return schema_version, _parse_entries(f.read(ENTRY.size * count), count)
+
+
+def table_from_bytes(data):
+    """read_table for a snapshot already in memory."""
+    schema_version, count = _parse_header(data[:HEADER.size])
+    return schema_version, _parse_entries(data[HEADER.size:HEADER.size + ENTRY.size * count], count)
+
+
+def read_payloads(path, entries, bad=None):
+    """Maps the file once and copies out the requested sections, checking each crc.
+
+    A section that fails raises SnapshotError, unless bad is a list: its name is then appended there.
+    """
+    payloads = {}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        for name, (offset, length, crc, codec) in entries.items():
+            payload = m[offset:offset + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                if bad is None:
+                    raise SnapshotError(f"section {name} failed its checksum")
+                bad.append(name)
+                continue
+            payloads[name] = (codec, payload)
+    return payloads
+
+
+def build_snapshot(encoded, schema_version=SCHEMA_VERSION):
+    """encoded: {name: (codec, payload bytes)} -> the complete file as bytes."""
+    names = sorted(encoded)
+    offset = HEADER.size + ENTRY.size * len(names)
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, schema_version, len(names))]
+    for name in names:
+        codec, payload = encoded[name]
+        key = name.encode("ascii")
+        if len(key) > 32:
+            raise SnapshotError(f"section name too long: {name}")
+        parts.append(ENTRY.pack(key, offset, len(payload), zlib.crc32(payload), codec))
+        offset += len(payload)
+    parts.extend(encoded[name][1] for name in names)
+    return b"".join(parts)
+
+
+# ─── Live state ─────────────────────────────────
+
+class StateSnapshot:
+    def __init__(self, path=SNAPSHOT_FILE, flush_delay=FLUSH_DELAY_S):
+        self.requested_path = path
+        self.path = None
+        self.flush_delay = flush_delay
+        self.schema_version = None
+        self._table = {}
+        self._values = {}     # name -> decoded value or a callable producing it
+        self._dirty = set()
+        self._lock = threading.RLock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _ensure_open(self):
+        if self.path is not None:
+            return
+        with self._lock:
+            if self.path is not None:
+                return
+            # Resolved once, so a later chdir can't move where state is written
+            self.path = os.path.abspath(self.requested_path)
+            with span("snapshot.open", path=self.path) as s:
+                if os.path.exists(self.path):
+                    try:
+                        self.schema_version, self._table = read_table(self.path)
+                    except SnapshotError as e:
+                        self.schema_version, self._table = self._recover(e)
+                else:
+                    self.schema_version = 0
+                s.set(schema=self.schema_version, sections=len(self._table))
+            if self.schema_version < SCHEMA_VERSION:
+                self._migrate()
+
+    def _recover(self, error):
+        """The header or table is unreadable: set the file aside and restore the newest backup that parses."""
+        print(f"[Snapshot Load Error] {error}; kept as {self.path}.corrupt")
+        os.replace(self.path, f"{self.path}.corrupt")
+        from assistant.storage.backup import BackupStore  # backup imports this module
+
+        store = BackupStore()
+        for manifest_id in reversed(store.manifests()):
+            files = (store.load_manifest(manifest_id) or {}).get("files", {})
+            for key in files:
+                if os.path.abspath(key) != self.path:
+                    continue
+                try:
+                    store.restore(manifest_id, only=key)
+                    restored = read_table(self.path)
+                except (OSError, ValueError, SnapshotError) as e:
+                    print(f"[Snapshot] Backup {manifest_id} unusable: {e}")
+                    continue
+                print(f"[Snapshot] Restored state from backup {manifest_id}")
+                return restored
+        if os.path.exists(self.path):
+            os.remove(self.path)  # a restore that didn't parse
+        print("[Snapshot] No usable backup; starting with empty state")
+        return SCHEMA_VERSION, {}
+
+    def _migrate(self):
+        sections = {}
+        for name in self._table:
+            try:
+                sections[name] = self._decode(name)
+            except Exception as e:
+                print(f"[Snapshot Load Error] {name}: {e}; not migrated")
+        version = self.schema_version
+        while version < SCHEMA_VERSION:
+            print(f"[Snapshot] Migrating state schema {version} -> {version + 1}")
+            sections = MIGRATIONS[version](sections)
+            version += 1
+        self._table = {}
+        self._values = sections
+        self._dirty = set(sections)
+        self.schema_version = SCHEMA_VERSION
+        self.flush()
+
+    def _decode(self, name):
+        codec, payload = read_payloads(self.path, {name: self._table[name]})[name]
+        return decode_section(codec, payload)
+
+    def load(self, name, default=None):
+        """Decoded section, shared between every store that loads it; default if missing or unreadable."""
+        self._ensure_open()
+        with self._lock:
+            if name in self._values:
+                value = self._values[name]
+                return value() if callable(value) else value
+            if name in self._table:
+                try:
+                    value = self._decode(name)
+                except Exception as e:
+                    print(f"[Snapshot Load Error] {name}: {e}")
+                    return default
+                self._values[name] = value
+                return value
+            return default
+
+    def release(self, name):
+        """Drops a decoded section from the cache when its store keeps its own copy (e.g. records)."""
+        with self._lock:
+            if name not in self._dirty and not callable(self._values.get(name)):
+                self._values.pop(name, None)
+
+    def save(self, name, value):
+        self._ensure_open()
+        with self._lock:
+            self._values[name] = value
+            self._dirty.add(name)
+            if self._timer is None and self.flush_delay:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sections(self):
+        self._ensure_open()
+        with self._lock:
+            return sorted(set(self._table) | set(self._values))
+
+    def flush(self):
+        """Writes dirty sections; clean ones are copied from the current file without decoding."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.path is None or not self._dirty:
+                return 0
+
+            encoded = {}
+            for name in self._dirty:
+                value = self._values[name]
+                try:
+                    encoded[name] = encode_section(value() if callable(value) else value)
+                except RuntimeError as e:
+                    # A store mutated its data mid-encode; keep it dirty and retry shortly
+                    print(f"[Snapshot] Deferring {name}: {e}")
+                    self._timer = threading.Timer(self.flush_delay or 0.5, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                    return 0
+
+            clean = {name: entry for name, entry in self._table.items() if name not in encoded}
+            if clean:
+                bad = []
+                encoded.update(read_payloads(self.path, clean, bad))
+                for name in bad:
+                    value = self._values.get(name)
+                    if value is None:
+                        print(f"[Snapshot] Section {name} failed its checksum; dropping it")
+                        continue
+                    print(f"[Snapshot] Section {name} failed its checksum; rewriting it from memory")
+                    encoded[name] = encode_section(value() if callable(value) else value)
+
+            data = build_snapshot(encoded, self.schema_version)
+            written = write_atomic(self.path, data)
+
+            offset = HEADER.size + ENTRY.size * len(encoded)
+            self._table = {}
+            for name in sorted(encoded):
+                codec, payload = encoded[name]
+                self._table[name] = (offset, len(payload), zlib.crc32(payload), codec)
+                offset += len(payload)
+            self._dirty.clear()
+            return written
+
+    def close(self):
+        """Flushes and forgets the open file, so the next use re-resolves the path (tests, benchmarks)."""
+        with self._lock:
+            self.flush()
+            self.path = None
+            self.schema_version = None
+            self._table = {}
+            self._values = {}
+
+
+STATE = StateSnapshot()
+
+
+# ─── Command line ───────────────────────────────
+
+def cmd_info(args):
+    schema, table = read_table(args.path)
+    total = os.path.getsize(args.path)
+    print(f"{args.path}: format {FORMAT_VERSION}, schema {schema}, {len(table)} sections, {total} bytes")
+    payloads = read_payloads(args.path, table)
+    for name, (offset, length, _, codec) in sorted(table.items()):
+        value = decode_section(*payloads[name])
+        items = len(value) if isinstance(value, (list, dict)) else 1
+        print(f"  {name:<24} {length:>9} B  {'zlib' if codec == CODEC_ZLIB else 'raw ':<4}  {items:>6} items")
+    return 0
+
+
+def cmd_export(args):
+    schema, table = read_table(args.path)
+    payloads = read_payloads(args.path, table)
+    os.makedirs(args.out, exist_ok=True)
+    for name in sorted(table):
+        target = os.path.join(args.out, f"{name}.json")
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(decode_section(*payloads[name]), f, indent=2, ensure_ascii=False)
+        print(f"  {target}")
+    with open(os.path.join(args.out, "_schema.json"), "w", encoding="utf-8") as f:
+        json.dump({"format": FORMAT_VERSION, "schema": schema}, f)
+    return 0
+
+
+def cmd_import(args):
+    meta = load_json(os.path.join(args.source, "_schema.json"), {}) or {}
+    if meta.get("schema", SCHEMA_VERSION) != SCHEMA_VERSION:
+        print(f"[Snapshot] Export is schema {meta.get('schema')}, expected {SCHEMA_VERSION}")
+        return 1
+    encoded = {}
+    for entry in sorted(os.listdir(args.source)):
+        if entry.endswith(".json") and not entry.startswith("_"):
+            encoded[entry[:-5]] = encode_section(load_json(os.path.join(args.source, entry)))
+    write_atomic(args.path, build_snapshot(encoded))
+    print(f"[Snapshot] Wrote {len(encoded)} sections to {args.path}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect, export or rebuild the state snapshot.")
+    parser.add_argument("--path", default=SNAPSHOT_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("info", help="List sections and sizes")
+    export = commands.add_parser("export", help="Write every section as pretty JSON")
+    export.add_argument("--out", default="state_export")
+    rebuild = commands.add_parser("import", help="Build a snapshot from an export directory")
+    rebuild.add_argument("--from", dest="source", default="state_export")
+    args = parser.parse_args(argv)
+    return {"info": cmd_info, "export": cmd_export, "import": cmd_import}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
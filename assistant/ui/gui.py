@@ -1,15 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, Toplevel, BooleanVar, Checkbutton, Button
-from PIL import Image, ImageTk
 import threading
 import time
 import os
 import json
 from assistant.plugins.plugin_manager import ENABLED_PLUGINS_FILE
+from assistant.utils.lazy_import import lazy_import
+from assistant.ui.output_sink import OutputSink
+from assistant.utils.metrics import REGISTRY
 
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
 
+SLEEPY_AFTER_S = 360
 
-class CombinedInterface:
+
+
+class CombinedInterface(OutputSink):
     def __init__(self, assistant):
         self.assistant = assistant
         self.root = tk.Tk()
@@ -23,7 +30,8 @@ class CombinedInterface:
 
         self._load_images()
         self._setup_gui()
-        threading.Thread(target=self._idle_check_loop, daemon=True).start()
+        assistant.jobs.every("avatar.sleepy", 60, self._fall_asleep, idle_after=SLEEPY_AFTER_S,
+                             activity=lambda: self.last_activity, when=lambda: not self.sleepy)
 
     def _load_images(self):
         try:
@@ -74,6 +82,7 @@ class CombinedInterface:
         quick_frame = tk.Frame(self.root, bg="#1a1a1a")
         quick_frame.pack(pady=(5, 10))
         tk.Button(quick_frame, text="Plugins", command=self.open_plugin_window, bg="#5a5a88", fg="white", relief="flat").pack(side=tk.LEFT, padx=5)
+        tk.Button(quick_frame, text="Stats", command=self.open_stats_window, bg="#5a5a88", fg="white", relief="flat").pack(side=tk.LEFT, padx=5)
         self.response_box = tk.Text(self.root, height=8, bg="#1e1e1e", fg="white")
         self.response_box.pack(fill="x", padx=10, pady=5)
 
@@ -99,7 +108,7 @@ class CombinedInterface:
         self.show_thinking()
 
         def worker():
-            response = self.assistant.command_processor.process(user_input)
+            response = self.assistant.command_processor.process(user_input, source="gui")
 
             def update_gui():
                 self.hide_thinking()
@@ -168,17 +177,23 @@ class CombinedInterface:
         if self.gui_photo_idle:
             self.gui_label.config(image=self.gui_photo_idle)
 
-    def _idle_check_loop(self):
-        while True:
-            if not self.sleepy and time.time() - self.last_activity > 360:
-                if self.gui_photo_sleepy:
-                    self.gui_label.after(0, lambda: self.gui_label.config(image=self.gui_photo_sleepy))
-                    self.sleepy = True
-            time.sleep(5)
+    def _fall_asleep(self):
+        if self.gui_photo_sleepy:
+            self.gui_label.after(0, lambda: self.gui_label.config(image=self.gui_photo_sleepy))
+            self.sleepy = True
+
+    def notify(self, text):
+        self.response_box.insert("end", f"System: {text}\n")
+
+    def call_soon(self, callback):
+        self.root.after(0, callback)
 
     def run(self):
         self.root.mainloop()
 
+    def stop(self):
+        self.root.quit()
+
     def is_talking(self):
         return self.gui_label.cget("image") == str(self.gui_photo_talking)
 
@@ -195,6 +210,27 @@ class CombinedInterface:
             self.response_log.delete(f"{len(lines)}.0", tk.END)
         self.response_log.config(state=tk.DISABLED)
 
+    def open_stats_window(self):
+        window = Toplevel(self.root)
+        window.title("Sylveria Stats")
+        window.geometry("520x600")
+        window.configure(bg="#1a1a1a")
+
+        stats_text = tk.Text(window, bg="#101010", fg="white", font=("Consolas", 9), wrap="none")
+        stats_text.pack(fill="both", expand=True, padx=5, pady=5)
+
+        def refresh():
+            try:
+                stats_text.config(state=tk.NORMAL)
+                stats_text.delete("1.0", tk.END)
+                stats_text.insert(tk.END, REGISTRY.format_summary() or "No metrics recorded yet.")
+                stats_text.config(state=tk.DISABLED)
+                window.after(2000, refresh)
+            except tk.TclError:
+                pass  # window was closed
+
+        refresh()
+
     def open_plugin_window(self):
         window = Toplevel(self.root)
         window.title("Plugin Manager")
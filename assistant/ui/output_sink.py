@@ -0,0 +1,73 @@
+import logging
+import threading
+import time
+
+
+class OutputSink:
+    """Where the assistant sends user-visible output.
+
+    CombinedInterface (Tk) and ConsoleSink (headless) both implement this, so
+    planner, timers and background loops never need to know which one is running.
+    """
+
+    def add_response(self, speaker, text):
+        raise NotImplementedError
+
+    def notify(self, text):
+        """System notice that is not part of the conversation."""
+        self.add_response("System", text)
+
+    def call_soon(self, callback):
+        """Runs callback on the sink's own thread (Tk main loop for the GUI)."""
+        callback()
+
+    def set_talking(self, is_talking):
+        pass
+
+    def is_talking(self):
+        return False
+
+    def show_thinking(self):
+        pass
+
+    def hide_thinking(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+
+class ConsoleSink(OutputSink):
+    """Headless sink: writes responses to stdout and the assistant log."""
+
+    def __init__(self, assistant=None):
+        self.assistant = assistant
+        self.logger = logging.getLogger("Assistant")
+        self.last_activity = time.time()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_response(self, speaker, text):
+        clean_text = (text or "").strip()
+        if not clean_text:
+            return
+        self.last_activity = time.time()
+        with self._lock:
+            print(f"{speaker}: {clean_text}", flush=True)
+        self.logger.info("%s: %s", speaker, clean_text)
+
+    def notify(self, text):
+        with self._lock:
+            print(f"[System] {text}", flush=True)
+        self.logger.info(text)
+
+    def run(self):
+        # Block the main thread until stop() or Ctrl+C; frontends run in their own threads
+        while not self._stopped.wait(timeout=1.0):
+            pass
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,182 @@
+"""Small LRU cache with expiry, background refresh and optional persistence.
+
+    cache = TTLCache("weather", ttl=900, stale_ttl=3600, persist=True)
+    text = cache.get_or_load(key, lambda: fetch(key))
+
+get_or_load returns a fresh entry straight away. An entry that has
+expired but is younger than ttl + stale_ttl is also returned straight
+away, and a background thread reloads it, one reload per key at a time.
+Anything older is loaded inline. When that load fails, the old entry is
+still returned if there is one, so a flaky API degrades to slightly old
+answers rather than errors.
+
+Loaders that return None are not cached. Timestamps are wall-clock, so a
+persisted cache keeps its expiry across restarts. Persisted caches live
+in CACHE_DIR/<name>.json, written a few seconds after the last change,
+outside the state snapshot. A plugin running in its own process can
+then keep a cache without touching the assistant's snapshot.
+
+Hits and misses are counted by record_cache(name, hit) as
+cache_requests_total{cache,result}.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from assistant.storage.jsonio import load_json, save_json
+from assistant.utils.metrics import record_cache
+
+CACHE_DIR = os.environ.get("SYLVERIA_CACHE_DIR", "assistant/memory/cache")
+FLUSH_DELAY_S = 5.0
+
+
+def normalize_key(text):
+    """Case- and whitespace-insensitive key: "  New  York " -> "new york"."""
+    return " ".join(str(text or "").lower().split())
+
+
+class TTLCache:
+    def __init__(self, name, maxsize=128, ttl=600.0, stale_ttl=0.0, persist=False):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.path = os.path.join(CACHE_DIR, f"{name}.json") if persist else None
+        self._entries = OrderedDict()   # key -> (stored_at, value), least recently used first
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        if self.path:
+            self._load()
+            atexit.register(self.flush)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    # ─── Lookup ─────────────────────────────────
+
+    def _lookup(self, key, now):
+        """(value, age) of the stored entry, however old, or (None, None)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        self._entries.move_to_end(key)
+        return entry[1], now - entry[0]
+
+    def get(self, key):
+        """Fresh value or None; never loads."""
+        with self._lock:
+            value, age = self._lookup(key, time.time())
+        hit = value is not None and age < self.ttl
+        record_cache(self.name, hit)
+        return value if hit else None
+
+    def peek(self, key):
+        """Any stored value, however old, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            value, age = self._lookup(key, time.time())
+        if value is not None and age < self.ttl:
+            record_cache(self.name, True)
+            return value
+        if value is not None and age < self.ttl + self.stale_ttl:
+            record_cache(self.name, True)
+            self.refresh(key, loader)
+            return value
+
+        record_cache(self.name, False)
+        try:
+            fresh = loader()
+        except Exception as e:
+            if value is None:
+                raise
+            print(f"[Cache] {self.name}: reload of {key!r} failed, serving old entry ({e})")
+            return value
+        if fresh is not None:
+            self.put(key, fresh)
+            return fresh
+        return value
+
+    def refresh(self, key, loader):
+        """Reloads key on a background thread unless a reload is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                fresh = loader()
+                if fresh is not None:
+                    self.put(key, fresh)
+            except Exception as e:
+                print(f"[Cache] {self.name}: background refresh of {key!r} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"cache-refresh:{self.name}", daemon=True).start()
+
+    # ─── Updates ────────────────────────────────
+
+    def put(self, key, value, stored_at=None):
+        with self._lock:
+            self._entries[key] = (stored_at or time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        self._changed()
+
+    def invalidate(self, key=None):
+        """Drops one key, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        self._changed()
+
+    # ─── Persistence ────────────────────────────
+
+    def _load(self):
+        now = time.time()
+        for key, (stored_at, value) in (load_json(self.path, {}) or {}).items():
+            if now - stored_at < self.ttl + self.stale_ttl:
+                self._entries[key] = (stored_at, value)
+
+    def _changed(self):
+        if not self.path:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(FLUSH_DELAY_S, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        if not self.path:
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {key: [stored_at, value] for key, (stored_at, value) in self._entries.items()}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            save_json(self.path, data, indent=None)
+        except Exception as e:
+            print(f"[Cache] Failed to save {self.name}: {e}")
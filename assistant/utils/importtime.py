@@ -0,0 +1,99 @@
+"""Import-time report for the assistant.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+summarises where cold-start time goes.
+
+    python -m assistant.utils.importtime                   # assistant.core
+    python -m assistant.utils.importtime main --top 40
+    python -m assistant.utils.importtime assistant.core --check torch whisper
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+DEFAULT_MODULE = "assistant.core"
+
+
+def measure(module=DEFAULT_MODULE, python=sys.executable, cwd=None):
+    """Returns (entries, loaded) where entries is a list of dicts parsed from -X importtime."""
+    code = (
+        f"import sys, importlib; importlib.import_module({module!r}); "
+        "print('\\n'.join(sorted(sys.modules)))"
+    )
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=cwd or os.getcwd(),
+        capture_output=True,
+        text=True,
+    )
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": len(indent) // 2,
+        })
+
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"Importing {module} failed:\n{tail.strip()}")
+
+    loaded = set(proc.stdout.split())
+    return entries, loaded
+
+
+def format_report(entries, top=25):
+    total_us = sum(e["self_us"] for e in entries)
+    lines = [f"Total import time: {total_us / 1000:.1f} ms across {len(entries)} modules", ""]
+
+    lines.append(f"Top {top} by cumulative time:")
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    top_level = [e for e in entries if e["depth"] <= 1]
+    for e in sorted(top_level, key=lambda x: x["cumulative_us"], reverse=True)[:top]:
+        lines.append(f"{e['cumulative_us'] / 1000:>14.1f} {e['self_us'] / 1000:>9.1f}  {e['module']}")
+
+    lines.append("")
+    lines.append(f"Top {top} by self time:")
+    for e in sorted(entries, key=lambda x: x["self_us"], reverse=True)[:top]:
+        lines.append(f"{e['self_us'] / 1000:>14.1f}  {e['module']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import time for an assistant module.")
+    parser.add_argument("module", nargs="?", default=DEFAULT_MODULE)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument(
+        "--check", nargs="*", default=[],
+        help="Fail (exit 1) if any of these modules get imported, e.g. --check torch whisper"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        entries, loaded = measure(args.module)
+    except RuntimeError as e:
+        print(f"[ImportTime] {e}")
+        return 2
+
+    print(format_report(entries, top=args.top))
+
+    leaked = [name for name in args.check if name in loaded]
+    if leaked:
+        print(f"\n[ImportTime] Heavy modules imported eagerly: {', '.join(leaked)}")
+        return 1
+    if args.check:
+        print(f"\n[ImportTime] None of {', '.join(args.check)} were imported.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
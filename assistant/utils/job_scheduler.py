@@ -0,0 +1,286 @@
+"""One thread for every recurring chore.
+
+Jobs are kept in a heap ordered by their next run time. The scheduler
+thread sleeps on a condition until the earliest one is due, or until a
+job is added or cancelled, so nothing polls. Jobs run on that thread
+one at a time. A job that can block for a long time (LLM summaries,
+backups) passes threaded=True; it then runs on a short-lived worker,
+and never overlaps with its own previous run.
+
+Triggers:
+    every(name, seconds, fn)      fixed interval, plus up to `jitter` seconds
+    cron(name, "0 * * * *", fn)   minute hour day-of-month month day-of-week
+    once(name, delay, fn)         one shot (timers)
+
+Conditions:
+    idle_after=N   only run once the user has been idle N seconds. A due
+                   job is pushed back to last_activity + N instead of
+                   being polled.
+    when=fn        skip this run unless fn() is true.
+
+Per job: job_runs_total{job,outcome}, job_duration_ms{job} and
+job_lag_ms{job} (how late it started).
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from assistant.utils.metrics import REGISTRY
+
+MIN_IDLE_RECHECK_S = 1.0
+
+
+class CronSpec:
+    """Five-field cron expression: numbers, *, a-b, */n, a-b/n and comma lists."""
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron needs 5 fields, got {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(part, low, high) for part, (low, high) in zip(parts, self.FIELDS)
+        )
+        # Classic cron: when both day fields are restricted, either may match
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse(field, low, high):
+        values = set()
+        for item in field.split(","):
+            body, _, step = item.partition("/")
+            if body == "*":
+                start, end = low, high
+            elif "-" in body:
+                start, end = (int(x) for x in body.split("-", 1))
+            else:
+                start = end = int(body)
+                if step:
+                    end = high
+            if not (low <= start <= end <= high):
+                raise ValueError(f"cron field {item!r} is outside {low}-{high}")
+            values.update(range(start, end + 1, int(step or 1)))
+        return values
+
+    def _day_matches(self, moment):
+        weekday = (moment.weekday() + 1) % 7  # cron counts Sunday as 0
+        if self.any_day:
+            return self.any_weekday or weekday in self.weekdays
+        if self.any_weekday:
+            return moment.day in self.days
+        return moment.day in self.days or weekday in self.weekdays
+
+    def next_after(self, timestamp):
+        """Next matching minute strictly after timestamp, as a timestamp."""
+        moment = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"cron {self.expression!r} never matches")
+
+
+class Job:
+    def __init__(self, name, fn, interval=None, cron=None, jitter=0.0, idle_after=None,
+                 when=None, activity=None, threaded=False, repeat=True):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.cron = CronSpec(cron) if isinstance(cron, str) else cron
+        self.jitter = jitter
+        self.idle_after = idle_after
+        self.when = when
+        self.activity = activity
+        self.threaded = threaded
+        self.repeat = repeat
+        self.next_run = None
+        self.due = None        # when the trigger fired, before any idle deferral
+        self.runs = 0
+        self.running = False
+        self.cancelled = False
+
+    def schedule_next(self, now):
+        if self.cron is not None:
+            self.next_run = self.cron.next_after(now)
+        else:
+            self.next_run = now + self.interval
+        if self.jitter:
+            self.next_run += random.uniform(0, self.jitter)
+        self.due = self.next_run
+
+    def __repr__(self):
+        trigger = self.cron.expression if self.cron else f"every {self.interval:g}s"
+        return f"Job({self.name!r}, {trigger}, next_run={self.next_run})"
+
+
+class JobScheduler:
+    def __init__(self, assistant=None):
+        self.assistant = assistant
+        self._heap = []
+        self._jobs = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        REGISTRY.gauge("scheduled_jobs", fn=lambda: self.count(), help_text="Jobs waiting in the scheduler.")
+        REGISTRY.gauge("active_timers", fn=lambda: self.count("timer:"), help_text="User timers waiting to fire.")
+
+    # ─── Registration ─────────────────────────────
+
+    def every(self, name, seconds, fn, first_in=None, **options):
+        job = Job(name, fn, interval=seconds, **options)
+        return self._add(job, time.time() + (seconds if first_in is None else first_in))
+
+    def cron(self, name, expression, fn, **options):
+        job = Job(name, fn, cron=expression, **options)
+        return self._add(job, job.cron.next_after(time.time()))
+
+    def once(self, name, delay, fn, **options):
+        job = Job(name, fn, interval=delay, repeat=False, **options)
+        return self._add(job, time.time() + delay)
+
+    def _add(self, job, first_run):
+        with self._cond:
+            job.next_run = job.due = first_run
+            self._jobs.setdefault(job.name, []).append(job)
+            self._push(job)
+            self._cond.notify()
+        return job
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.next_run, next(self._seq), job))
+
+    def cancel(self, name):
+        """Cancels every job with this name. Returns how many were cancelled."""
+        with self._cond:
+            jobs = self._jobs.pop(name, [])
+            for job in jobs:
+                job.cancelled = True
+            self._cond.notify()
+            return len(jobs)
+
+    def _forget(self, job):
+        jobs = self._jobs.get(job.name, [])
+        if job in jobs:
+            jobs.remove(job)
+        if not jobs:
+            self._jobs.pop(job.name, None)
+
+    def jobs(self):
+        with self._cond:
+            return sorted((job for jobs in self._jobs.values() for job in jobs), key=lambda job: job.next_run)
+
+    def count(self, prefix=""):
+        with self._cond:
+            return sum(len(jobs) for name, jobs in self._jobs.items() if name.startswith(prefix))
+
+    # ─── Running ──────────────────────────────────
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def _last_activity(self, job):
+        if job.activity is not None:
+            return job.activity()
+        return getattr(self.assistant, "last_user_activity", 0.0)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                        continue
+                    wait = self._heap[0][0] - time.time() if self._heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+
+                now = time.time()
+                if job.idle_after is not None:
+                    idle_at = self._last_activity(job) + job.idle_after
+                    if idle_at > now:
+                        job.next_run = max(idle_at, now + MIN_IDLE_RECHECK_S)
+                        self._push(job)
+                        continue
+
+            self._dispatch(job, now)
+
+    def _dispatch(self, job, now):
+        if job.cancelled:
+            return
+        if job.running:
+            outcome = "overlap"
+        elif job.when is not None and not self._safe_when(job):
+            outcome = "skipped"
+        else:
+            outcome = None
+
+        if outcome is None:
+            job.running = True
+            REGISTRY.histogram("job_lag_ms", {"job": job.name}, help_text="How late jobs start.").observe(
+                max(0.0, (now - job.due) * 1000)
+            )
+            if job.threaded:
+                threading.Thread(target=self._run, args=(job,), name=f"job:{job.name}", daemon=True).start()
+            else:
+                self._run(job)
+        else:
+            REGISTRY.counter("job_runs_total", {"job": job.name, "outcome": outcome}, help_text="Scheduled job runs.").inc()
+
+        with self._cond:
+            if job.cancelled:
+                return
+            if job.repeat:
+                job.schedule_next(time.time())
+                self._push(job)
+            else:
+                self._forget(job)
+
+    def _safe_when(self, job):
+        try:
+            return bool(job.when())
+        except Exception as e:
+            print(f"[Scheduler Error] {job.name} condition: {e}")
+            return False
+
+    def _run(self, job):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            job.fn()
+        except Exception as e:
+            outcome = "error"
+            print(f"[Scheduler Error] {job.name}: {e}")
+        finally:
+            job.running = False
+            job.runs += 1
+            REGISTRY.histogram("job_duration_ms", {"job": job.name}, help_text="Scheduled job run time.").observe(
+                (time.perf_counter() - started) * 1000
+            )
+            REGISTRY.counter("job_runs_total", {"job": job.name, "outcome": outcome}, help_text="Scheduled job runs.").inc()
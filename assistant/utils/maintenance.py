@@ -1,16 +1,24 @@
-import threading
-import time
+REAL_WEATHER_REFRESH_S = 15 * 60   # wttr.in updates about this often
+REAL_WEATHER_FIRST_S = 60          # let startup settle before loading the weather plugin
+
 
 class MaintenanceTasks:
     def __init__(self, assistant):
         self.assistant = assistant
 
     def start_background_tasks(self):
-        threading.Thread(target=self._self_talk_loop, daemon=True).start()
+        jobs = self.assistant.jobs
+        # Hourly, on the hour, so "It is evening" changes when the evening starts
+        jobs.cron("environment.refresh", "0 * * * *", self.assistant.environment.refresh)
+        # The prompt reads environment.weather, so real weather costs nothing per turn
+        jobs.every("weather.environment", REAL_WEATHER_REFRESH_S, self._real_weather,
+                   first_in=REAL_WEATHER_FIRST_S, threaded=True)
 
-    def _self_talk_loop(self):
-        while True:
-            time.sleep(600)
-            message = ""
-            self.assistant.gui.add_response("Sylveria", message)
-            self.assistant.audio_manager.speech_queue.put(message)
\ No newline at end of file
+    def _real_weather(self):
+        """Feeds the sky outside into the environment; starts the weather plugin if it is enabled."""
+        weather = self.assistant.plugin_manager.provider("weather")
+        if weather is None:
+            return
+        condition = weather.current_condition()
+        if condition:
+            self.assistant.environment.set_real_weather(condition)
\ No newline at end of file
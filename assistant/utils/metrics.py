@@ -0,0 +1,259 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+METRIC_PREFIX = "sylveria_"
+
+# Latency buckets in milliseconds, roughly log-spaced from 1ms to 2min
+DEFAULT_BUCKETS_MS = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000
+)
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=None):
+    items = list((labels or {}).items()) + list((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class Counter:
+    """Monotonically increasing value (requests, bytes written, ...)."""
+
+    def __init__(self, name, labels=None):
+        self.name = name
+        self.labels = dict(labels or {})
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that goes up and down. If fn is given it is sampled at read time (queue depths)."""
+
+    def __init__(self, name, labels=None, fn=None):
+        self.name = name
+        self.labels = dict(labels or {})
+        self.fn = fn
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        if self.fn is not None:
+            try:
+                return float(self.fn())
+            except Exception:
+                return float("nan")
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    @contextmanager
+    def track(self):
+        """Counts something as active for the duration of the block (e.g. running timers)."""
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum/min/max and bucket-interpolated percentiles."""
+
+    def __init__(self, name, labels=None, buckets=DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.labels = dict(labels or {})
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        """Estimates the q-th percentile (0-100) by interpolating inside the matching bucket."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = self.count * q / 100.0
+            seen = 0
+            for i, bucket_count in enumerate(self.counts):
+                if seen + bucket_count >= target and bucket_count:
+                    lower = self.buckets[i - 1] if i > 0 else 0.0
+                    upper = self.buckets[i] if i < len(self.buckets) else self.max
+                    fraction = (target - seen) / bucket_count
+                    estimate = lower + (upper - lower) * fraction
+                    return max(self.min, min(self.max, estimate))
+                seen += bucket_count
+            return self.max
+
+    @contextmanager
+    def time(self):
+        """Observes the block's wall time in milliseconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - started) * 1000)
+
+    def snapshot(self):
+        return {
+            "name": self.name,
+            "labels": dict(self.labels),
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "min": self.min,
+            "max": self.max,
+            "avg": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+        }
+
+
+class MetricsRegistry:
+    """Process-wide store of named metrics, keyed by (name, labels)."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, kind, name, labels, factory, help_text):
+        key = (kind, name, _label_key(labels))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = factory()
+                    self._metrics[key] = metric
+                    if help_text:
+                        self._help.setdefault(name, help_text)
+        return metric
+
+    def counter(self, name, labels=None, help_text=None):
+        return self._get_or_create("counter", name, labels, lambda: Counter(name, labels), help_text)
+
+    def gauge(self, name, labels=None, fn=None, help_text=None):
+        gauge = self._get_or_create("gauge", name, labels, lambda: Gauge(name, labels, fn), help_text)
+        if fn is not None:
+            gauge.fn = fn  # re-registering (e.g. after a restart of the owner) rebinds the sampler
+        return gauge
+
+    def histogram(self, name, labels=None, buckets=DEFAULT_BUCKETS_MS, help_text=None):
+        return self._get_or_create("histogram", name, labels, lambda: Histogram(name, labels, buckets), help_text)
+
+    def _of_kind(self, kind, name=None):
+        return [m for (k, n, _), m in list(self._metrics.items()) if k == kind and (name is None or n == name)]
+
+    def counters(self, name=None):
+        return self._of_kind("counter", name)
+
+    def gauges(self, name=None):
+        return self._of_kind("gauge", name)
+
+    def histograms(self, name=None):
+        return self._of_kind("histogram", name)
+
+    def value(self, kind, name, labels=None):
+        metric = self._metrics.get((kind, name, _label_key(labels)))
+        return metric.value if metric is not None else 0.0
+
+    def total(self, name):
+        """Sum of a counter across all label sets."""
+        return sum(c.value for c in self.counters(name))
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # ─── Exposition ─────────────────────────────────
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        by_name = {}
+        for (kind, name, _), metric in sorted(self._metrics.items(), key=lambda item: item[0][:2]):
+            by_name.setdefault((name, kind), []).append(metric)
+
+        for (name, kind), metrics in by_name.items():
+            full_name = METRIC_PREFIX + name
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for metric in metrics:
+                if kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, metric.counts):
+                        cumulative += count
+                        lines.append(f"{full_name}_bucket{_format_labels(metric.labels, {'le': bound})} {cumulative}")
+                    lines.append(f"{full_name}_bucket{_format_labels(metric.labels, {'le': '+Inf'})} {metric.count}")
+                    lines.append(f"{full_name}_sum{_format_labels(metric.labels)} {metric.sum}")
+                    lines.append(f"{full_name}_count{_format_labels(metric.labels)} {metric.count}")
+                else:
+                    lines.append(f"{full_name}{_format_labels(metric.labels)} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self):
+        """Human-readable snapshot used by the GUI stats panel."""
+        lines = []
+        for metric in sorted(self.counters() + self.gauges(), key=lambda m: (m.name, _label_key(m.labels))):
+            labels = ",".join(f"{k}={v}" for k, v in metric.labels.items())
+            value = metric.value
+            shown = f"{value:.0f}" if float(value).is_integer() else f"{value:.2f}"
+            lines.append(f"{metric.name}{'{' + labels + '}' if labels else ''}: {shown}")
+
+        histograms = sorted(self.histograms(), key=lambda h: (h.name, _label_key(h.labels)))
+        if histograms:
+            lines.append("")
+            lines.append("latency (ms)            count    p50     p95     p99")
+        for h in histograms:
+            label = ",".join(str(v) for v in h.labels.values()) or h.name
+            snap = h.snapshot()
+            lines.append(f"{label[:22]:<22} {snap['count']:>6} {snap['p50']:>7.1f} {snap['p95']:>7.1f} {snap['p99']:>7.1f}")
+        return "\n".join(lines)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def record_cache(cache, hit):
+    """Shared hit/miss counter for every in-process cache."""
+    REGISTRY.counter(
+        "cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"},
+        help_text="Cache lookups by cache name and result."
+    ).inc()
@@ -0,0 +1,224 @@
+"""Lightweight span tracing for assistant turns.
+
+Spans nest per thread. Every finished span goes to the registered exporters:
+by default a JSONL file (TRACE_FILE) and the in-process histogram registry
+(``span_duration_ms`` labelled by span name).
+
+    from assistant.utils.tracing import span
+
+    with span("llm.ollama", model=OLLAMA_MODEL) as s:
+        ...
+        s.set(eval_count=42)
+
+Summarise the slowest recorded turns with:
+
+    python -m assistant.utils.tracing traces.jsonl --slowest 5
+"""
+import argparse
+import atexit
+import itertools
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from assistant.utils.metrics import REGISTRY
+
+TRACE_FILE = os.environ.get("SYLVERIA_TRACE_FILE", "traces.jsonl")  # empty string disables the file
+SPAN_HISTOGRAM = "span_duration_ms"
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration_ms", "attrs", "error", "_t0")
+
+    def __init__(self, name, trace_id, span_id, parent_id, attrs):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.duration_ms = None
+        self.attrs = attrs
+        self.error = None
+        self._t0 = time.perf_counter()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self):
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class HistogramExporter:
+    def __init__(self, registry=REGISTRY):
+        self.registry = registry
+
+    def export(self, span):
+        self.registry.histogram(SPAN_HISTOGRAM, {"span": span.name}).observe(span.duration_ms)
+
+
+class JsonlExporter:
+    """Appends spans to a JSONL file from a background thread so the hot path never touches disk."""
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._write_lock = threading.Lock()
+        threading.Thread(target=self._writer_loop, name="trace-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def export(self, span):
+        self._queue.put(span.to_dict())
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while time.monotonic() < deadline:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._write_lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+        except Exception as e:
+            print(f"[Trace Export Error] {e}")
+
+
+class Tracer:
+    def __init__(self, exporters=None):
+        self.exporters = list(exporters or [])
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def current(self):
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name, **attrs):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        parent = stack[-1] if stack else None
+        trace_id = parent.trace_id if parent else f"{random.getrandbits(64):016x}"
+        current = Span(name, trace_id, next(self._ids), parent.span_id if parent else None, attrs)
+        stack.append(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.duration_ms = (time.perf_counter() - current._t0) * 1000
+            stack.pop()
+            for exporter in self.exporters:
+                try:
+                    exporter.export(current)
+                except Exception as e:
+                    print(f"[Trace Export Error] {e}")
+
+
+tracer = Tracer([HistogramExporter()])
+if TRACE_FILE:
+    tracer.add_exporter(JsonlExporter(TRACE_FILE))
+
+span = tracer.span
+
+
+# ─── Trace report ───────────────────────────────
+
+def load_traces(path):
+    traces = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                traces.setdefault(record["trace_id"], []).append(record)
+    return traces
+
+
+def format_trace(records):
+    children = {}
+    for record in records:
+        children.setdefault(record["parent_id"], []).append(record)
+
+    lines = []
+
+    def walk(parent_id, depth):
+        for record in sorted(children.get(parent_id, []), key=lambda r: r["start"]):
+            attrs = record.get("attrs") or {}
+            detail = " ".join(f"{k}={v}" for k, v in attrs.items() if not isinstance(v, (dict, list)))
+            error = f" ERROR {record['error']}" if record.get("error") else ""
+            lines.append(f"{'  ' * depth}{record['duration_ms']:>10.1f} ms  {record['name']} {detail}{error}".rstrip())
+            walk(record["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the slowest traced turns.")
+    parser.add_argument("path", nargs="?", default=TRACE_FILE or "traces.jsonl")
+    parser.add_argument("--slowest", type=int, default=5)
+    parser.add_argument("--root", default="turn", help="Root span name to rank by")
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.path)
+    roots = [
+        (record, records)
+        for records in traces.values()
+        for record in records
+        if record["parent_id"] is None and record["name"] == args.root
+    ]
+    roots.sort(key=lambda item: item[0]["duration_ms"], reverse=True)
+
+    print(f"{len(roots)} '{args.root}' traces in {args.path}\n")
+    for root, records in roots[:args.slowest]:
+        print(f"trace {root['trace_id']} @ {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(root['start']))}")
+        print(format_trace(records))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
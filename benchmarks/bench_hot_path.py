@@ -0,0 +1,271 @@
+"""Offline benchmark for the conversational hot path.
+
+Builds a headless PersonalAssistant with a stub LLM (or the real AiWrapper
+pointed at a local fake Ollama server), no plugins and no audio. It replays
+benchmarks/corpus.txt through CommandProcessor.process and reports latency
+percentiles, turns/sec, allocations and bytes written to disk per turn.
+
+    python -m benchmarks.bench_hot_path
+    python -m benchmarks.bench_hot_path --llm fake-ollama --latency-ms 20
+    python -m benchmarks.bench_hot_path --save-baseline     # record current numbers
+    python -m benchmarks.bench_hot_path                     # compare against baselines.json
+
+Exits with status 1 when a metric regresses beyond its tolerance.
+The committed baselines.json covers the stub-0ms and stub-20ms scenarios
+(200 turns). Timings are machine-specific: on a different machine,
+record them again with --save-baseline before you compare.
+"""
+import os
+
+# Keep span export off the disk so it doesn't count as persistence; must happen before assistant imports
+os.environ.setdefault("SYLVERIA_TRACE_FILE", "")
+
+import argparse
+import glob
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, ExitStack
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_FILE = os.path.join(BENCH_DIR, "corpus.txt")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baselines.json")
+
+# Allowed relative change before a metric counts as a regression (negative = lower is worse)
+TOLERANCES = {
+    "p50_ms": 0.25,
+    "p95_ms": 0.30,
+    "p99_ms": 0.40,
+    "turns_per_s": -0.20,
+    "alloc_peak_kb": 0.25,
+    "disk_bytes_per_turn": 0.10,
+}
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def load_corpus(path=CORPUS_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@contextmanager
+def patched(obj, attr, value):
+    original = getattr(obj, attr)
+    setattr(obj, attr, value)
+    try:
+        yield
+    finally:
+        setattr(obj, attr, original)
+
+
+@contextmanager
+def scratch_workspace():
+    """Runs inside a temp copy of the memory files so benchmarks never touch real state."""
+    from assistant.storage.snapshot import STATE
+
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="sylveria-bench-")
+    memory_dir = os.path.join(workdir, "assistant", "memory")
+    os.makedirs(memory_dir)
+    for pattern in ("*.json", "*.snap"):
+        for path in glob.glob(os.path.join(REPO_ROOT, "assistant", "memory", pattern)):
+            shutil.copy(path, memory_dir)
+    STATE.close()  # the snapshot path resolves again on first use, inside the workspace
+    os.chdir(workdir)
+    try:
+        yield workdir
+    finally:
+        STATE.close()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def build_assistant(llm, latency_s, fake_server=None):
+    from assistant import core
+    from assistant.ai.backends import ollama
+    from assistant.io.null_audio import NullAudioManager
+    from assistant.plugins.plugin_manager import PluginManager
+    from benchmarks.fakes import RecordingSink, StubAiWrapper
+
+    def no_plugins(manager):
+        manager.assistant.plugins = {}
+        return {}
+
+    def frontend(assistant):
+        return NullAudioManager(assistant), RecordingSink(assistant)
+
+    if llm == "fake-ollama":
+        # Read at call time, so it stays pointed at the fake for the whole run
+        ollama.OLLAMA_URL = fake_server.url
+
+    with ExitStack() as stack:
+        stack.enter_context(patched(PluginManager, "load_plugins", no_plugins))
+        stack.enter_context(patched(core.PersonalAssistant, "_create_frontend", frontend))
+        if llm == "stub":
+            stack.enter_context(patched(core, "AiWrapper", lambda a: StubAiWrapper(a, latency_s=latency_s)))
+        return core.PersonalAssistant(headless=True)
+
+
+def persisted_bytes():
+    from assistant.utils.metrics import REGISTRY
+    return REGISTRY.total("persist_bytes_total")
+
+
+def run_latency_pass(assistant, corpus, turns):
+    from assistant.storage.snapshot import STATE
+
+    latencies = []
+    bytes_before = persisted_bytes()
+    started = time.perf_counter()
+    for i in range(turns):
+        t0 = time.perf_counter()
+        assistant.command_processor.process(corpus[i % len(corpus)], source="bench")
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    STATE.flush()  # count the debounced state writes this pass caused
+    return latencies, elapsed, persisted_bytes() - bytes_before
+
+
+def run_allocation_pass(assistant, corpus, turns):
+    peaks = []
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        for i in range(turns):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            assistant.command_processor.process(corpus[i % len(corpus)], source="bench")
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+        end_current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peaks, (end_current - start_current) / 1024
+
+
+def run(args):
+    corpus = load_corpus(args.corpus)
+    random.seed(args.seed)
+
+    fake_server = None
+    if args.llm == "fake-ollama":
+        from benchmarks.fakes import FakeOllamaServer
+        fake_server = FakeOllamaServer(latency_s=args.latency_ms / 1000).start()
+
+    try:
+        with scratch_workspace():
+            assistant = build_assistant(args.llm, args.latency_ms / 1000, fake_server)
+            for i in range(args.warmup):
+                assistant.command_processor.process(corpus[i % len(corpus)], source="bench")
+
+            latencies, elapsed, disk_bytes = run_latency_pass(assistant, corpus, args.turns)
+            alloc_peaks, retained_kb = run_allocation_pass(assistant, corpus, min(args.turns, args.alloc_turns))
+    finally:
+        if fake_server:
+            fake_server.stop()
+
+    return {
+        "scenario": scenario_name(args),
+        "turns": args.turns,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+        "turns_per_s": round(args.turns / elapsed, 2),
+        "alloc_peak_kb": round(percentile(alloc_peaks, 50), 1),
+        "alloc_peak_kb_p95": round(percentile(alloc_peaks, 95), 1),
+        "retained_kb": round(retained_kb, 1),
+        "disk_bytes_per_turn": round(disk_bytes / args.turns, 1),
+    }
+
+
+def scenario_name(args):
+    return f"{args.llm}-{args.latency_ms:g}ms"
+
+
+def compare(result, baseline):
+    regressions = []
+    for metric, tolerance in TOLERANCES.items():
+        old, new = baseline.get(metric), result.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (tolerance >= 0 and change > tolerance) or (tolerance < 0 and change < tolerance):
+            regressions.append(f"{metric}: {old} -> {new} ({change:+.0%}, allowed {tolerance:+.0%})")
+    return regressions
+
+
+def load_baselines(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CommandProcessor.process with a mock LLM.")
+    parser.add_argument("--llm", choices=["stub", "fake-ollama"], default="stub")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated LLM latency per call")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--alloc-turns", type=int, default=50, help="Turns replayed under tracemalloc")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--corpus", default=CORPUS_FILE)
+    parser.add_argument("--baseline-file", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON only")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Scenario {result['scenario']} — {result['turns']} turns")
+        print(f"  latency   p50 {result['p50_ms']:.2f} ms   p95 {result['p95_ms']:.2f} ms   p99 {result['p99_ms']:.2f} ms   max {result['max_ms']:.2f} ms")
+        print(f"  throughput {result['turns_per_s']:.1f} turns/s")
+        print(f"  allocations peak/turn p50 {result['alloc_peak_kb']:.1f} KB   p95 {result['alloc_peak_kb_p95']:.1f} KB   retained {result['retained_kb']:.1f} KB")
+        print(f"  disk written {result['disk_bytes_per_turn']:.0f} bytes/turn")
+
+    baselines = load_baselines(args.baseline_file)
+    if args.save_baseline:
+        baselines[result["scenario"]] = result
+        with open(args.baseline_file, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"[Bench] Baseline saved for {result['scenario']} in {args.baseline_file}")
+        return 0
+
+    baseline = baselines.get(result["scenario"])
+    if not baseline:
+        print(f"[Bench] No baseline for {result['scenario']}; run with --save-baseline to record one.")
+        return 0
+
+    regressions = compare(result, baseline)
+    if regressions:
+        print("[Bench] Regressions against baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("[Bench] Within baseline tolerances.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
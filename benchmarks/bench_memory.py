@@ -0,0 +1,130 @@
+"""Resident memory of the history and memory stores: plain dicts vs slotted records.
+
+Two measurements, both with tracemalloc:
+
+1. Per-record cost. The same entries are loaded from JSON the way the old
+   code kept them (a list of dicts) and as the new records. Text strings
+   are created before measuring, so only the container overhead counts.
+2. A long session. N chat turns are appended to AiWrapper-style history,
+   first to the old unbounded list of dicts and then to the bounded deque
+   of Turn records.
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --records 20000 --turns 50000
+"""
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+
+from assistant.memory.records import (
+    EmotionalMemoryRecord, GrowthEvent, HISTORY_LIMIT, Turn, bounded, load_records
+)
+
+FEELINGS = ["warm", "joyful", "grateful", "hopeful", "loved", "amused"]
+TAGS = ["emotional", "affection", "milestone", "grateful", "hopeful", "loved"]
+
+
+def measure(build):
+    """Bytes still allocated after build() returns, keeping its result alive."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+
+def rebuild(value):
+    if isinstance(value, dict):
+        return {key: rebuild(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [rebuild(item) for item in value]
+    return value
+
+
+def make_texts(count, seed):
+    rng = random.Random(seed)
+    words = "the silver dragon watched the stars and spoke softly to Fafnir about old storms".split()
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(6, 30))) for _ in range(count)]
+
+
+def sample_entries(count, texts, seed):
+    rng = random.Random(seed)
+    history = [{"role": rng.choice(["user", "sylveria", "model"]), "parts": [texts[i]]} for i in range(count)]
+    memories = [{
+        "time": f"2025-06-{1 + i % 28:02d} 22:{i % 60:02d}",
+        "user_input": texts[i],
+        "sylveria_response": texts[-1 - i],
+        "feeling": rng.choice(FEELINGS),
+    } for i in range(count)]
+    growth = [{
+        "date": f"2025-05-{1 + i % 28:02d}",
+        "timestamp": f"2025-05-{1 + i % 28:02d}T12:{i % 60:02d}:32.923575",
+        "event": texts[i],
+        "tags": rng.sample(TAGS, 2),
+        "emotion": rng.choice(FEELINGS),
+    } for i in range(count)]
+    return {"history": history, "emotional memories": memories, "growth events": growth}
+
+
+def per_record_table(count, seed):
+    texts = make_texts(count, seed)
+    samples = sample_entries(count, texts, seed)
+    record_types = {"history": Turn, "emotional memories": EmotionalMemoryRecord, "growth events": GrowthEvent}
+
+    rows = []
+    for name, entries in samples.items():
+        parsed_dicts = json.loads(json.dumps(entries))
+        # Rebuild the dicts and lists but share the parsed strings, so both sides exclude the text
+        dict_bytes, _ = measure(lambda: [rebuild(item) for item in parsed_dicts])
+        record_bytes, _ = measure(lambda: load_records(record_types[name], parsed_dicts))
+        rows.append((name, dict_bytes / count, record_bytes / count))
+    return rows
+
+
+def long_session(turns, seed):
+    texts = make_texts(min(turns, 5000), seed)
+
+    def legacy():
+        history = []
+        for i in range(turns):
+            history.append({"role": "user" if i % 2 == 0 else "sylveria", "parts": [texts[i % len(texts)]]})
+        return history
+
+    def compact():
+        history = bounded([], HISTORY_LIMIT)
+        for i in range(turns):
+            history.append(Turn("user" if i % 2 == 0 else "sylveria", texts[i % len(texts)]))
+        return history
+
+    legacy_bytes, _ = measure(legacy)
+    compact_bytes, _ = measure(compact)
+    return legacy_bytes, compact_bytes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory use of dict and slotted record stores.")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=20000, help="Turns appended in the long-session run")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"Per-record overhead ({args.records} records, text excluded)")
+    print(f"  {'store':<20} {'dicts':>10} {'records':>10} {'saved':>7}")
+    for name, dict_bytes, record_bytes in per_record_table(args.records, args.seed):
+        saved = 1 - record_bytes / dict_bytes if dict_bytes else 0
+        print(f"  {name:<20} {dict_bytes:>8.0f} B {record_bytes:>8.0f} B {saved:>6.0%}")
+
+    legacy_bytes, compact_bytes = long_session(args.turns, args.seed)
+    print(f"\nLong session: {args.turns} turns appended to AiWrapper.history")
+    print(f"  unbounded list of dicts  {legacy_bytes / 1024:>10.1f} KB")
+    print(f"  deque(maxlen={HISTORY_LIMIT}) of Turn {compact_bytes / 1024:>8.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Replays a bursty mixed workload against LLMScheduler with a simulated slow backend.
+
+The same arrivals run twice: once with everything in one FIFO queue, which
+is how calls reached Ollama before the scheduler, and once through the
+scheduler's priority classes, quotas, deadlines and shedding. Per class it
+reports how many calls ran, were shed or expired, and their end-to-end
+latency.
+
+    python -m benchmarks.bench_scheduler
+    python -m benchmarks.bench_scheduler --service-s 3 --scale 0.02
+
+All times are given in "real" seconds and multiplied by --scale, so a
+60 second scenario with 2 second generations runs in about 3 seconds.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from assistant.ai.llm_scheduler import (
+    CLASS_NAMES, DEADLINES, QUOTAS, LLMScheduler, Shed, priority_of
+)
+
+
+class SimulatedBackend:
+    """Stands in for the model: one call takes service_s (+/- jitter) of wall time."""
+
+    def __init__(self, service_s, jitter=0.3, seed=0):
+        self.service_s = service_s
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def chat(self):
+        with self._lock:
+            self.calls += 1
+            duration = self.service_s * (1 + self.random.uniform(-self.jitter, self.jitter))
+        time.sleep(duration)
+        return "ok"
+
+
+def build_workload(duration_s, seed):
+    """Arrival times (seconds) and sources for a session with a Twitch raid and a GUI/Discord rush."""
+    rng = random.Random(seed)
+    events = []
+
+    t = 0.0
+    while t < duration_s:
+        t += rng.expovariate(1 / 6.0)
+        events.append((t, rng.choice(["gui", "voice", "discord"])))
+        events.append((t + 0.5, "journal"))
+        if rng.random() < 0.25:
+            events.append((t + 0.5, "follow_up"))
+
+    for i in range(15):                       # raid: 15 mentions in 5s
+        events.append((20 + i / 3, "twitch"))
+    for i in range(8):                        # everyone talks at once
+        events.append((40 + i / 4, rng.choice(["gui", "discord", "http:bench"])))
+    for t in range(5, int(duration_s), 15):   # YouTube reactions
+        events.append((t, "youtube"))
+
+    return sorted((t, source) for t, source in events if t < duration_s)
+
+
+def replay(scheduler, backend, events, scale, fifo=False):
+    results = []
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def call(offset, source):
+        delay = started + offset * scale - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.monotonic()
+        try:
+            # FIFO mode files every call under one interactive source: same class, no quota
+            scheduler.run("assistant" if fifo else source, backend.chat)
+            outcome = "ran"
+        except Shed as e:
+            outcome = "expired" if "deadline" in e.reason else "shed"
+        with lock:
+            results.append((source, outcome, (time.monotonic() - t0) / scale))
+
+    threads = [threading.Thread(target=call, args=event, daemon=True) for event in events]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * q / 100)))]
+
+
+def summarise(title, results):
+    print(title)
+    print(f"  {'class':<12} {'calls':>5} {'ran':>5} {'shed':>5} {'expired':>7} {'p50 s':>7} {'p95 s':>7}")
+    for priority, name in CLASS_NAMES.items():
+        rows = [r for r in results if priority_of(r[0]) == priority]
+        ran = [latency for _, outcome, latency in rows if outcome == "ran"]
+        shed = sum(1 for _, outcome, _ in rows if outcome == "shed")
+        expired = sum(1 for _, outcome, _ in rows if outcome == "expired")
+        print(f"  {name:<12} {len(rows):>5} {len(ran):>5} {shed:>5} {expired:>7} {percentile(ran, 50):>7.1f} {percentile(ran, 95):>7.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate LLM scheduling under bursty load.")
+    parser.add_argument("--duration-s", type=float, default=60.0, help="Scenario length in simulated seconds")
+    parser.add_argument("--service-s", type=float, default=2.0, help="Simulated seconds per generation")
+    parser.add_argument("--scale", type=float, default=0.05, help="Wall seconds per simulated second")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    events = build_workload(args.duration_s, args.seed)
+    scaled_deadlines = {p: d * args.scale for p, d in DEADLINES.items()}
+    scaled_quotas = {s: (rate / args.scale, burst) for s, (rate, burst) in QUOTAS.items()}
+    print(f"{len(events)} calls over {args.duration_s:g}s, {args.service_s:g}s per generation, "
+          f"{args.concurrency} slot(s)\n")
+
+    fifo = LLMScheduler(args.concurrency, deadlines={p: 1e9 for p in DEADLINES},
+                        queue_limits={p: 1 << 30 for p in DEADLINES}, quotas={})
+    backend = SimulatedBackend(args.service_s * args.scale, seed=args.seed)
+    summarise("FIFO (no scheduler)", replay(fifo, backend, events, args.scale, fifo=True))
+    fifo_calls = backend.calls
+    print()
+
+    scheduled = LLMScheduler(args.concurrency, deadlines=scaled_deadlines, quotas=scaled_quotas)
+    backend = SimulatedBackend(args.service_s * args.scale, seed=args.seed)
+    summarise("Scheduled", replay(scheduled, backend, events, args.scale))
+    print(f"\nBackend generations: FIFO {fifo_calls}, scheduled {backend.calls}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Latency and accuracy of each speech-to-text engine on recorded clips.
+
+The corpus is a folder of 16 kHz mono WAV files, each with a .txt file of
+the same name holding what was said:
+
+    benchmarks/stt_corpus/lights_on.wav
+    benchmarks/stt_corpus/lights_on.txt     "hey sylveria turn the lights on"
+
+Every engine is started the way the assistant starts it: in the warm
+worker process, unless --in-process is given. Each clip is then
+transcribed in turn. The report shows load time, per-clip latency
+p50/p95, real-time factor (processing time / audio length) and word
+error rate. Of the engines whose p95 meets --target-ms and whose WER
+meets --max-wer, the recommendation is the one with the lowest measured
+real-time factor, i.e. the least CPU per second of audio. Set it with
+SYLVERIA_STT_ENGINE.
+
+    python -m benchmarks.bench_stt --corpus benchmarks/stt_corpus
+    python -m benchmarks.bench_stt --engines whisper-base.en,faster-whisper-base.en-int8 --target-ms 800
+
+Exits with status 1 when no engine meets both targets.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from assistant.io.stt import ENGINES, SAMPLE_RATE, SpeechToText
+from assistant.utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+sf = lazy_import("soundfile")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, "stt_corpus")
+DEFAULT_ENGINES = "whisper-tiny.en,whisper-base.en,whisper-base.en-int8,faster-whisper-base.en-int8"
+
+
+def load_corpus(folder):
+    """[(name, int16 audio, reference text)] for every WAV with a transcript next to it."""
+    clips = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.wav"))):
+        transcript = path[:-4] + ".txt"
+        if not os.path.exists(transcript):
+            print(f"[Bench] Skipping {os.path.basename(path)}: no transcript")
+            continue
+        audio, rate = sf.read(path, dtype="float32")
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if rate != SAMPLE_RATE:
+            positions = np.arange(0, len(audio), rate / SAMPLE_RATE)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+        with open(transcript, "r", encoding="utf-8") as f:
+            clips.append((os.path.basename(path), pcm, f.read()))
+    return clips
+
+
+def words(text):
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance (substitutions + insertions + deletions)."""
+    ref, hyp = words(reference), words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (r != h))
+    return row[-1], len(ref)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def bench_engine(name, clips, in_process, verbose):
+    stt = SpeechToText(name, in_process=in_process)
+    started = time.perf_counter()
+    try:
+        stt.start()
+    except Exception as e:
+        print(f"  {name:<30} skipped: {e}")
+        return None
+    load_s = time.perf_counter() - started
+
+    latencies, errors, total_words, audio_s, busy_s = [], 0, 0, 0.0, 0.0
+    try:
+        for clip_name, pcm, reference in clips:
+            t = time.perf_counter()
+            text = stt.transcribe(pcm, mode="command")
+            elapsed = time.perf_counter() - t
+            wrong, count = word_errors(reference, text)
+            latencies.append(elapsed * 1000)
+            errors += wrong
+            total_words += count
+            audio_s += len(pcm) / SAMPLE_RATE
+            busy_s += elapsed
+            if verbose:
+                print(f"    {clip_name}: {elapsed * 1000:.0f} ms, {wrong}/{count} wrong — {text!r}")
+    finally:
+        stt.stop()
+
+    return {
+        "engine": name,
+        "load_s": load_s,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "rtf": busy_s / audio_s if audio_s else 0.0,
+        "wer": errors / total_words if total_words else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare STT engines on a recorded WAV corpus.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Folder of .wav clips with .txt transcripts")
+    parser.add_argument("--engines", default=DEFAULT_ENGINES, help=f"Comma list from: {', '.join(ENGINES)}")
+    parser.add_argument("--target-ms", type=float, default=1500.0, help="p95 latency an engine must meet")
+    parser.add_argument("--max-wer", type=float, default=0.20, help="Highest acceptable word error rate")
+    parser.add_argument("--in-process", action="store_true", help="Skip the worker process")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every transcript")
+    args = parser.parse_args(argv)
+
+    clips = load_corpus(args.corpus)
+    if not clips:
+        print(f"[Bench] No clips in {args.corpus}; add WAV files with matching .txt transcripts.")
+        return 1
+    total_s = sum(len(pcm) for _, pcm, _ in clips) / SAMPLE_RATE
+    print(f"{len(clips)} clips, {total_s:.1f}s of audio; target p95 {args.target_ms:g} ms, WER {args.max_wer:.0%}\n")
+
+    print(f"  {'engine':<30} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} {'RTF':>6} {'WER':>6}")
+    results = []
+    for name in [e.strip() for e in args.engines.split(",") if e.strip()]:
+        if name not in ENGINES:
+            print(f"  {name:<30} unknown engine")
+            continue
+        result = bench_engine(name, clips, args.in_process, args.verbose)
+        if result:
+            results.append(result)
+            print(f"  {name:<30} {result['load_s']:>7.1f} {result['p50_ms']:>8.0f} {result['p95_ms']:>8.0f} "
+                  f"{result['rtf']:>6.2f} {result['wer']:>6.1%}")
+
+    passing = [r for r in results if r["p95_ms"] <= args.target_ms and r["wer"] <= args.max_wer]
+    if not passing:
+        print("\nNo engine meets both targets.")
+        return 1
+    best = min(passing, key=lambda r: (r["rtf"], r["p95_ms"]))
+    print(f"\nLowest-RTF engine meeting the targets: {best['engine']}")
+    print(f"  SYLVERIA_STT_ENGINE={best['engine']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
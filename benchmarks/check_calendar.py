@@ -0,0 +1,114 @@
+"""Drives CalendarMirror through FakeCalendarService, with no network.
+
+Checks a paged full sync, incremental syncs with the sync token
+(additions, edits and deletions), the full re-sync after a 410, the
+bounded sync window, and reads answered from the mirror alone.
+
+    python -m benchmarks.check_calendar
+
+Runs in a scratch workspace, so the real state snapshot is untouched.
+Exits with status 1 when a check fails.
+"""
+import datetime
+import sys
+
+from benchmarks.bench_hot_path import scratch_workspace
+from benchmarks.fakes import FakeCalendarService
+
+PAGE_SIZE = 3   # small pages, so a full sync of a handful of events pages
+
+
+def titles(events):
+    return [event.get("summary") for event in events]
+
+
+def run_checks():
+    from assistant.plugins import google_calendar
+
+    google_calendar.SYNC_PAGE_SIZE = PAGE_SIZE
+    now = datetime.datetime.now(datetime.timezone.utc)
+    results = []
+
+    def hours(n):
+        return now + datetime.timedelta(hours=n)
+
+    def check(name, passed, detail=""):
+        results.append((name, bool(passed), detail))
+
+    fake = FakeCalendarService()
+    fake.add("Conference", hours(-50), hours=72)   # started two days ago, still running
+    fake.add("Dentist", hours(3))
+    fake.add("Standup", hours(5), hours=0.25)
+    fake.add("Lunch with Ana", hours(20))
+    fake.add("Gym", hours(30))
+    fake.add("Old meeting", hours(-60))           # ended more than a day ago
+    fake.add("Far trip", hours(24 * 60))          # past the sync window
+    mirror = google_calendar.CalendarMirror(service_factory=lambda: fake, section="calendar_check")
+
+    changed = mirror.sync()
+    check("full sync pages through everything in the window", changed == 5 and fake.list_calls == 2,
+          f"{changed} events in {fake.list_calls} pages")
+    check("ended and far-future events are not mirrored",
+          not {"Old meeting", "Far trip"} & set(titles(mirror.events.values())))
+
+    calls = fake.list_calls
+    today = titles(mirror.upcoming(days_ahead=1))
+    check("upcoming includes the running multi-day event", today == ["Conference", "Dentist", "Standup", "Lunch with Ana"],
+          ", ".join(today))
+    found = mirror.find_by_title("dentist")
+    check("title lookup", found is not None and found["summary"] == "Dentist")
+    check("reads come from the mirror", fake.list_calls == calls, f"{fake.list_calls - calls} list calls")
+
+    dentist = found["id"]
+    gym = mirror.find_by_title("gym", days_ahead=2)["id"]
+    fake.delete(dentist)
+    fake.add("Haircut", hours(8))
+    fake.events().update(calendarId="primary", eventId=gym, body=dict(fake.store[gym], summary="Gym with Rui")).execute()
+    token = mirror.sync_token
+    calls = fake.list_calls
+    changed = mirror.sync()
+    mirrored = set(titles(mirror.events.values()))
+    check("incremental sync fetches only the changes", changed == 3 and fake.list_calls == calls + 1,
+          f"{changed} changes in {fake.list_calls - calls} pages")
+    check("incremental sync applies adds, edits and deletions",
+          "Haircut" in mirrored and "Gym with Rui" in mirrored and "Gym" not in mirrored and dentist not in mirror.events)
+    check("sync token advances", mirror.sync_token != token, mirror.sync_token)
+
+    fake.expire_sync_tokens()
+    fake.add("Dinner", hours(10))
+    calls = fake.list_calls
+    changed = mirror.sync()
+    live = {event["summary"] for event in fake.store.values()
+            if event.get("status") != "cancelled" and event["summary"] not in ("Old meeting", "Far trip")}
+    check("an expired token (410) falls back to a full sync", fake.list_calls > calls + 1 and set(
+        titles(mirror.events.values())) == live, f"{changed} events after the reset")
+
+    mirror.window_end = (now + datetime.timedelta(days=google_calendar.RESYNC_AHEAD_DAYS - 1)).timestamp()
+    mirror.sync()
+    check("the window rolls forward with a full sync",
+          mirror.window_end - now.timestamp() > (google_calendar.SYNC_WINDOW_DAYS - 1) * 86400)
+
+    created = fake.events().insert(calendarId="primary", body={
+        "summary": "Call mum",
+        "start": {"dateTime": hours(2).replace(tzinfo=None).isoformat(), "timeZone": "UTC"},
+        "end": {"dateTime": hours(3).replace(tzinfo=None).isoformat(), "timeZone": "UTC"},
+    }).execute()
+    calls = fake.list_calls
+    mirror.apply(created)
+    check("a created event is readable before the next sync",
+          "Call mum" in titles(mirror.upcoming()) and fake.list_calls == calls)
+    return results
+
+
+def main():
+    with scratch_workspace():
+        results = run_checks()
+    for name, passed, detail in results:
+        print(f"[Check] {'PASS' if passed else 'FAIL'} {name}" + (f" — {detail}" if detail else ""))
+    failed = [name for name, passed, _ in results if not passed]
+    print(f"[Check] {len(results) - len(failed)}/{len(results)} calendar checks passed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
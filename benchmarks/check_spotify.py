@@ -0,0 +1,108 @@
+"""Drives SpotifyHelper through FakeSpotifyClient, with no network.
+
+Checks lazy client creation, the track and device caches, the retry
+after a short 429, the report for a long one, picking a device again
+after a 404, errors that must reach the invoker, and that queued
+playback commands run in the order they were given.
+
+    python -m benchmarks.check_spotify
+
+Runs in a scratch workspace, so the real track cache is untouched.
+Exits with status 1 when a check fails.
+"""
+import sys
+import time
+
+from benchmarks.bench_hot_path import scratch_workspace
+from benchmarks.fakes import FakeSpotifyClient, FakeSpotifyError
+
+
+def playback_calls(fake, since=0):
+    return [(name, kwargs.get("uris")) for name, kwargs in fake.calls[since:] if name.endswith("_playback")]
+
+
+def run_checks():
+    from assistant.plugins import spotify
+
+    results = []
+
+    def check(name, passed, detail=""):
+        results.append((name, bool(passed), detail))
+
+    fake = FakeSpotifyClient(tracks={
+        "lofi": ("spotify:track:1", "Lofi Beats", "Chill Artist"),
+        "jazz": ("spotify:track:2", "Blue Train", "John Coltrane"),
+    })
+    built = []
+    helper = spotify.SpotifyHelper(client_factory=lambda: built.append(1) or fake)
+    check("no client before the first command", not built)
+
+    reply = helper.play_song("play some lofi")
+    check("play", reply == "Playing: Lofi Beats by Chill Artist" and fake.playing == "spotify:track:1", reply)
+    check("client built once", len(built) == 1)
+
+    mark = len(fake.calls)
+    helper.play_song("play some lofi")
+    names = [name for name, _ in fake.calls[mark:]]
+    check("track and device come from the cache", names == ["start_playback"], ", ".join(names))
+
+    fake.rate_limit(1, retry_after=0.2)
+    mark = len(fake.calls)
+    started = time.perf_counter()
+    reply = helper.pause()
+    waited = time.perf_counter() - started
+    check("short 429 is retried after Retry-After",
+          reply == "⏸️ Paused Spotify." and len(playback_calls(fake, mark)) == 2 and waited >= 0.2,
+          f"{reply} after {waited:.2f}s")
+
+    fake.rate_limit(1, retry_after=30)
+    started = time.perf_counter()
+    reply = helper.resume()
+    waited = time.perf_counter() - started
+    check("long 429 is reported, not waited out",
+          "try again in 30 seconds" in reply and waited < spotify.MAX_RETRY_WAIT_S, f"{waited:.2f}s")
+
+    fake.drop_device()
+    mark = len(fake.calls)
+    reply = helper.resume()
+    names = [name for name, _ in fake.calls[mark:]]
+    check("a vanished device is looked up again",
+          reply == "▶️ Resumed Spotify." and names == ["start_playback", "devices", "start_playback"], ", ".join(names))
+
+    fake.fail_playback(403)
+    try:
+        helper.pause()
+        check("other playback errors reach the invoker", False, "no exception")
+    except FakeSpotifyError as e:
+        check("other playback errors reach the invoker", e.http_status == 403, str(e))
+
+    mark = len(fake.calls)
+    order = [
+        ("start_playback", {"uris": ["spotify:track:2"]}),
+        ("pause_playback", {}),
+        ("start_playback", {}),
+        ("start_playback", {"uris": ["spotify:track:1"]}),
+    ]
+    for method, kwargs in order:
+        helper._enqueue(method, **kwargs)
+    helper.wait_idle()
+    ran = playback_calls(fake, mark)
+    expected = [(method, kwargs.get("uris")) for method, kwargs in order]
+    check("queued commands run in order", ran == expected, " -> ".join(name for name, _ in ran))
+
+    helper.close()
+    return results
+
+
+def main():
+    with scratch_workspace():
+        results = run_checks()
+    for name, passed, detail in results:
+        print(f"[Check] {'PASS' if passed else 'FAIL'} {name}" + (f" — {detail}" if detail else ""))
+    failed = [name for name, passed, _ in results if not passed]
+    print(f"[Check] {len(results) - len(failed)}/{len(results)} Spotify checks passed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
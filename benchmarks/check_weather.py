@@ -0,0 +1,86 @@
+"""Drives WeatherFetcher through FakeWeatherServer, with no network.
+
+Checks geolocation, cache hits, stale-while-revalidate and the failure
+fallbacks (last good report, then the apology line).
+
+    python -m benchmarks.check_weather
+
+Runs in a scratch workspace, so the real weather cache is untouched.
+Exits with status 1 when a check fails.
+"""
+import sys
+import time
+
+from benchmarks.bench_hot_path import scratch_workspace
+from benchmarks.fakes import FakeWeatherServer
+
+
+def wait_for(predicate, timeout_s=3.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def age(cache, key, seconds):
+    """Backdates a cache entry, as if it had been stored seconds ago."""
+    cache.put(key, cache.peek(key), stored_at=time.time() - seconds)
+
+
+def run_checks(fake):
+    from assistant.plugins import weather
+    from assistant.utils.cache import normalize_key
+
+    weather.WEATHER_URL, weather.GEO_URL = fake.weather_url, fake.geo_url
+    results = []
+
+    def check(name, passed, detail=""):
+        results.append((name, bool(passed), detail))
+
+    fetcher = weather.WeatherFetcher()  # geolocates on a background thread
+    check("geolocation", wait_for(lambda: fetcher.default_location == "Lisbon,PT"), fetcher.default_location)
+    key = normalize_key(fetcher.default_location)
+
+    first = fetcher.get_weather()
+    sent = len(fake.requests)
+    second = fetcher.get_weather()
+    check("fresh report", "+18°C" in first, first)
+    check("cache hit", second == first and len(fake.requests) == sent, f"{len(fake.requests) - sent} new requests")
+
+    fake.temperature = "+12°C"
+    age(fetcher.cache, key, weather.WEATHER_TTL_S + 1)
+    fake.latency_s = 0.3
+    started = time.perf_counter()
+    stale = fetcher.get_weather()
+    waited_ms = (time.perf_counter() - started) * 1000
+    check("stale report served at once", stale == first and waited_ms < 100, f"{waited_ms:.1f} ms")
+    check("background refresh", wait_for(lambda: "+12°C" in (fetcher.cache.peek(key) or {}).get("text", "")))
+    fake.latency_s = 0.0
+
+    age(fetcher.cache, key, weather.WEATHER_TTL_S + weather.WEATHER_STALE_S + 1)
+    fake.fail_next(503)
+    kept = fetcher.get_weather()
+    check("failure serves the last good report", "+12°C" in kept, kept)
+
+    fake.fail_next(503)
+    apology = fetcher.get_weather("Porto")
+    check("failure without a report apologises", apology.startswith("Sorry"), apology)
+
+    fetcher.session.close()
+    return results
+
+
+def main():
+    with scratch_workspace(), FakeWeatherServer() as fake:
+        results = run_checks(fake)
+    for name, passed, detail in results:
+        print(f"[Check] {'PASS' if passed else 'FAIL'} {name}" + (f" — {detail}" if detail else ""))
+    failed = [name for name, passed, _ in results if not passed]
+    print(f"[Check] {len(results) - len(failed)}/{len(results)} weather checks passed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+"""Stand-ins used by the benchmarks: a fake Ollama server, fake Calendar and Spotify APIs, a stub AiWrapper and a silent sink."""
+import datetime
+import itertools
+import json
+import threading
+import time
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from assistant.ui.output_sink import OutputSink
+
+CANNED_REPLY = "The stars are quiet tonight, Fafnir. I am here, as always."
+
+
+class RecordingSink(OutputSink):
+    """OutputSink that keeps responses in memory instead of drawing or printing them."""
+
+    def __init__(self, assistant=None):
+        self.assistant = assistant
+        self.responses = []
+
+    def add_response(self, speaker, text):
+        if text and text.strip():
+            self.responses.append((speaker, text.strip()))
+
+    def notify(self, text):
+        pass
+
+    def run(self):
+        pass
+
+
+class StubAiWrapper:
+    """In-process replacement for AiWrapper: no network, fixed latency, canned reply."""
+
+    def __init__(self, assistant, reply=CANNED_REPLY, latency_s=0.0):
+        self.assistant = assistant
+        self.reply = reply
+        self.latency_s = latency_s
+        self.history = []
+        self.calls = 0
+
+    def add_turn(self, role, text):
+        self.history.append((role, text))
+        del self.history[:-100]
+
+    def _clean_response(self, text):
+        if not text:
+            return ""
+        text = text.strip()
+        words = text.split()
+        return " ".join(words[:60]) + "..." if len(words) > 60 else text
+
+    def _save_history(self):
+        pass
+
+    def generate(self, user_input, on_token=None, **kwargs):
+        return self.generate_with_prompts("", user_input, on_token=on_token)
+
+    def generate_with_prompts(self, system_prompt, user_prompt, on_token=None, **kwargs):
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        if on_token:
+            for word in self.reply.split(" "):
+                on_token(word + " ")
+        return self.reply
+
+
+class _OllamaHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOllama/1.0"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        fake = self.server.fake
+        fake.requests += 1
+        fake.last_request = request
+
+        if fake.latency_s:
+            time.sleep(fake.latency_s)
+
+        reply = fake.reply
+        tokens = reply.split(" ")
+        stats = {
+            "total_duration": int(fake.latency_s * 1e9) + 1_000_000,
+            "load_duration": 100_000,
+            "prompt_eval_count": sum(len(m.get("content", "").split()) for m in request.get("messages", [])),
+            "prompt_eval_duration": 500_000,
+            "eval_count": len(tokens),
+            "eval_duration": max(1, int(fake.latency_s * 1e9)),
+        }
+        model = request.get("model", "sylveria")
+
+        if request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for i, token in enumerate(tokens):
+                chunk = {"model": model, "message": {"role": "assistant", "content": token + (" " if i < len(tokens) - 1 else "")}, "done": False}
+                self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            final = dict(stats, model=model, message={"role": "assistant", "content": ""}, done=True)
+            self.wfile.write(json.dumps(final).encode() + b"\n")
+            return
+
+        body = json.dumps(dict(stats, model=model, message={"role": "assistant", "content": reply}, done=True)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeOllamaServer:
+    """Local HTTP server speaking enough of Ollama's /api/chat (streaming and not) for benchmarks.
+
+        with FakeOllamaServer(latency_s=0.05) as fake:
+            assistant.ai.backends.ollama.OLLAMA_URL = fake.url
+    """
+
+    def __init__(self, reply=CANNED_REPLY, latency_s=0.0, host="127.0.0.1", port=0):
+        self.reply = reply
+        self.latency_s = latency_s
+        self.requests = 0
+        self.last_request = None
+        self._server = ThreadingHTTPServer((host, port), _OllamaHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/chat"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _WeatherHandler(BaseHTTPRequestHandler):
+    server_version = "FakeWeather/1.0"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        fake = self.server.fake
+        path, _, query = self.path.partition("?")
+        fake.requests.append(self.path)
+        if fake.latency_s:
+            time.sleep(fake.latency_s)
+        if fake.fail_status:
+            status, fake.fail_status = fake.fail_status, None
+            self._send(status, "Unknown location; please try ~1.0,2.0", "text/plain; charset=utf-8")
+            return
+        if path == "/geo":
+            self._send(200, json.dumps({"city": fake.city, "country": fake.country}), "application/json")
+            return
+        location = unquote(path.lstrip("/")) or fake.city
+        self._send(200, f"{location}: ☁️ {fake.temperature}|{fake.condition}", "text/plain; charset=utf-8")
+
+
+class FakeWeatherServer:
+    """Local stand-in for wttr.in (GET /<location>?format=...) and ipinfo.io (GET /geo).
+
+        with FakeWeatherServer(condition="Light rain") as fake:
+            weather.WEATHER_URL, weather.GEO_URL = fake.weather_url, fake.geo_url
+
+    Every request path is appended to .requests. fail_next(status) makes
+    the next request answer with that status.
+    """
+
+    def __init__(self, city="Lisbon", country="PT", condition="Partly cloudy", temperature="+18°C",
+                 latency_s=0.0, host="127.0.0.1", port=0):
+        self.city = city
+        self.country = country
+        self.condition = condition
+        self.temperature = temperature
+        self.latency_s = latency_s
+        self.fail_status = None
+        self.requests = []
+        self._server = ThreadingHTTPServer((host, port), _WeatherHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def weather_url(self):
+        return self.base_url
+
+    @property
+    def geo_url(self):
+        return f"{self.base_url}/geo"
+
+    def fail_next(self, status=503):
+        self.fail_status = status
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-weather", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient's HttpError as far as callers look: error.resp.status."""
+
+    def __init__(self, status, message=""):
+        super().__init__(f"HTTP {status} {message}".strip())
+        self.resp = SimpleNamespace(status=status)
+
+
+class _Call:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class _FakeEvents:
+    def __init__(self, fake):
+        self.fake = fake
+
+    def list(self, **params):
+        return _Call(lambda: self.fake._list(**params))
+
+    def insert(self, calendarId, body):
+        return _Call(lambda: self.fake._write(dict(body, id=f"evt{next(self.fake._ids)}")))
+
+    def get(self, calendarId, eventId):
+        return _Call(lambda: dict(self.fake.store[eventId]))
+
+    def update(self, calendarId, eventId, body):
+        return _Call(lambda: self.fake._write(dict(body, id=eventId)))
+
+    def delete(self, calendarId, eventId):
+        return _Call(lambda: self.fake.delete(eventId))
+
+
+def _utc(value):
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+class FakeCalendarService:
+    """In-memory Calendar v3 client: events().list/insert/get/update/delete(...).execute().
+
+    Supports paging and sync tokens. Each write bumps a version. A sync
+    token stands for "changes after version N", so an incremental list
+    returns only events written since, with deletions as cancelled
+    tombstones. expire_sync_tokens() makes the next incremental list
+    fail with 410, like Google does.
+
+        fake = FakeCalendarService()
+        fake.add("Dentist", datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=3))
+        mirror = CalendarMirror(service_factory=lambda: fake, section="calendar_test")
+    """
+
+    def __init__(self):
+        self.store = {}             # id -> event, including cancelled tombstones
+        self.versions = {}          # id -> version of its last write
+        self.version = 0
+        self.list_calls = 0
+        self.min_token_version = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def events(self):
+        return _FakeEvents(self)
+
+    def add(self, summary, start, hours=1):
+        return self._write({
+            "id": f"evt{next(self._ids)}",
+            "summary": summary,
+            "start": {"dateTime": start.replace(tzinfo=None).isoformat(), "timeZone": "UTC"},
+            "end": {"dateTime": (start + datetime.timedelta(hours=hours)).replace(tzinfo=None).isoformat(), "timeZone": "UTC"},
+        })
+
+    def delete(self, event_id):
+        with self._lock:
+            self.version += 1
+            self.store[event_id] = {"id": event_id, "status": "cancelled"}
+            self.versions[event_id] = self.version
+        return {}
+
+    def expire_sync_tokens(self):
+        self.min_token_version = self.version + 1
+
+    def _write(self, event):
+        with self._lock:
+            self.version += 1
+            event = dict(event, status="confirmed", htmlLink=f"https://calendar.invalid/{event['id']}")
+            self.store[event["id"]] = event
+            self.versions[event["id"]] = self.version
+            return dict(event)
+
+    def _list(self, syncToken=None, timeMin=None, timeMax=None, pageToken=None, maxResults=250, **_):
+        self.list_calls += 1
+        with self._lock:
+            if syncToken is not None:
+                since = int(syncToken.split("-", 1)[1])
+                if since < self.min_token_version:
+                    raise FakeHttpError(410, "Sync token is no longer valid")
+                matching = [e for i, e in self.store.items() if self.versions[i] > since]
+            else:
+                # Like Google: timeMin bounds the end time, timeMax the start time
+                floor = _utc(timeMin) if timeMin else datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+                ceiling = _utc(timeMax) if timeMax else datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+                matching = [
+                    e for e in self.store.values()
+                    if e.get("status") != "cancelled"
+                    and _utc(e["end"]["dateTime"]) > floor and _utc(e["start"]["dateTime"]) < ceiling
+                ]
+            offset = int(pageToken or 0)
+            page = {"items": [dict(e) for e in matching[offset:offset + maxResults]]}
+            if offset + maxResults < len(matching):
+                page["nextPageToken"] = str(offset + maxResults)
+            else:
+                page["nextSyncToken"] = f"sync-{self.version}"
+            return page
+
+
+class FakeSpotifyError(Exception):
+    """Carries http_status and headers like spotipy's SpotifyException."""
+
+    def __init__(self, http_status, headers=None):
+        super().__init__(f"HTTP {http_status}")
+        self.http_status = http_status
+        self.headers = headers or {}
+
+
+class FakeSpotifyClient:
+    """In-memory stand-in for spotipy.Spotify covering what SpotifyHelper calls.
+
+    rate_limit(n, retry_after) makes the next n calls fail with 429.
+    drop_device() makes the next playback call fail with 404, as when the
+    cached device was switched off. fail_playback(status) makes the next
+    playback call fail with that status (403 for a free account). Every
+    call is appended to .calls.
+    """
+
+    def __init__(self, tracks=None):
+        self.tracks = tracks or {"lofi": ("spotify:track:1", "Lofi Beats", "Chill Artist")}
+        self.calls = []
+        self.playing = None
+        self.paused = False
+        self._rate_limited = 0
+        self._retry_after = 1
+        self._device_gone = False
+        self._playback_error = None
+
+    def rate_limit(self, calls=1, retry_after=1):
+        self._rate_limited = calls
+        self._retry_after = retry_after
+
+    def drop_device(self):
+        self._device_gone = True
+
+    def fail_playback(self, status=403):
+        self._playback_error = status
+
+    def _check_playback(self):
+        if self._playback_error:
+            status, self._playback_error = self._playback_error, None
+            raise FakeSpotifyError(status)
+
+    def _record(self, name, **kwargs):
+        self.calls.append((name, kwargs))
+        if self._rate_limited:
+            self._rate_limited -= 1
+            raise FakeSpotifyError(429, {"Retry-After": str(self._retry_after)})
+
+    def search(self, q, type="track", limit=1):
+        self._record("search", q=q)
+        items = [
+            {"uri": uri, "name": name, "artists": [{"name": artist}]}
+            for key, (uri, name, artist) in self.tracks.items() if key in q.lower()
+        ]
+        return {"tracks": {"items": items[:limit]}}
+
+    def devices(self):
+        self._record("devices")
+        return {"devices": [{"id": "desk", "is_active": True}]}
+
+    def start_playback(self, device_id=None, uris=None):
+        self._record("start_playback", device_id=device_id, uris=uris)
+        if self._device_gone:
+            self._device_gone = False
+            raise FakeSpotifyError(404)
+        self._check_playback()
+        if uris:
+            self.playing = uris[0]
+        self.paused = False
+
+    def pause_playback(self, device_id=None):
+        self._record("pause_playback", device_id=device_id)
+        self._check_playback()
+        self.paused = True
+
+    def currently_playing(self):
+        self._record("currently_playing")
+        for uri, name, artist in self.tracks.values():
+            if uri == self.playing:
+                return {"item": {"uri": uri, "name": name, "artists": [{"name": artist}]}}
+        return None
@@ -1,10 +1,28 @@
+import argparse
+import os
+
 from assistant.core import PersonalAssistant
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run Sylveria.")
+    parser.add_argument(
+        "--headless", action="store_true",
+        default=os.environ.get("SYLVERIA_HEADLESS", "").lower() in ("1", "true", "yes"),
+        help="Run without the Tk window, avatar images or audio (bot/API frontends only). "
+             "Also enabled by SYLVERIA_HEADLESS=1."
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    assistant = PersonalAssistant()
+    args = parse_args()
+    assistant = PersonalAssistant(headless=args.headless)
     try:
         assistant.gui.run()
     except KeyboardInterrupt:
         print("\nExiting...")
     finally:
-        assistant.save_memory()  # Save memory when closing 
\ No newline at end of file
+        assistant.plugin_manager.stop_all()
+        assistant.plugin_invoker.shutdown()
+        assistant.save_memory()  # Save memory when closing